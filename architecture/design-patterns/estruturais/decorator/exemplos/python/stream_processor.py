@@ -4,36 +4,65 @@ Sistema de processamento de streams de dados com diferentes transformações
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List
 import json
-import gzip
+import zlib
 import base64
+import tracemalloc
 from datetime import datetime
 
 
+def _size(chunk: Any) -> int:
+    """Tamanho de um pedaço: bytes ou caracteres."""
+    return len(chunk) if isinstance(chunk, (str, bytes)) else len(str(chunk))
+
+
+def join_chunks(chunks: List[Any]) -> Any:
+    """Junta a saída de um stream em um único objeto"""
+    if not chunks:
+        return None
+    if len(chunks) == 1:
+        return chunks[0]
+    if all(isinstance(chunk, bytes) for chunk in chunks):
+        return b''.join(chunks)
+    if all(isinstance(chunk, str) for chunk in chunks):
+        return ''.join(chunks)
+    return chunks
+
+
 # Interface base para processamento de streams
 class StreamProcessor(ABC):
     @abstractmethod
-    def process(self, data: Any) -> Any:
+    def process_stream(self, chunks: Iterable[Any]) -> Iterator[Any]:
+        """Processa os pedaços um a um, sem materializar o stream inteiro"""
         pass
 
+    def process(self, data: Any) -> Any:
+        # Conveniência: o objeto inteiro é um stream de um único pedaço
+        return join_chunks(list(self.process_stream([data])))
+
 
 # Implementação concreta - Processamento básico
 class BasicStreamProcessor(StreamProcessor):
-    def process(self, data: Any) -> Any:
-        print(f"🔄 Processando dados básicos: {type(data).__name__}")
-        
-        # Simulação de validação básica
-        if data is None:
-            raise ValueError("Dados não podem ser nulos")
-        
-        # Simulação de formatação básica
-        if isinstance(data, dict):
-            data['processed_at'] = datetime.now().isoformat()
-            data['version'] = '1.0'
-        
-        print(f"✅ Dados processados: {len(str(data))} caracteres")
-        return data
+    def process_stream(self, chunks: Iterable[Any]) -> Iterator[Any]:
+        total = 0
+        for count, chunk in enumerate(chunks):
+            if count == 0:
+                print(f"🔄 Processando dados básicos: {type(chunk).__name__}")
+            
+            # Simulação de validação básica
+            if chunk is None:
+                raise ValueError("Dados não podem ser nulos")
+            
+            # Simulação de formatação básica
+            if isinstance(chunk, dict):
+                chunk['processed_at'] = datetime.now().isoformat()
+                chunk['version'] = '1.0'
+            
+            total += _size(chunk)
+            yield chunk
+        
+        print(f"✅ Dados processados: {total} caracteres")
 
 
 # Decorator abstrato
@@ -42,7 +71,7 @@ class StreamProcessorDecorator(StreamProcessor):
         self.processor = processor
     
     @abstractmethod
-    def process(self, data: Any) -> Any:
+    def process_stream(self, chunks: Iterable[Any]) -> Iterator[Any]:
         pass
 
 
@@ -52,29 +81,37 @@ class CompressionDecorator(StreamProcessorDecorator):
         super().__init__(processor)
         self.compression_level = max(1, min(9, compression_level))  # Clamp entre 1 e 9
     
-    def process(self, data: Any) -> Any:
+    def process_stream(self, chunks: Iterable[Any]) -> Iterator[Any]:
         print(f"🗜️ Comprimindo dados (nível: {self.compression_level})")
         
-        # Primeiro processa os dados base
-        processed_data = self.processor.process(data)
-        
-        # Depois comprime
-        compressed_data = self._compress(processed_data)
-        
-        print(f"✅ Dados comprimidos: {len(compressed_data)} bytes")
-        return compressed_data
+        # Compressor incremental no formato gzip (wbits=31): guarda só a
+        # janela de compressão, nunca o stream inteiro
+        compressor = zlib.compressobj(self.compression_level, zlib.DEFLATED, 31)
+        total = 0
+        previous_record = False
+        
+        # Primeiro processa os dados base, depois comprime pedaço a pedaço
+        for chunk in self.processor.process_stream(chunks):
+            data, previous_record = self._encode(chunk, previous_record)
+            compressed = compressor.compress(data)
+            if compressed:
+                total += len(compressed)
+                yield compressed
+        
+        compressed = compressor.flush()
+        total += len(compressed)
+        yield compressed
+        print(f"✅ Dados comprimidos: {total} bytes")
     
-    def _compress(self, data: Any) -> bytes:
-        # Converte para JSON se necessário
-        if not isinstance(data, (str, bytes)):
-            data = json.dumps(data, ensure_ascii=False)
-        
-        if isinstance(data, str):
-            data = data.encode('utf-8')
-        
-        # Comprime os dados
-        compressed = gzip.compress(data, compresslevel=self.compression_level)
-        return compressed
+    def _encode(self, chunk: Any, previous_record: bool):
+        # Registros viram JSON, separados por quebra de linha (JSON Lines)
+        if not isinstance(chunk, (str, bytes)):
+            record = json.dumps(chunk, ensure_ascii=False)
+            return (("\n" + record) if previous_record else record).encode('utf-8'), True
+        
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        return chunk, False
 
 
 # Decorador concreto - Criptografia
@@ -83,31 +120,33 @@ class EncryptionDecorator(StreamProcessorDecorator):
         super().__init__(processor)
         self.key = key
     
-    def process(self, data: Any) -> Any:
+    def process_stream(self, chunks: Iterable[Any]) -> Iterator[Any]:
         print(f"🔐 Criptografando dados")
         
-        # Primeiro processa os dados base
-        processed_data = self.processor.process(data)
-        
-        # Depois criptografa
-        encrypted_data = self._encrypt(processed_data)
-        
-        print(f"✅ Dados criptografados: {len(encrypted_data)} bytes")
-        return encrypted_data
+        # Simulação simples de criptografia (Base64 dos dados + "|" + chave).
+        # O Base64 codifica grupos de 3 bytes: a sobra de cada pedaço (no
+        # máximo 2 bytes) fica para o próximo
+        pending = b''
+        total = 0
+        for chunk in self.processor.process_stream(chunks):
+            data = pending + self._to_bytes(chunk)
+            cut = len(data) - len(data) % 3
+            pending = data[cut:]
+            if cut:
+                encrypted = base64.b64encode(data[:cut]).decode('utf-8')
+                total += len(encrypted)
+                yield encrypted
+        
+        # Adiciona a chave ao final dos dados
+        encrypted = base64.b64encode(pending + ("|" + self.key).encode('utf-8')).decode('utf-8')
+        total += len(encrypted)
+        yield encrypted
+        print(f"✅ Dados criptografados: {total} bytes")
     
-    def _encrypt(self, data: Any) -> str:
-        # Simulação simples de criptografia (Base64 + chave)
-        if isinstance(data, bytes):
-            data_str = data.decode('utf-8')
-        else:
-            data_str = str(data)
-        
-        # Adiciona a chave aos dados
-        encrypted_str = data_str + "|" + self.key
-        
-        # Codifica em Base64
-        encrypted_bytes = base64.b64encode(encrypted_str.encode('utf-8'))
-        return encrypted_bytes.decode('utf-8')
+    def _to_bytes(self, chunk: Any) -> bytes:
+        if isinstance(chunk, bytes):
+            return chunk
+        return str(chunk).encode('utf-8')
 
 
 # Decorador concreto - Logging
@@ -116,25 +155,34 @@ class LoggingDecorator(StreamProcessorDecorator):
         super().__init__(processor)
         self.log_level = log_level
     
-    def process(self, data: Any) -> Any:
+    def process_stream(self, chunks: Iterable[Any]) -> Iterator[Any]:
         print(f"📝 Logging dados (nível: {self.log_level})")
         
-        # Log de entrada
-        self._log_entry(data)
+        # Conta entrada e saída enquanto os pedaços passam
+        entry = {'type': None, 'chunks': 0, 'size': 0}
+        exit_ = {'type': None, 'chunks': 0, 'size': 0}
         
         # Processa os dados
-        processed_data = self.processor.process(data)
-        
-        # Log de saída
-        self._log_exit(processed_data)
+        for chunk in self.processor.process_stream(self._count(chunks, entry)):
+            self._add(exit_, chunk)
+            yield chunk
         
-        return processed_data
+        # Log de entrada e de saída
+        self._log("📥 Entrada", entry)
+        self._log("📤 Saída", exit_)
     
-    def _log_entry(self, data: Any):
-        print(f"   📥 Entrada: {type(data).__name__} - {len(str(data))} caracteres")
+    def _count(self, chunks: Iterable[Any], stats: Dict) -> Iterator[Any]:
+        for chunk in chunks:
+            self._add(stats, chunk)
+            yield chunk
     
-    def _log_exit(self, data: Any):
-        print(f"   📤 Saída: {type(data).__name__} - {len(str(data))} caracteres")
+    def _add(self, stats: Dict, chunk: Any):
+        stats['type'] = stats['type'] or type(chunk).__name__
+        stats['chunks'] += 1
+        stats['size'] += _size(chunk)
+    
+    def _log(self, label: str, stats: Dict):
+        print(f"   {label}: {stats['type']} - {stats['size']} caracteres em {stats['chunks']} pedaço(s)")
 
 
 # Decorador concreto - Validação
@@ -143,36 +191,36 @@ class ValidationDecorator(StreamProcessorDecorator):
         super().__init__(processor)
         self.schema = schema or {}
     
-    def process(self, data: Any) -> Any:
+    def process_stream(self, chunks: Iterable[Any]) -> Iterator[Any]:
         print(f"✅ Validando dados")
         
-        # Valida os dados de entrada
-        self._validate_input(data)
+        # Valida cada pedaço de entrada antes de repassá-lo, e cada pedaço de saída
+        for chunk in self.processor.process_stream(self._validate_input(chunks)):
+            self._validate_output(chunk)
+            yield chunk
         
-        # Processa os dados
-        processed_data = self.processor.process(data)
-        
-        # Valida os dados de saída
-        self._validate_output(processed_data)
-        
-        return processed_data
+        print(f"   ✅ Validação de saída: OK")
     
-    def _validate_input(self, data: Any):
-        if data is None:
+    def _validate_input(self, chunks: Iterable[Any]) -> Iterator[Any]:
+        empty = True
+        for chunk in chunks:
+            empty = False
+            if chunk is None:
+                raise ValueError("Dados de entrada não podem ser nulos")
+            
+            if isinstance(chunk, dict) and self.schema:
+                for field in self.schema.get('required_fields', []):
+                    if field not in chunk:
+                        raise ValueError(f"Campo obrigatório ausente: {field}")
+            yield chunk
+        
+        if empty:
             raise ValueError("Dados de entrada não podem ser nulos")
-        
-        if isinstance(data, dict) and self.schema:
-            for field in self.schema.get('required_fields', []):
-                if field not in data:
-                    raise ValueError(f"Campo obrigatório ausente: {field}")
-        
         print(f"   ✅ Validação de entrada: OK")
     
     def _validate_output(self, data: Any):
         if data is None:
             raise ValueError("Dados de saída não podem ser nulos")
-        
-        print(f"   ✅ Validação de saída: OK")
 
 
 # Decorador concreto - Cache
@@ -203,6 +251,11 @@ class CacheDecorator(StreamProcessorDecorator):
         
         return processed_data
     
+    def process_stream(self, chunks: Iterable[Any]) -> Iterator[Any]:
+        # Um stream só poderia ir para o cache materializado: passa direto
+        print(f"🔄 Stream não passa pelo cache - processando dados")
+        return self.processor.process_stream(chunks)
+    
     def _generate_cache_key(self, data: Any) -> str:
         # Gera uma chave simples baseada no hash dos dados
         return str(hash(str(data)))
@@ -230,6 +283,17 @@ class RateLimitDecorator(StreamProcessorDecorator):
         self.requests = []
     
     def process(self, data: Any) -> Any:
+        self._acquire()
+        
+        # Processa os dados
+        return self.processor.process(data)
+    
+    def process_stream(self, chunks: Iterable[Any]) -> Iterator[Any]:
+        # Um stream conta como uma requisição; o limite é verificado já na chamada
+        self._acquire()
+        return self.processor.process_stream(chunks)
+    
+    def _acquire(self):
         current_time = datetime.now()
         
         # Remove requisições antigas
@@ -245,9 +309,6 @@ class RateLimitDecorator(StreamProcessorDecorator):
         self.requests.append(current_time)
         
         print(f"🚦 Rate limit: {len(self.requests)}/{self.max_requests} requisições")
-        
-        # Processa os dados
-        return self.processor.process(data)
 
 
 def demonstrate_decorator_pattern():
@@ -335,6 +396,30 @@ def demonstrate_decorator_pattern():
     
     result5 = processor5.process(sample_data.copy())
     print(f"Resultado: {type(result5).__name__} - {len(result5)} caracteres\n")
+    
+    # Cenário 6: Stream em pedaços - memória constante
+    print("📊 Cenário 6: Stream de 100.000 registros em pedaços")
+    processor6 = LoggingDecorator(
+        ValidationDecorator(
+            EncryptionDecorator(
+                CompressionDecorator(
+                    BasicStreamProcessor(),
+                    compression_level=6
+                ),
+                key="chave_producao"
+            ),
+            {"required_fields": ["user_id", "name"]}
+        )
+    )
+    
+    # Os registros são gerados sob demanda e a saída é consumida à medida
+    # que sai: nenhuma camada guarda o stream inteiro
+    records = ({**sample_data, "user_id": i} for i in range(100_000))
+    tracemalloc.start()
+    output_size = sum(len(chunk) for chunk in processor6.process_stream(records))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"Resultado: {output_size} caracteres - pico de memória: {peak / 1024:.0f} KiB\n")
 
 
 if __name__ == "__main__":
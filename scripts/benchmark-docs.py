@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Benchmarks dos scripts de documentação sobre um corpus sintético.
+
+Gera (ou reaproveita) um corpus com doclib.corpus, mede cada operação em
+várias rodadas e acrescenta o resultado a um histórico JSON, comparando com
+a última execução sobre o mesmo corpus para evidenciar regressões entre
+commits.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from doclib.corpus import CorpusSpec, corpus_matches, generate_corpus
+from doclib.link_cache import LinkCache
+from doclib.scanner import scan_tree
+from doclib.search import SearchIndex
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DOCS_ROOT = SCRIPTS_DIR.parent
+HISTORY_FORMAT = 1
+
+def load_script(file_name: str):
+    """Importa um script com hífen no nome (registrado em sys.modules para os workers)."""
+    module_name = file_name[:-3].replace('-', '_')
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPTS_DIR / file_name)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def measure(fn: Callable[[], object], rounds: int, warmup: int = 1) -> Dict[str, float]:
+    """Executa ``fn`` ``warmup + rounds`` vezes e resume os tempos das rodadas medidas."""
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return {
+        'min': min(times),
+        'median': statistics.median(times),
+        'mean': statistics.fmean(times),
+        'stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
+        'rounds': rounds,
+    }
+
+def benchmarks(root: str, workers: int, cache_dir: str) -> Dict[str, Callable[[], object]]:
+    """Operações medidas, por nome."""
+    links = load_script("verificar-links.py")
+    reais = load_script("verificar-links-reais.py")
+    conformance = load_script("validar-template-conformance.py")
+    markdown_files = scan_tree(root).markdown_files
+
+    def check_all_files(workers=1, cache=False):
+        checker = links.LinkChecker(root)
+        link_cache = LinkCache(os.path.join(cache_dir, "links.json"), links.CHECKER_VERSION) if cache else None
+        return checker.check_all_files(workers=workers, cache=link_cache)
+
+    def check_links_in_file():
+        for md_file in markdown_files:
+            reais.check_links_in_file(md_file, root)
+
+    def conformance_main(*options):
+        conformance.DOCS_ROOT = Path(root)
+        conformance.CASES_DIR = Path(root) / "cases"
+        argv = sys.argv
+        sys.argv = ["validar-template-conformance.py", *options]
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                return conformance.main()
+        finally:
+            sys.argv = argv
+
+    search_path = os.path.join(cache_dir, "search.sqlite")
+
+    def search_update():
+        if os.path.exists(search_path):
+            os.remove(search_path)
+        index = SearchIndex(search_path)
+        try:
+            return index.update(root, (os.path.relpath(p, root) for p in markdown_files))
+        finally:
+            index.close()
+
+    def search_query():
+        if not os.path.exists(search_path):
+            search_update()
+        index = SearchIndex(search_path)
+        try:
+            return index.search("link seção página", 10)
+        finally:
+            index.close()
+
+    selected = {
+        'scan_tree': lambda: scan_tree(root),
+        'LinkChecker.check_all_files': check_all_files,
+        'LinkChecker.check_all_files[cache]': lambda: check_all_files(cache=True),
+        'check_links_in_file': check_links_in_file,
+        'conformance.main': lambda: conformance_main("--no-cache"),
+        'conformance.main[cache]': conformance_main,
+        'SearchIndex.update': search_update,
+        'SearchIndex.search': search_query,
+    }
+    if workers > 1:
+        selected[f'LinkChecker.check_all_files[-j {workers}]'] = lambda: check_all_files(workers=workers)
+    return selected
+
+def git_revision() -> Optional[str]:
+    """Commit atual (com ``+`` se a árvore tiver alterações), ou None fora de um repositório."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPTS_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=SCRIPTS_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ("+" if dirty else "")
+
+def load_history(path: Path) -> List[Dict]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    return data.get('runs', []) if data.get('format') == HISTORY_FORMAT else []
+
+def save_history(path: Path, runs: List[Dict]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'format': HISTORY_FORMAT, 'runs': runs}, ensure_ascii=False, indent=1))
+    os.replace(tmp_path, path)
+
+def previous_run(runs: List[Dict], corpus: Dict) -> Optional[Dict]:
+    """Última execução registrada sobre o mesmo corpus."""
+    for run in reversed(runs):
+        if run.get('corpus') == corpus:
+            return run
+    return None
+
+def parse_args():
+    defaults = CorpusSpec()
+    parser = argparse.ArgumentParser(description="Benchmarks dos scripts de documentação em um corpus sintético.")
+    parser.add_argument("--files", type=int, default=defaults.files,
+                        help="Páginas do corpus (padrão: %(default)s; testado até 1 milhão)")
+    parser.add_argument("--links-per-file", type=float, default=defaults.links_per_file,
+                        help="Links por página, em média (padrão: %(default)s)")
+    parser.add_argument("--broken-ratio", type=float, default=defaults.broken_ratio,
+                        help="Proporção de links quebrados (padrão: %(default)s)")
+    parser.add_argument("--fragment-ratio", type=float, default=defaults.fragment_ratio,
+                        help="Proporção de links com #fragmento (padrão: %(default)s)")
+    parser.add_argument("--depth", type=int, default=defaults.depth,
+                        help="Níveis de diretórios (padrão: %(default)s)")
+    parser.add_argument("--large-ratio", type=float, default=defaults.large_ratio,
+                        help="Proporção de arquivos grandes (padrão: %(default)s)")
+    parser.add_argument("--large-kb", type=int, default=defaults.large_kb,
+                        help="Tamanho dos arquivos grandes em KB (padrão: %(default)s)")
+    parser.add_argument("--cases", type=int, default=defaults.cases,
+                        help="Casos com ADRs/casos de uso para a conformidade (padrão: %(default)s)")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Semente do gerador (padrão: %(default)s)")
+    parser.add_argument("--corpus", metavar="DIR",
+                        help="Diretório do corpus, reaproveitado entre execuções (padrão: temporário)")
+    parser.add_argument("--rounds", type=int, default=5, help="Rodadas medidas por benchmark (padrão: %(default)s)")
+    parser.add_argument("-j", "--workers", type=int, default=0,
+                        help="Mede também a verificação paralela com N processos (0 = todos os núcleos)")
+    parser.add_argument("-k", "--only", action="append", default=[], metavar="TEXTO",
+                        help="Executa só os benchmarks cujo nome contém TEXTO")
+    parser.add_argument("--history", default=str(DOCS_ROOT / ".cache" / "benchmark-history.json"), metavar="PATH",
+                        help="Histórico JSON de execuções (padrão: .cache/benchmark-history.json)")
+    parser.add_argument("--threshold", type=float, default=10.0, metavar="PCT",
+                        help="Aumento da mediana considerado regressão (padrão: %(default)s%%)")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="Sai com código 1 se algum benchmark regredir além de --threshold")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    spec = CorpusSpec(args.files, args.links_per_file, args.broken_ratio, args.fragment_ratio, args.depth,
+                      args.large_ratio, args.large_kb, args.cases, args.seed)
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    temp_dir = tempfile.mkdtemp(prefix="benchmark-docs-")
+    root = args.corpus or os.path.join(temp_dir, "corpus")
+    try:
+        if not corpus_matches(root, spec):
+            if args.corpus and os.path.exists(root) and os.listdir(root):
+                print(f"❌ {root} não está vazio e não contém um corpus com estes parâmetros")
+                return 2
+            print(f"🏗️  Gerando corpus com {spec.files} páginas em {root}...")
+            started = time.perf_counter()
+            generate_corpus(root, spec)
+            print(f"   pronto em {time.perf_counter() - started:.1f}s")
+
+        results = {}
+        print(f"⏱️  {args.rounds} rodadas por benchmark (mediana, mínimo, desvio):")
+        for name, fn in benchmarks(root, workers, temp_dir).items():
+            if args.only and not any(text in name for text in args.only):
+                continue
+            stats = measure(fn, args.rounds)
+            results[name] = stats
+            print(f"  {name:<42} {stats['median'] * 1000:10.1f}ms {stats['min'] * 1000:10.1f}ms "
+                  f"±{stats['stdev'] * 1000:.1f}ms")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    history_path = Path(args.history)
+    runs = load_history(history_path)
+    corpus = spec._asdict()
+    previous = previous_run(runs, corpus)
+    regressions = []
+    if previous is not None:
+        print(f"\n📈 Comparação com {previous.get('commit') or 'execução anterior'} ({previous['timestamp']}):")
+        for name, stats in results.items():
+            before = previous['results'].get(name)
+            if before is None:
+                continue
+            change = 100 * (stats['median'] - before['median']) / before['median']
+            flag = ""
+            if change > args.threshold:
+                flag = "  ⚠️  regressão"
+                regressions.append(name)
+            print(f"  {name:<42} {change:+7.1f}%{flag}")
+
+    runs.append({
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': git_revision(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'corpus': corpus,
+        'results': results,
+    })
+    save_history(history_path, runs)
+    print(f"\n💾 Histórico atualizado: {history_path} ({len(runs)} execuções)")
+
+    if regressions and args.fail_on_regression:
+        print(f"❌ {len(regressions)} benchmark(s) regrediram mais de {args.threshold}%")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Busca textual na documentação, com ranking BM25.
+
+Antes de cada consulta o índice (.cache/search-index.sqlite) é sincronizado
+com a árvore usando a mesma varredura dos verificadores de links: só os
+arquivos alterados desde a última execução são relidos. Cada resultado
+mostra as seções (títulos) onde os termos aparecem.
+
+Exemplos:
+    python3 scripts/buscar-docs.py circuit breaker
+    python3 scripts/buscar-docs.py "governança de dados" --dir cases -n 5
+    python3 scripts/buscar-docs.py --no-update configuracao
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+from doclib.profiling import add_profile_arguments, profiler_from_args
+from doclib.scanner import DEFAULT_EXCLUDES, scan_tree
+from doclib.search import SearchIndex, tokenize
+from doclib.sharding import ShardError, read_manifest
+
+DOCS_ROOT = Path(__file__).parent.parent
+INDEX_PATH = DOCS_ROOT / ".cache" / "search-index.sqlite"
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Busca textual (BM25) nos documentos markdown.")
+    parser.add_argument("query", nargs="*", metavar="TERMO", help="Termos da busca (acentos e caixa são ignorados)")
+    parser.add_argument("-n", "--limit", type=int, default=10, help="Quantidade de resultados (padrão: %(default)s)")
+    parser.add_argument("--dir", metavar="DIR", help="Restringe a busca aos documentos sob DIR (ex: architecture)")
+    parser.add_argument("--index", default=str(INDEX_PATH), metavar="PATH",
+                        help="Arquivo do índice (padrão: .cache/search-index.sqlite)")
+    parser.add_argument("--no-update", action="store_true",
+                        help="Consulta o índice como está, sem sincronizá-lo com a árvore")
+    parser.add_argument("--rebuild", action="store_true", help="Descarta o índice e o reconstrói do zero")
+    parser.add_argument("--manifest", metavar="PATH",
+                        help="Lê o índice de arquivos do manifesto dos verificadores em vez de percorrer a árvore")
+    parser.add_argument("--exclude", action="append", default=[], metavar="GLOB",
+                        help="Glob de arquivos/diretórios a ignorar (além dos padrões)")
+    add_profile_arguments(parser)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    profiler = profiler_from_args(args)
+    if args.rebuild and os.path.exists(args.index):
+        os.remove(args.index)
+    index = SearchIndex(args.index)
+    try:
+        if not args.no_update:
+            with profiler.phase("varredura"):
+                try:
+                    scan = (read_manifest(args.manifest, str(DOCS_ROOT)) if args.manifest
+                            else scan_tree(DOCS_ROOT, DEFAULT_EXCLUDES + tuple(args.exclude)))
+                except ShardError as e:
+                    print(f"❌ {e}")
+                    return 2
+            profiler.files += len(scan.markdown_files)
+            with profiler.phase("atualização do índice"):
+                stats = index.update(scan.root, (os.path.relpath(p, scan.root) for p in scan.markdown_files))
+            profiler.parsed += stats.indexed
+            if stats.indexed or stats.removed:
+                print(f"🗂️  Índice atualizado: {stats.indexed} reindexado(s), {stats.removed} removido(s), "
+                      f"{stats.unchanged} sem alteração")
+
+        if not args.query:
+            print(f"📚 {len(index)} documentos no índice ({args.index})")
+            profiler.report()
+            return 0
+
+        query = " ".join(args.query)
+        if not tokenize(query):
+            print("⚠️  A busca não tem termos pesquisáveis (apenas palavras muito comuns ou de uma letra)")
+            return 2
+        started = time.perf_counter()
+        with profiler.phase("consulta"):
+            hits = index.search(query, args.limit, args.dir)
+        elapsed = (time.perf_counter() - started) * 1000
+    finally:
+        index.close()
+
+    if not hits:
+        print(f"🔎 Nenhum resultado para \"{query}\" ({elapsed:.1f}ms)")
+        profiler.report()
+        return 1
+    print(f"🔎 {len(hits)} resultado(s) para \"{query}\" ({elapsed:.1f}ms)\n")
+    for position, hit in enumerate(hits, start=1):
+        print(f"{position:3}. {hit.path}  ({hit.score:.2f})")
+        for line, title in hit.sections:
+            print(f"       ↳ linha {line}: {title}" if line else "       ↳ início do documento")
+    profiler.report()
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,3 @@
+"""
+Biblioteca compartilhada pelos scripts de verificação da documentação.
+"""
@@ -0,0 +1,133 @@
+"""
+Pares de documentos EN/PT-BR e suas impressões digitais estruturais.
+
+Segue a organização de ``templates/bilingual-document-guide.md``: a
+tradução de ``dir/nome.md`` fica em ``dir/pt-br/nome.pt-br.md`` (ou
+``dir/pt-br/nome.md``). Em vez de comparar os textos, cada documento é
+reduzido a uma impressão digital — quantidade de títulos por nível, de
+blocos de código e o conjunto de alvos dos links — e os pares cujas
+impressões divergem são apontados. Os alvos são normalizados para o
+documento em inglês, então ``outro.md`` e ``pt-br/outro.pt-br.md`` contam
+como o mesmo alvo.
+"""
+
+import os
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+from doclib.document import MarkdownDocument
+from doclib.resolver import PathIndex
+
+TRANSLATION_DIR = "pt-br"
+TRANSLATION_SUFFIX = ".pt-br.md"
+# Seção de links entre as versões, que só o documento em inglês tem
+LANGUAGE_SECTIONS = {"language versions", "versões de idioma"}
+
+class Fingerprint(NamedTuple):
+    headings: Tuple[int, ...]  # títulos por nível (1 a 6)
+    code_blocks: int
+    links: FrozenSet[str]
+
+class Pairing(NamedTuple):
+    pairs: List[Tuple[str, str]]  # (inglês, português)
+    untranslated: List[str]  # em diretórios com pt-br/, sem tradução
+    orphans: List[str]  # traduções sem o original
+
+def is_translation(rel_path: str) -> bool:
+    return os.path.basename(os.path.dirname(rel_path)) == TRANSLATION_DIR
+
+def translation_candidates(rel_path: str) -> List[str]:
+    """Caminhos possíveis da tradução de um documento em inglês."""
+    directory, name = os.path.split(rel_path)
+    base = os.path.join(directory, TRANSLATION_DIR)
+    return [os.path.join(base, name[:-3] + TRANSLATION_SUFFIX), os.path.join(base, name)]
+
+def original_candidates(rel_path: str) -> List[str]:
+    """Caminhos possíveis do original em inglês de uma tradução."""
+    directory, name = os.path.split(rel_path)
+    base = os.path.dirname(directory)
+    if name.endswith(TRANSLATION_SUFFIX):
+        return [os.path.join(base, name[:-len(TRANSLATION_SUFFIX)] + ".md")]
+    return [os.path.join(base, name)]
+
+def pair_documents(rel_paths: Iterable[str]) -> Pairing:
+    """Casa cada documento com sua tradução usando apenas o índice de caminhos."""
+    paths = sorted(rel_paths)
+    present = set(paths)
+    translated_dirs = {os.path.dirname(os.path.dirname(p)) for p in paths if is_translation(p)}
+    pairs, untranslated, matched = [], [], set()
+    for rel_path in paths:
+        if is_translation(rel_path):
+            continue
+        translation = next((c for c in translation_candidates(rel_path) if c in present), None)
+        if translation is not None:
+            pairs.append((rel_path, translation))
+            matched.add(translation)
+        elif os.path.dirname(rel_path) in translated_dirs:
+            untranslated.append(rel_path)
+    orphans = [p for p in paths if is_translation(p) and p not in matched]
+    return Pairing(pairs, untranslated, orphans)
+
+def fingerprint(document: MarkdownDocument, rel_path: str, index: PathIndex,
+                canonical: Dict[str, str]) -> Fingerprint:
+    """Impressão digital de um documento.
+
+    ``canonical`` leva cada tradução ao original em inglês (alvos em
+    ``pt-br/`` sem par são levados ao original esperado). A seção
+    "Language Versions", os links entre o documento e sua tradução e as
+    âncoras na própria página não contam.
+    """
+    levels = [0] * 6
+    for heading in document.headings:
+        if heading.text.strip().lower() not in LANGUAGE_SECTIONS:
+            levels[heading.level - 1] += 1
+    source_dir = os.path.join(index.root, os.path.dirname(rel_path))
+    own = canonical.get(rel_path, rel_path)
+    targets = set()
+    for link in document.links:
+        url = link.url.strip()
+        if not url or url.startswith(('#', 'mailto:')):
+            continue
+        if url.startswith(('http://', 'https://')):
+            targets.add(url.split('#', 1)[0].rstrip('/'))
+            continue
+        target = index.resolve(source_dir, url.split('#', 1)[0].split('?', 1)[0])
+        if target is None:
+            continue
+        if target in canonical:
+            target = canonical[target]
+        elif is_translation(target):
+            # Tradução que não existe: conta como o original esperado
+            target = original_candidates(target)[0]
+        if target != own:
+            targets.add(target)
+    return Fingerprint(tuple(levels), len(document.code_blocks), frozenset(targets))
+
+def compare_fingerprints(original: Fingerprint, translation: Fingerprint, limit: int = 5) -> List[str]:
+    """Divergências entre as impressões digitais de um par (vazia se estão em sincronia)."""
+    problems = []
+    for level, (en, pt) in enumerate(zip(original.headings, translation.headings), start=1):
+        if en != pt:
+            problems.append(f"títulos de nível {level}: {en} em inglês, {pt} em português")
+    if original.code_blocks != translation.code_blocks:
+        problems.append(f"blocos de código: {original.code_blocks} em inglês, {translation.code_blocks} em português")
+    for label, targets in (("só em inglês", original.links - translation.links),
+                           ("só em português", translation.links - original.links)):
+        if targets:
+            shown = sorted(targets)
+            more = f" (+{len(shown) - limit})" if len(shown) > limit else ""
+            problems.append(f"links {label}: {', '.join(shown[:limit])}{more}")
+    return problems
+
+def canonical_paths(pairing: Pairing) -> Dict[str, str]:
+    """Tradução -> original, para normalizar alvos de links."""
+    return {translation: original for original, translation in pairing.pairs}
+
+def read_fingerprint(root: str, rel_path: str, index: PathIndex,
+                     canonical: Dict[str, str]) -> Optional[Fingerprint]:
+    """Lê e resume um documento; None se ele não puder ser lido."""
+    try:
+        with open(os.path.join(root, rel_path), 'r', encoding='utf-8') as f:
+            text = f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+    return fingerprint(MarkdownDocument(text, rel_path), rel_path, index, canonical)
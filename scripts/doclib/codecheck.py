@@ -0,0 +1,252 @@
+"""
+Verificação de sintaxe dos blocos de código embutidos nos documentos.
+
+Python e JSON são verificados no próprio processo (``compile()`` e
+``json.loads``); as demais linguagens usam ferramentas externas, registradas
+apenas quando estão instaladas (``bash -n``, ``node --check``, ``gofmt -e``,
+``ruby -c``, ``php -l``, ``tsc``). Outros verificadores podem ser
+acrescentados na linha de comando. SQL não tem verificador padrão: os
+exemplos misturam dialetos.
+
+O resultado de cada bloco fica em cache pelo hash do código e da identidade
+do verificador, então só os trechos editados (ou cujo verificador mudou) são
+verificados de novo. Tempo esgotado ou falha ao executar a ferramenta não
+são cacheados: o bloco é verificado outra vez na execução seguinte.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import textwrap
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+CHECKER_VERSION = "codecheck/2"
+CACHE_FORMAT = 1
+TIMEOUT = 20  # segundos por bloco nas ferramentas externas
+
+# Nome na cerca -> linguagem do verificador
+LANGUAGE_ALIASES = {
+    "py": "python", "python3": "python",
+    "sh": "bash", "shell": "bash",
+    "js": "javascript", "mjs": "javascript",
+    "ts": "typescript",
+    "golang": "go",
+    "rb": "ruby",
+}
+
+_LINE_NUMBER = re.compile(r'(?:\bline |:)(\d+)\b')
+_ERROR_LINE = re.compile(r'error|erro', re.IGNORECASE)
+
+class Checker(NamedTuple):
+    lang: str
+    command: Tuple[str, ...]  # vazio = verificador embutido; "{file}" = arquivo temporário, senão entrada padrão
+    suffix: str = ''  # extensão do arquivo temporário
+    prelude: str = ''  # linha inserida antes do código (ex: "<?php")
+    errors: str = ''  # regex das linhas que contam como erro; vazio = qualquer saída com código != 0
+    locates: bool = True  # a saída traz a linha do erro relativa ao trecho
+
+    @property
+    def identity(self) -> str:
+        """Muda quando o verificador muda (invalida o cache dos blocos dessa linguagem)."""
+        if not self.command:
+            return f"{CHECKER_VERSION}:{self.lang}:python{sys.version_info[0]}.{sys.version_info[1]}"
+        return f"{CHECKER_VERSION}:{self.lang}:" + json.dumps([self.command, self.prelude, self.errors])
+
+class BlockResult(NamedTuple):
+    line: Optional[int]  # linha do erro dentro do trecho (1 = primeira linha de código)
+    error: Optional[str]  # None = sintaxe válida
+    transient: bool = False  # o verificador não respondeu (tempo esgotado, falha ao executar): não vai para o cache
+
+BUILTIN_CHECKERS = [Checker("python", ()), Checker("json", ())]
+
+# Verificadores externos, usados se o programa estiver no PATH
+EXTERNAL_CHECKERS = [
+    Checker("bash", ("bash", "-n")),
+    Checker("javascript", ("node", "--check", "{file}"), ".mjs"),
+    Checker("typescript", ("tsc", "--noEmit", "--pretty", "false", "{file}"), ".ts",
+            errors=r'error TS1\d{3}'),  # só erros de sintaxe; trechos soltos não passam na checagem de tipos
+    Checker("go", ("gofmt", "-e"), locates=False),  # gofmt envolve trechos soltos e desloca as linhas
+    Checker("ruby", ("ruby", "-c")),
+    Checker("php", ("php", "-l", "{file}"), ".php", prelude="<?php"),
+]
+
+def normalize_lang(lang: str) -> str:
+    lang = lang.strip().lower()
+    return LANGUAGE_ALIASES.get(lang, lang)
+
+def default_checkers() -> Dict[str, Checker]:
+    """Verificadores embutidos e os externos disponíveis nesta máquina."""
+    checkers = {checker.lang: checker for checker in BUILTIN_CHECKERS}
+    for checker in EXTERNAL_CHECKERS:
+        if shutil.which(checker.command[0]):
+            checkers[checker.lang] = checker
+    return checkers
+
+def parse_checker(spec: str) -> Checker:
+    """``LANG=COMANDO`` da linha de comando; ``{file}`` no comando usa um arquivo ``.LANG``."""
+    lang, sep, command = spec.partition('=')
+    args = tuple(shlex.split(command))
+    if not sep or not lang.strip() or not args:
+        raise ValueError(f"verificador inválido: {spec!r} (esperado LANG=COMANDO)")
+    lang = normalize_lang(lang)
+    return Checker(lang, args, '.' + lang if any('{file}' in arg for arg in args) else '')
+
+def prepare(code: str) -> str:
+    """Código do bloco sem a indentação comum (blocos dentro de itens de lista)."""
+    return textwrap.dedent(code).rstrip() + '\n'
+
+def block_key(checker: Checker, code: str) -> str:
+    return hashlib.blake2b(f"{checker.identity}\0{code}".encode('utf-8'), digest_size=16).hexdigest()
+
+def check_code(checker: Checker, code: str) -> BlockResult:
+    """Verifica a sintaxe de um trecho já preparado."""
+    if not checker.command:
+        return _check_builtin(checker.lang, code)
+    return _check_external(checker, code)
+
+def _check_builtin(lang: str, code: str) -> BlockResult:
+    if lang == "json":
+        try:
+            json.loads(code)
+        except ValueError as e:
+            return BlockResult(getattr(e, 'lineno', None), str(e))
+        return BlockResult(None, None)
+    try:
+        compile(code, "<bloco>", "exec", dont_inherit=True)
+    except (SyntaxError, ValueError) as e:
+        message = getattr(e, 'msg', None) or str(e)
+        return BlockResult(getattr(e, 'lineno', None), f"{type(e).__name__}: {message}")
+    return BlockResult(None, None)
+
+def _check_external(checker: Checker, code: str) -> BlockResult:
+    source = f"{checker.prelude}\n{code}" if checker.prelude else code
+    offset = source.count('\n') - code.count('\n')
+    tmp_path = None
+    try:
+        if checker.suffix:
+            fd, tmp_path = tempfile.mkstemp(suffix=checker.suffix, prefix="bloco-")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(source)
+            args = [arg.replace('{file}', tmp_path) for arg in checker.command]
+            proc = subprocess.run(args, stdin=subprocess.DEVNULL, capture_output=True,
+                                  text=True, timeout=TIMEOUT)
+        else:
+            proc = subprocess.run(list(checker.command), input=source, capture_output=True,
+                                  text=True, timeout=TIMEOUT)
+    except subprocess.TimeoutExpired:
+        return BlockResult(None, f"{checker.command[0]}: tempo esgotado ({TIMEOUT}s)", True)
+    except OSError as e:
+        return BlockResult(None, f"{checker.command[0]}: {e}", True)
+    finally:
+        if tmp_path is not None:
+            os.unlink(tmp_path)
+
+    output = proc.stderr + proc.stdout
+    if tmp_path is not None:
+        output = output.replace(tmp_path, "<bloco>")
+    lines = [line.strip() for line in output.split('\n') if line.strip()]
+    if checker.errors:
+        lines = [line for line in lines if re.search(checker.errors, line)]
+        if not lines:
+            return BlockResult(None, None)
+    elif proc.returncode == 0:
+        return BlockResult(None, None)
+    message = next((line for line in lines if _ERROR_LINE.search(line)), lines[0] if lines else
+                   f"{checker.command[0]} terminou com código {proc.returncode}")
+    line = None
+    if checker.locates:
+        match = _LINE_NUMBER.search(message) or _LINE_NUMBER.search(output)
+        if match and int(match.group(1)) > offset:
+            line = int(match.group(1)) - offset
+    return BlockResult(line, message)
+
+def _check_batch(items: List[Tuple[Checker, str]]) -> List[BlockResult]:
+    """Verifica um lote de trechos dentro de um worker do pool."""
+    return [check_code(checker, code) for checker, code in items]
+
+def check_pending(items: List[Tuple[Checker, str]], workers: int) -> List[BlockResult]:
+    """Verifica os trechos na ordem recebida, em um pool de processos quando ``workers > 1``."""
+    if workers <= 1 or len(items) < 2:
+        return _check_batch(items)
+    batch_count = min(len(items), workers * 4)
+    batch_size = -(-len(items) // batch_count)
+    batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for batch in executor.map(_check_batch, batches):
+            results.extend(batch)
+    return results
+
+def check_cached(items: Dict[str, Tuple[Checker, str]], cache: 'BlockCache',
+                 workers: int) -> Tuple[Dict[str, BlockResult], List[str]]:
+    """Resultado de cada trecho (chave -> verificador, código) e as chaves verificadas agora.
+
+    Só os trechos fora do cache são verificados; resultados transitórios não
+    são gravados, então o trecho é verificado de novo na próxima execução.
+    """
+    results = {}
+    pending = []
+    for key in items:
+        cached = cache.get(key)
+        if cached is None:
+            pending.append(key)
+        else:
+            results[key] = cached
+    for key, result in zip(pending, check_pending([items[key] for key in pending], workers)):
+        results[key] = result
+        if not result.transient:
+            cache.store(key, result)
+    return results, pending
+
+class BlockCache:
+    """Resultado de cada trecho pelo hash do código e do verificador, persistido em JSON."""
+
+    def __init__(self, cache_path: Optional[Path]):
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self.entries: Dict[str, List] = {}
+        self.modified = False
+        if self.cache_path is None:
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('format') == CACHE_FORMAT:
+            self.entries = data.get('entries', {})
+
+    def get(self, key: str) -> Optional[BlockResult]:
+        entry = self.entries.get(key)
+        return BlockResult(*entry) if entry is not None else None
+
+    def store(self, key: str, result: BlockResult):
+        self.entries[key] = list(result)
+        self.modified = True
+
+    def prune(self, live_keys: Iterable[str]):
+        """Esquece os trechos que não existem mais nos documentos."""
+        live = set(live_keys)
+        stale = [key for key in self.entries if key not in live]
+        for key in stale:
+            del self.entries[key]
+        self.modified = self.modified or bool(stale)
+
+    def save(self):
+        """Grava o cache de forma atômica (apenas se algo mudou)."""
+        if self.cache_path is None or not self.modified:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(self.cache_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'format': CACHE_FORMAT, 'entries': self.entries},
+                               ensure_ascii=False, separators=(',', ':')))
+        os.replace(tmp_path, self.cache_path)
+        self.modified = False
@@ -0,0 +1,116 @@
+"""
+Gerador de corpus markdown sintético para benchmarks.
+
+Produz árvores determinísticas (mesma semente, mesma árvore) de 1 mil a
+1 milhão de arquivos, com densidade de links, proporção de links quebrados e
+de links com fragmento, profundidade de diretórios e arquivos grandes
+configuráveis. O caminho de cada página é calculado a partir do seu número,
+então os arquivos são escritos um a um, sem manter a árvore em memória.
+
+Além das páginas, gera casos em ``cases/`` com ADRs e casos de uso no
+formato esperado por ``validar-template-conformance.py``.
+"""
+
+import json
+import os
+import random
+from typing import List, NamedTuple
+
+CORPUS_FORMAT = 1
+SECTIONS_PER_PAGE = 4
+FILLER = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor "
+          "incididunt ut labore et dolore magna aliqua. Ut enim ad minim veniam.\n\n")
+
+class CorpusSpec(NamedTuple):
+    """Parâmetros do corpus; proporções entre 0 e 1."""
+    files: int = 1000
+    links_per_file: float = 5.0
+    broken_ratio: float = 0.05
+    fragment_ratio: float = 0.2
+    depth: int = 3
+    large_ratio: float = 0.01
+    large_kb: int = 256
+    cases: int = 10
+    seed: int = 42
+
+    def fanout(self) -> int:
+        """Subdiretórios por nível para distribuir ``files`` em ``depth`` níveis."""
+        if self.depth <= 0:
+            return 1
+        return max(2, round(self.files ** (1 / (self.depth + 1))))
+
+    def page_path(self, number: int) -> str:
+        """Caminho relativo da página ``number`` (existente ou não)."""
+        if self.depth <= 0:
+            return f"page-{number}.md"
+        fanout = self.fanout()
+        parts = [f"sec-{(number // fanout ** level) % fanout}" for level in range(self.depth, 0, -1)]
+        return os.path.join(*parts, f"page-{number}.md")
+
+def _page(spec: CorpusSpec, number: int, rng: random.Random) -> str:
+    rel_dir = os.path.dirname(spec.page_path(number))
+    lines = [f"# Página {number}", "", "Página sintética gerada para benchmark.", ""]
+    link_count = int(spec.links_per_file) + (rng.random() < spec.links_per_file % 1)
+    for index in range(link_count):
+        if rng.random() < spec.broken_ratio:
+            # Numeração além do corpus: o arquivo nunca existe
+            target = spec.page_path(spec.files + rng.randrange(spec.files))
+        else:
+            target = spec.page_path(rng.randrange(spec.files))
+        href = os.path.relpath(target, rel_dir or os.curdir).replace(os.sep, '/')
+        if rng.random() < spec.fragment_ratio:
+            href += f"#seção-{rng.randrange(SECTIONS_PER_PAGE)}"
+        lines.append(f"- [Link {index}]({href})")
+    lines.append("")
+    for section in range(SECTIONS_PER_PAGE):
+        lines.extend([f"## Seção {section}", "", FILLER.strip(), ""])
+    text = "\n".join(lines)
+    if rng.random() < spec.large_ratio:
+        text += FILLER * (spec.large_kb * 1024 // len(FILLER))
+    return text
+
+def _case_documents(case: int) -> List[tuple]:
+    adr = ("# ADR-001: Decisão sintética\n\n## Status\n\nAceita\n\n## Context\n\n" + FILLER +
+           "## Decision\n\n" + FILLER + "## Consequences\n\n" + FILLER)
+    use_case = ("# UC-001: Caso de uso sintético\n\n## Basic Information\n\n" + FILLER +
+                "## Actors\n\n" + FILLER + "## Preconditions\n\n" + FILLER + "## Flow\n\n" + FILLER)
+    return [(f"adr-{case:03d}-sintetico.md", adr), (f"uc-{case:03d}-sintetico.md", use_case),
+            ("README.md", f"# Caso {case}\n\n- [ADR](adr-{case:03d}-sintetico.md)\n")]
+
+def generate_corpus(root: str, spec: CorpusSpec) -> str:
+    """Escreve o corpus em ``root`` (que deve estar vazio ou não existir)."""
+    rng = random.Random(spec.seed)
+    os.makedirs(root, exist_ok=True)
+    made_dirs = set()
+    for number in range(spec.files):
+        rel_path = spec.page_path(number)
+        rel_dir = os.path.dirname(rel_path)
+        if rel_dir not in made_dirs:
+            os.makedirs(os.path.join(root, rel_dir), exist_ok=True)
+            made_dirs.add(rel_dir)
+        with open(os.path.join(root, rel_path), 'w', encoding='utf-8') as f:
+            f.write(_page(spec, number, rng))
+
+    entry_links = "\n".join(f"- [Página {n}]({spec.page_path(n).replace(os.sep, '/')})"
+                            for n in range(min(spec.files, 20)))
+    with open(os.path.join(root, "README.md"), 'w', encoding='utf-8') as f:
+        f.write(f"# Corpus sintético\n\n{entry_links}\n")
+    for case in range(spec.cases):
+        case_dir = os.path.join(root, "cases", f"caso-{case:03d}")
+        os.makedirs(case_dir, exist_ok=True)
+        for name, text in _case_documents(case):
+            with open(os.path.join(case_dir, name), 'w', encoding='utf-8') as f:
+                f.write(text)
+
+    with open(os.path.join(root, "corpus.json"), 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'format': CORPUS_FORMAT, 'spec': spec._asdict()}))
+    return root
+
+def corpus_matches(root: str, spec: CorpusSpec) -> bool:
+    """Se ``root`` já contém um corpus gerado com exatamente ``spec``."""
+    try:
+        with open(os.path.join(root, "corpus.json"), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return data.get('format') == CORPUS_FORMAT and data.get('spec') == spec._asdict()
@@ -0,0 +1,153 @@
+"""
+Classificação de documentos por tipo de template.
+
+O tipo vem, nesta ordem, do front-matter (``type:`` ou ``template:``), do
+título principal do documento e do caminho do arquivo. O resultado de cada
+arquivo fica em um índice persistido (um ``LinkCache``), então só os
+arquivos alterados são relidos e reclassificados a cada execução. O
+documento lido para classificar um arquivo de tipo conhecido fica
+disponível (``take``) para a validação, que não precisa relê-lo.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, NamedTuple, Optional, Union
+
+from doclib.document import MarkdownDocument
+from doclib.link_cache import LinkCache, content_digest
+
+CLASSIFIER_VERSION = "doctypes/1"
+UNKNOWN = "unknown"
+# Arquivos-fonte das regras: não são validados contra si mesmos
+TEMPLATE = "template"
+
+# Tipo -> padrão do título principal e padrão do caminho (em minúsculas)
+TYPE_PATTERNS = {
+    "adr": (r'^(?:adr|rfd)[-\s:]*\d+', r'(?:^|/)adr-\d+'),
+    "use-case": (r'^(?:use case|caso de uso|uc[-\s][\w-]*\d+)\b', r'(?:^|/)(?:uc-|use-case|caso-de-uso)'),
+    "data-governance": (r'data governance|governança de dados', r'data-governance|governan[cç]a-de-dados'),
+    "engineering-guidelines": (r'engineering guidelines|diretrizes de engenharia',
+                               r'engineering-guidelines|diretrizes-de-engenharia'),
+    "high-level-architecture": (r'high[-\s]level architecture|arquitetura de alto nível',
+                                r'high-level-architecture|arquitetura-de-alto-n[ií]vel'),
+}
+_TITLE_RULES = [(doc_type, re.compile(title, re.IGNORECASE)) for doc_type, (title, _) in TYPE_PATTERNS.items()]
+_PATH_RULES = [(doc_type, re.compile(path)) for doc_type, (_, path) in TYPE_PATTERNS.items()]
+_FRONT_MATTER_LINE = re.compile(r'([A-Za-z_][\w-]*)\s*:\s*(.*)')
+
+def front_matter(text: str) -> Dict[str, str]:
+    """Chaves simples (``chave: valor``) do bloco ``---`` no início do texto."""
+    if not text.startswith('---'):
+        return {}
+    lines = text.split('\n')
+    if lines[0].strip() != '---':
+        return {}
+    fields = {}
+    for line in lines[1:]:
+        if line.strip() in ('---', '...'):
+            return fields
+        match = _FRONT_MATTER_LINE.match(line)
+        if match:
+            fields[match.group(1).lower()] = match.group(2).strip().strip('"\'')
+    return {}  # bloco não fechado não é front-matter
+
+def type_from_path(rel_path: str) -> str:
+    """Tipo sugerido apenas pelo caminho relativo."""
+    rel_path = rel_path.replace(os.sep, '/').lower()
+    if rel_path.startswith('templates/') and rel_path.endswith('-template.md'):
+        return TEMPLATE
+    for doc_type, rule in _PATH_RULES:
+        if rule.search(rel_path):
+            return doc_type
+    return UNKNOWN
+
+class LoadedDocument(NamedTuple):
+    """Documento lido durante a classificação, com o stat e o hash usados no cache."""
+    st: os.stat_result
+    digest: str
+    document: MarkdownDocument
+
+def classify(rel_path: str, content: Union[str, MarkdownDocument],
+             template_types: Optional[Dict[str, str]] = None) -> str:
+    """Tipo de um documento (texto ou já analisado): front-matter, depois título principal, depois caminho.
+
+    ``template_types`` traduz o valor de ``template:`` no front-matter (nome
+    do arquivo de template) para um tipo.
+    """
+    text = content.text if isinstance(content, MarkdownDocument) else content
+    fields = front_matter(text)
+    if fields.get('type') in TYPE_PATTERNS:
+        return fields['type']
+    template = os.path.basename(fields.get('template', ''))
+    if template and template_types and template in template_types:
+        return template_types[template]
+
+    path_type = type_from_path(rel_path)
+    if path_type == TEMPLATE:
+        return TEMPLATE
+    document = content if isinstance(content, MarkdownDocument) else MarkdownDocument(text)
+    title = next((h.text for h in document.headings if h.level == 1), '')
+    for doc_type, rule in _TITLE_RULES:
+        if rule.search(title):
+            return doc_type
+    return path_type
+
+class TypeIndex:
+    """Tipo de cada documento (caminho relativo), persistido e atualizado incrementalmente."""
+
+    def __init__(self, root: Path, index_path: Optional[Path] = None,
+                 template_types: Optional[Dict[str, str]] = None):
+        self.root = Path(root)
+        self.template_types = template_types or {}
+        version = CLASSIFIER_VERSION + ":" + ",".join(f"{k}={v}" for k, v in sorted(self.template_types.items()))
+        self.cache = LinkCache(index_path, version) if index_path is not None else None
+        self.types: Dict[str, str] = {}  # já consultados nesta execução
+        self.classified = 0  # arquivos relidos nesta execução
+        self.loaded: Dict[str, LoadedDocument] = {}  # lidos e de tipo conhecido, até serem pedidos
+
+    def type_of(self, path: Path) -> str:
+        """Tipo do documento; relê o arquivo só se ele mudou desde a última classificação."""
+        rel_path = os.path.relpath(path, self.root)
+        doc_type = self.types.get(rel_path)
+        if doc_type is None:
+            doc_type = self.types[rel_path] = self._classify(path, rel_path)
+        return doc_type
+
+    def forget(self, path: Path):
+        """Descarta o tipo memorizado de um arquivo (ex: alterado durante --watch)."""
+        rel_path = os.path.relpath(path, self.root)
+        self.types.pop(rel_path, None)
+        self.loaded.pop(rel_path, None)
+
+    def take(self, path: Path) -> Optional[LoadedDocument]:
+        """Documento lido ao classificar ``path`` nesta execução (entregue uma única vez)."""
+        return self.loaded.pop(os.path.relpath(path, self.root), None)
+
+    def _classify(self, path: Path, rel_path: str) -> str:
+        st = os.stat(path)
+        entry = self.cache.get(rel_path, st) if self.cache is not None else None
+        if entry is not None:
+            return entry['result']
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = content_digest(data)
+        entry = self.cache.get_by_digest(rel_path, st, digest) if self.cache is not None else None
+        if entry is not None:
+            return entry['result']
+        document = MarkdownDocument(data.decode('utf-8'), str(path))
+        doc_type = classify(rel_path, document, self.template_types)
+        self.classified += 1
+        if doc_type not in (UNKNOWN, TEMPLATE):
+            self.loaded[rel_path] = LoadedDocument(st, digest, document)
+        if self.cache is not None:
+            self.cache.store(rel_path, st, digest, (), doc_type)
+        return doc_type
+
+    def prune(self, live_paths: Iterable[str]):
+        if self.cache is not None:
+            self.cache.prune(set(live_paths))
+
+    def save(self):
+        if self.cache is not None:
+            self.cache.save()
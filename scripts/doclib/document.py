@@ -0,0 +1,118 @@
+"""
+Modelo de documento markdown compartilhado pelos scripts de verificação.
+
+Um arquivo é lido e analisado uma única vez, produzindo links (inline,
+imagem e ``<a href>``), títulos, blocos de código cercados e uma tabela de
+início de linhas para converter posições em números de linha com bisect.
+Os links só são extraídos no primeiro acesso: quem precisa apenas dos
+títulos (ex: a validação de conformidade) não paga pela busca de links.
+"""
+
+import re
+from bisect import bisect_right
+from functools import cached_property
+from itertools import accumulate
+from typing import List, NamedTuple, Optional
+
+# [texto](url), ![alt](url) e <a href="url">; o lookahead inicial descarta
+# rapidamente as posições que não podem iniciar um link. Texto e URL vazios
+# (``[](x.md)``, ``[x]()``) não contam como link, como no verificador original
+LINK_PATTERN = re.compile(
+    r'(?=[!\[<])(?:(?P<image>!)?\[(?P<text>[^\]]+)\]\((?P<url>[^)]+)\)'
+    r'|<a\s+(?:[^>]*?\s)?href="(?P<href>[^"]*)")'
+)
+HEADING_PATTERN = re.compile(r' {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$')
+FENCE_PATTERN = re.compile(r' {0,3}(`{3,}|~{3,})[ \t]*([^`\s]*)')
+
+class Link(NamedTuple):
+    kind: str  # 'inline', 'image' ou 'html'
+    text: str
+    url: str
+    line: int
+    offset: int
+
+class Heading(NamedTuple):
+    level: int
+    text: str
+    line: int
+
+class CodeBlock(NamedTuple):
+    lang: str
+    line: int  # linha da cerca de abertura
+    end_line: int  # linha da cerca de fechamento (ou última linha do arquivo)
+    code: str
+
+class MarkdownDocument:
+    """Resultado da análise de um arquivo markdown."""
+
+    def __init__(self, text: str, path: Optional[str] = None):
+        self.path = path
+        self.text = text
+        lines = text.split('\n')
+        self.line_starts = list(accumulate((len(line) + 1 for line in lines[:-1]), initial=0))
+        self.headings: List[Heading] = []
+        self.code_blocks: List[CodeBlock] = []
+        self._scan_blocks(lines)
+
+    @cached_property
+    def links(self) -> List[Link]:
+        return [self._make_link(match) for match in LINK_PATTERN.finditer(self.text)]
+
+    def line_of(self, offset: int) -> int:
+        """Número da linha (a partir de 1) de uma posição no texto."""
+        return bisect_right(self.line_starts, offset)
+
+    def column_of(self, offset: int) -> int:
+        """Número da coluna (a partir de 1) de uma posição no texto."""
+        return offset - self.line_starts[self.line_of(offset) - 1] + 1
+
+    def _make_link(self, match) -> Link:
+        offset = match.start()
+        if match.group('href') is not None:
+            return Link('html', '', match.group('href'), self.line_of(offset), offset)
+        kind = 'image' if match.group('image') else 'inline'
+        return Link(kind, match.group('text'), match.group('url'), self.line_of(offset), offset)
+
+    def _scan_blocks(self, lines: List[str]):
+        """Separa títulos e blocos de código percorrendo as linhas uma vez."""
+        fence = None
+        fence_line = 0
+        fence_lang = ''
+        code_lines = []
+        for number, line in enumerate(lines, start=1):
+            if fence is not None:
+                stripped = line.strip()
+                if stripped.startswith(fence) and stripped.strip(fence[0]) == '':
+                    self.code_blocks.append(CodeBlock(fence_lang, fence_line, number, '\n'.join(code_lines)))
+                    fence = None
+                else:
+                    code_lines.append(line)
+                continue
+
+            head = line[:6]
+            match = FENCE_PATTERN.match(line) if ('`' in head or '~' in head) else None
+            if match:
+                fence = match.group(1)
+                fence_line = number
+                fence_lang = match.group(2).lower()
+                code_lines = []
+                continue
+
+            if '#' in line[:4]:
+                match = HEADING_PATTERN.match(line)
+                if match:
+                    self.headings.append(Heading(len(match.group(1)), (match.group(2) or '').strip(), number))
+
+        # Bloco não fechado vai até o fim do arquivo
+        if fence is not None:
+            self.code_blocks.append(CodeBlock(fence_lang, fence_line, len(self.line_starts), '\n'.join(code_lines)))
+
+def parse_markdown(text: str, path: Optional[str] = None) -> MarkdownDocument:
+    """Analisa um texto markdown."""
+    return MarkdownDocument(text, path)
+
+def read_document(path) -> MarkdownDocument:
+    """Lê e analisa um arquivo markdown (UTF-8)."""
+    path = str(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        return MarkdownDocument(f.read(), path)
@@ -0,0 +1,256 @@
+"""
+Verificação de links externos (http/https).
+
+Cliente HTTP/1.1 mínimo sobre asyncio, sem dependências externas: cada host
+tem um pool de conexões keep-alive e um limite próprio de requisições
+simultâneas, para não sobrecarregar um mesmo servidor. Cada URL é testada
+com HEAD e, se o servidor não aceitar HEAD, com GET. Os resultados ficam em
+um cache em disco com validade (TTL), então execuções repetidas não voltam
+a consultar as mesmas URLs.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import ssl
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote, urljoin, urlsplit
+
+CACHE_FORMAT = 1
+USER_AGENT = "verificar-links (+https://github.com/KlebersonCollab/docs)"
+MAX_REDIRECTS = 5
+# Corpo de GET maior que isto não é lido: a conexão é descartada
+MAX_BODY = 1 << 20
+# Servidores que recusam HEAD costumam responder com estes códigos
+HEAD_FALLBACK = {400, 403, 404, 405, 501}
+REDIRECTS = {301, 302, 303, 307, 308}
+# Respostas transitórias: não são cacheadas nem tratadas como link quebrado
+TRANSIENT = {408, 425, 429, 502, 503, 504}
+
+def is_external(url: str) -> bool:
+    return url.startswith(('http://', 'https://'))
+
+def normalize_url(url: str) -> str:
+    """URL consultada: sem título markdown, sem ``<>`` e sem fragmento."""
+    url = url.strip()
+    if url.startswith('<') and '>' in url:
+        url = url[1:url.index('>')]  # entre <> o destino pode ter espaços
+    elif url:
+        url = url.split(None, 1)[0]
+    return url.split('#', 1)[0]
+
+class ExternalCache:
+    """Resultados por URL persistidos em JSON, válidos por ``ttl`` segundos."""
+
+    def __init__(self, cache_path: Path, ttl: float):
+        self.cache_path = Path(cache_path)
+        self.ttl = ttl
+        self.entries: Dict[str, Dict] = {}
+        self.modified = False
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('format') == CACHE_FORMAT:
+            self.entries = data.get('entries', {})
+
+    def get(self, url: str, now: Optional[float] = None) -> Optional[Dict]:
+        entry = self.entries.get(url)
+        if entry is None or (now or time.time()) - entry['checked'] > self.ttl:
+            return None
+        return entry
+
+    def store(self, url: str, result: Dict):
+        self.entries[url] = result
+        self.modified = True
+
+    def save(self):
+        """Grava o cache de forma atômica, descartando entradas vencidas."""
+        if not self.modified:
+            return
+        now = time.time()
+        entries = {url: entry for url, entry in self.entries.items() if now - entry['checked'] <= self.ttl}
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(self.cache_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'format': CACHE_FORMAT, 'entries': entries}, ensure_ascii=False))
+        os.replace(tmp_path, self.cache_path)
+        self.modified = False
+
+class _Response:
+    def __init__(self, status: int, headers: Dict[str, str], reusable: bool):
+        self.status = status
+        self.headers = headers
+        self.reusable = reusable
+
+class ExternalChecker:
+    """Verifica URLs concorrentemente, com pool de conexões e limite por host."""
+
+    def __init__(self, per_host: int = 4, concurrency: int = 32, timeout: float = 10.0):
+        self.per_host = per_host
+        self.timeout = timeout
+        self._ssl = ssl.create_default_context()
+        self._limit = asyncio.Semaphore(concurrency)
+        self._host_limits: Dict[Tuple[str, str, int], asyncio.Semaphore] = {}
+        self._pools: Dict[Tuple[str, str, int], List[Tuple]] = {}
+
+    async def check_all(self, urls: Iterable[str]) -> Dict[str, Dict]:
+        urls = sorted(set(urls))
+        try:
+            results = await asyncio.gather(*(self.check(url) for url in urls))
+        finally:
+            self.close()
+        return dict(zip(urls, results))
+
+    def close(self):
+        for pool in self._pools.values():
+            for _, writer in pool:
+                writer.close()
+        self._pools.clear()
+
+    async def check(self, url: str) -> Dict:
+        """``{'status', 'ok', 'error', 'checked'}``; ``ok`` é None quando o resultado é transitório."""
+        result = {'status': None, 'ok': None, 'error': None, 'checked': time.time()}
+        async with self._limit:
+            try:
+                status = await self._follow(url)
+            except (OSError, asyncio.TimeoutError, ValueError) as e:
+                result['error'] = str(e) or type(e).__name__
+                # Nome inexistente ou conexão recusada não melhoram sozinhos
+                if isinstance(e, (ConnectionRefusedError, socket.gaierror, ssl.SSLError)):
+                    result['ok'] = False
+                return result
+        result['status'] = status
+        if status not in TRANSIENT:
+            result['ok'] = status < 400
+        return result
+
+    async def _follow(self, url: str) -> int:
+        """Status final após seguir redirecionamentos (HEAD, com GET como alternativa)."""
+        for _ in range(MAX_REDIRECTS + 1):
+            response = await self._request('HEAD', url)
+            if response.status in HEAD_FALLBACK:
+                response = await self._request('GET', url)
+            location = response.headers.get('location')
+            if response.status not in REDIRECTS or not location:
+                return response.status
+            url = urljoin(url, location)
+        raise ValueError(f'redirecionamentos demais (> {MAX_REDIRECTS})')
+
+    async def _request(self, method: str, url: str) -> _Response:
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f'URL inválida: {url}')
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        key = (parts.scheme, parts.hostname, port)
+        # Caracteres fora do ASCII são codificados; escapes já presentes ficam intactos
+        target = quote((parts.path or '/') + (f'?{parts.query}' if parts.query else ''), safe="!#$%&'()*+,/:;=?@[]~")
+        host = parts.hostname.encode('idna').decode('ascii')
+        if parts.port is not None:
+            host = f'{host}:{parts.port}'
+        request = (f'{method} {target} HTTP/1.1\r\nHost: {host}\r\nUser-Agent: {USER_AGENT}\r\n'
+                   f'Accept: */*\r\nConnection: keep-alive\r\n\r\n').encode('ascii')
+
+        limit = self._host_limits.setdefault(key, asyncio.Semaphore(self.per_host))
+        async with limit:
+            pool = self._pools.setdefault(key, [])
+            # Uma conexão ociosa pode ter sido fechada pelo servidor: tenta de novo com uma nova
+            while pool:
+                connection = pool.pop()
+                try:
+                    return await asyncio.wait_for(self._exchange(key, connection, method, request), self.timeout)
+                except (OSError, asyncio.IncompleteReadError, EOFError):
+                    connection[1].close()
+            connection = await asyncio.wait_for(self._connect(key), self.timeout)
+            return await asyncio.wait_for(self._exchange(key, connection, method, request), self.timeout)
+
+    async def _connect(self, key: Tuple[str, str, int]) -> Tuple:
+        scheme, hostname, port = key
+        if scheme == 'https':
+            return await asyncio.open_connection(hostname, port, ssl=self._ssl, server_hostname=hostname)
+        return await asyncio.open_connection(hostname, port)
+
+    async def _exchange(self, key, connection: Tuple, method: str, request: bytes) -> _Response:
+        reader, writer = connection
+        try:
+            writer.write(request)
+            await writer.drain()
+            response = await self._read_response(reader, method)
+        except BaseException:
+            writer.close()
+            raise
+        if response.reusable:
+            self._pools[key].append(connection)
+        else:
+            writer.close()
+        return response
+
+    async def _read_response(self, reader: asyncio.StreamReader, method: str) -> _Response:
+        status_line = await reader.readline()
+        if not status_line:
+            raise EOFError('conexão encerrada pelo servidor')
+        version, status = status_line.decode('latin-1').split(None, 2)[:2]
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        status = int(status)
+        connection = headers.get('connection', '').lower()
+        reusable = connection != 'close' and (version != 'HTTP/1.0' or connection == 'keep-alive')
+        if method == 'HEAD' or status in (204, 304) or status < 200:
+            return _Response(status, headers, reusable)
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            reusable = reusable and await self._skip_chunked(reader)
+        elif 'content-length' in headers:
+            length = int(headers['content-length'])
+            if length > MAX_BODY:
+                reusable = False
+            else:
+                await reader.readexactly(length)
+        else:
+            # Corpo delimitado pelo fim da conexão
+            reusable = False
+        return _Response(status, headers, reusable)
+
+    async def _skip_chunked(self, reader: asyncio.StreamReader) -> bool:
+        """Descarta um corpo chunked; False se for grande demais para ler."""
+        total = 0
+        while True:
+            size = int((await reader.readline()).split(b';', 1)[0].strip() or b'0', 16)
+            if size == 0:
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return True
+            total += size
+            if total > MAX_BODY:
+                return False
+            await reader.readexactly(size + 2)
+
+def check_urls(urls: Iterable[str], cache: Optional[ExternalCache] = None, per_host: int = 4,
+               concurrency: int = 32, timeout: float = 10.0) -> Dict[str, Dict]:
+    """Resultado de cada URL, consultando a rede só para o que não está no cache."""
+    urls = set(urls)
+    results = {}
+    if cache is not None:
+        for url in urls:
+            entry = cache.get(url)
+            if entry is not None:
+                results[url] = entry
+    pending = urls - results.keys()
+    if pending:
+        checker = ExternalChecker(per_host, concurrency, timeout)
+        for url, result in asyncio.run(checker.check_all(pending)).items():
+            results[url] = result
+            if cache is not None and result['ok'] is not None:
+                cache.store(url, result)
+    if cache is not None:
+        cache.save()
+    return results
@@ -0,0 +1,111 @@
+"""
+Escopo de validação a partir do git local.
+
+Para hooks de pre-commit e checagens de PR, apenas os arquivos alterados
+entre duas revisões (ou entre uma revisão e a árvore de trabalho) precisam
+ser validados. Os caminhos devolvidos são relativos à raiz da documentação,
+que pode ser um subdiretório do repositório.
+"""
+
+import subprocess
+import tarfile
+from typing import Dict, List, Optional, Set
+
+class GitError(Exception):
+    """Falha ao consultar o git."""
+
+def _git(root: str, *args: str) -> str:
+    try:
+        completed = subprocess.run(
+            ['git', '-C', str(root), *args],
+            check=True, capture_output=True, text=True, encoding='utf-8',
+        )
+    except FileNotFoundError as e:
+        raise GitError('git não encontrado no PATH') from e
+    except subprocess.CalledProcessError as e:
+        raise GitError(e.stderr.strip() or f'git {" ".join(args)} falhou') from e
+    return completed.stdout
+
+def _split_z(output: str) -> List[str]:
+    return [token for token in output.split('\0') if token]
+
+class GitChanges:
+    """Arquivos alterados entre duas revisões, relativos à raiz."""
+
+    def __init__(self):
+        self.changed: Set[str] = set()  # adicionados, modificados ou destino de rename/cópia
+        self.deleted: Set[str] = set()  # removidos ou origem de rename
+        self.renamed: Dict[str, str] = {}  # origem -> destino
+
+    def __len__(self) -> int:
+        return len(self.changed) + len(self.deleted)
+
+def changed_files(root: str, since: str, until: Optional[str] = None) -> GitChanges:
+    """Arquivos alterados de ``since`` até ``until`` (ou a árvore de trabalho).
+
+    Sem ``until``, arquivos novos ainda não rastreados também entram em
+    ``changed``.
+    """
+    args = ['diff', '--name-status', '-z', '-M', '--relative', since]
+    if until:
+        args.append(until)
+    tokens = _split_z(_git(root, *args))
+
+    changes = GitChanges()
+    i = 0
+    while i < len(tokens):
+        status = tokens[i]
+        kind = status[0]
+        if kind in 'RC':
+            old_path, new_path = tokens[i + 1], tokens[i + 2]
+            changes.changed.add(new_path)
+            if kind == 'R':
+                changes.deleted.add(old_path)
+                changes.renamed[old_path] = new_path
+            i += 3
+            continue
+        path = tokens[i + 1]
+        if kind == 'D':
+            changes.deleted.add(path)
+        else:
+            changes.changed.add(path)
+        i += 2
+
+    if not until:
+        changes.changed.update(_split_z(_git(root, 'ls-files', '-z', '--others', '--exclude-standard')))
+    return changes
+
+def tracked_files(root: str, rev: Optional[str] = None) -> Set[str]:
+    """Arquivos presentes na árvore de trabalho segundo o índice do git.
+
+    Muito mais barato que percorrer o disco em repositórios grandes: inclui
+    arquivos rastreados e novos (não ignorados), sem os removidos. Com
+    ``rev``, os arquivos da árvore dessa revisão.
+    """
+    if rev:
+        return set(_split_z(_git(root, 'ls-tree', '-r', '-z', '--name-only', rev)))
+    files = set(_split_z(_git(root, 'ls-files', '-z', '--cached', '--others', '--exclude-standard')))
+    files.difference_update(_split_z(_git(root, 'ls-files', '-z', '--deleted')))
+    return files
+
+def export_tree(root: str, rev: str, dest: str) -> None:
+    """Extrai em ``dest`` o conteúdo de ``root`` como estava em ``rev`` (``git archive``)."""
+    toplevel = _git(root, 'rev-parse', '--show-toplevel').strip()
+    prefix = _git(root, 'rev-parse', '--show-prefix').strip()
+    try:
+        proc = subprocess.Popen(['git', '-C', toplevel, 'archive', '--format=tar', f'{rev}:{prefix}'],
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except FileNotFoundError as e:
+        raise GitError('git não encontrado no PATH') from e
+    tar_error = None
+    try:
+        with tarfile.open(fileobj=proc.stdout, mode='r|') as archive:
+            archive.extractall(dest)
+    except tarfile.TarError as e:
+        tar_error = e  # o erro do git, se houver, é mais informativo
+    finally:
+        proc.stdout.close()
+        stderr = proc.stderr.read().decode('utf-8', 'replace')
+        proc.stderr.close()
+    if proc.wait() != 0 or tar_error is not None:
+        raise GitError(stderr.strip() or f'git archive {rev} falhou: {tar_error}')
@@ -0,0 +1,154 @@
+"""
+Cache persistente e incremental para os verificadores de links.
+
+Cada arquivo markdown tem uma entrada indexada pelo caminho relativo com
+mtime, tamanho e hash do conteúdo, os alvos que seus links consultaram e o
+resultado da validação. Um índice reverso (alvo -> arquivos que apontam para
+ele) permite revalidar apenas os arquivos afetados quando alvos são
+adicionados, removidos ou renomeados.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+CACHE_FORMAT = 1
+
+def content_digest(data: bytes) -> str:
+    """Hash curto e rápido do conteúdo de um arquivo."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+class LinkCache:
+    """Resultados de validação de links por arquivo, persistidos em JSON.
+
+    ``version`` identifica a lógica de validação do script que usa o cache;
+    ao mudar, todas as entradas são descartadas.
+    """
+
+    def __init__(self, cache_path: Path, version: str):
+        self.cache_path = Path(cache_path)
+        self.version = version
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.reverse: Dict[str, Set[str]] = {}
+        self.universe: Set[str] = set()
+        self.modified = False
+        self.load()
+
+    def load(self):
+        """Carrega o cache do disco; um cache ausente ou inválido é ignorado."""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        
+        if data.get('format') != CACHE_FORMAT or data.get('version') != self.version:
+            return
+        
+        self.entries = data.get('entries', {})
+        self.universe = set(data.get('universe', []))
+        self.reverse = {}
+        for target, sources in data.get('reverse', {}).items():
+            self.reverse[target] = set(sources)
+
+    def save(self):
+        """Grava o cache de forma atômica (apenas se algo mudou)."""
+        if not self.modified:
+            return
+        data = {
+            'format': CACHE_FORMAT,
+            'version': self.version,
+            'universe': sorted(self.universe),
+            'entries': self.entries,
+            'reverse': {target: sorted(sources) for target, sources in self.reverse.items()},
+        }
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(self.cache_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            # json.dumps usa o encoder em C; json.dump em arquivo não
+            f.write(json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+        os.replace(tmp_path, self.cache_path)
+        self.modified = False
+
+    def changed_targets(self, universe: Set[str]) -> Set[str]:
+        """Registra o conjunto atual de alvos e devolve o que mudou desde a última execução."""
+        changed = self.universe ^ universe
+        if changed:
+            self.universe = set(universe)
+            self.modified = True
+        return changed
+
+    def dependents(self, targets: Iterable[str]) -> Set[str]:
+        """Arquivos cujos links consultaram algum dos alvos informados."""
+        affected = set()
+        for target in targets:
+            affected.update(self.reverse.get(target, ()))
+        return affected
+
+    def get(self, rel_path: str, st: os.stat_result) -> Optional[Dict[str, Any]]:
+        """Entrada do arquivo se mtime e tamanho não mudaram."""
+        entry = self.entries.get(rel_path)
+        if entry and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+            return entry
+        return None
+
+    def get_by_digest(self, rel_path: str, st: os.stat_result, digest: str) -> Optional[Dict[str, Any]]:
+        """Entrada do arquivo se o conteúdo é o mesmo (ex: apenas ``touch``)."""
+        entry = self.entries.get(rel_path)
+        if entry and entry['digest'] == digest:
+            entry['mtime_ns'] = st.st_mtime_ns
+            entry['size'] = st.st_size
+            self.modified = True
+            return entry
+        return None
+
+    def store(self, rel_path: str, st: os.stat_result, digest: str,
+              targets: Iterable[str], result: Any):
+        """Grava o resultado de um arquivo e atualiza o índice reverso."""
+        self._unlink(rel_path)
+        self.modified = True
+        targets = sorted(set(targets))
+        self.entries[rel_path] = {
+            'mtime_ns': st.st_mtime_ns,
+            'size': st.st_size,
+            'digest': digest,
+            'targets': targets,
+            'result': result,
+        }
+        for target in targets:
+            self.reverse.setdefault(target, set()).add(rel_path)
+
+    def prune(self, live_paths: Set[str]):
+        """Remove entradas de arquivos que não existem mais."""
+        self.discard([p for p in self.entries if p not in live_paths])
+
+    def discard(self, rel_paths: Iterable[str]):
+        """Esquece entradas que não podem mais ser reaproveitadas."""
+        for rel_path in rel_paths:
+            if rel_path in self.entries:
+                self._unlink(rel_path)
+                del self.entries[rel_path]
+                self.modified = True
+
+    def _unlink(self, rel_path: str):
+        entry = self.entries.get(rel_path)
+        if not entry:
+            return
+        for target in entry['targets']:
+            sources = self.reverse.get(target)
+            if sources is not None:
+                sources.discard(rel_path)
+                if not sources:
+                    del self.reverse[target]
+
+def ancestors(rel_paths: Iterable[str]) -> List[str]:
+    """Diretórios ancestrais (relativos) de uma coleção de caminhos."""
+    dirs = set()
+    for rel_path in rel_paths:
+        parent = os.path.dirname(rel_path)
+        while parent and parent not in dirs:
+            dirs.add(parent)
+            parent = os.path.dirname(parent)
+    return sorted(dirs)
@@ -0,0 +1,128 @@
+"""
+Grafo de links entre arquivos da documentação.
+
+Guarda as arestas nos dois sentidos (quem um arquivo cita e quem cita um
+arquivo), para que "quem aponta para X?" seja uma consulta direta. O grafo
+pode ser persistido em SQLite, de modo que consultas de alcançabilidade
+(BFS) rodem sobre o arquivo salvo sem reler a documentação.
+"""
+
+import os
+import sqlite3
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+GRAPH_FORMAT = 1
+
+class LinkGraph:
+    """Arestas origem -> alvo com índice reverso, ambos por caminho relativo."""
+
+    def __init__(self):
+        self.nodes: Set[str] = set()  # arquivos de origem (markdown), mesmo sem links
+        self.forward: Dict[str, Set[str]] = {}
+        self.reverse: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(targets) for targets in self.forward.values())
+
+    def set_links(self, source: str, targets: Iterable[str]):
+        """Substitui as arestas que saem de ``source``."""
+        self.remove_source(source)
+        targets = set(targets)
+        self.nodes.add(source)
+        self.forward[source] = targets
+        for target in targets:
+            self.reverse.setdefault(target, set()).add(source)
+
+    def remove_source(self, source: str):
+        self.nodes.discard(source)
+        for target in self.forward.pop(source, ()):
+            sources = self.reverse.get(target)
+            if sources is not None:
+                sources.discard(source)
+                if not sources:
+                    del self.reverse[target]
+
+    def links_from(self, source: str) -> Set[str]:
+        return self.forward.get(source, set())
+
+    def links_to(self, target: str) -> Set[str]:
+        return self.reverse.get(target, set())
+
+    def reachable(self, entries: Iterable[str], blocked: Set[str] = frozenset()) -> Set[str]:
+        """Arquivos alcançáveis a partir de ``entries`` (BFS), sem passar por ``blocked``."""
+        seen = {entry for entry in entries if entry not in blocked}
+        queue = deque(seen)
+        while queue:
+            for target in self.forward.get(queue.popleft(), ()):
+                if target not in seen and target not in blocked:
+                    seen.add(target)
+                    queue.append(target)
+        return seen
+
+    def orphans(self, entries: Iterable[str]) -> List[str]:
+        """Páginas que nenhum caminho de links a partir de ``entries`` alcança."""
+        return sorted(self.nodes - self.reachable(entries))
+
+    def top_in_degree(self, limit: int = 10) -> List[Tuple[str, int]]:
+        """Alvos mais citados (número de arquivos distintos que apontam para eles)."""
+        ranked = sorted(self.reverse.items(), key=lambda item: (-len(item[1]), item[0]))
+        return [(target, len(sources)) for target, sources in ranked[:limit]]
+
+    def targets_under(self, path: str) -> Set[str]:
+        """Alvos iguais a ``path`` ou dentro dele (quando é um diretório)."""
+        prefix = path.rstrip(os.sep) + os.sep
+        return {target for target in self.reverse if target == path or target.startswith(prefix)}
+
+    def save(self, db_path: str):
+        """Grava o grafo em SQLite, substituindo o arquivo de forma atômica."""
+        tmp_path = db_path + '.tmp'
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        paths = sorted(self.nodes | set(self.reverse))
+        ids = {path: number for number, path in enumerate(paths)}
+        db = sqlite3.connect(tmp_path)
+        try:
+            db.executescript("""
+                CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+                CREATE TABLE nodes (id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, source INTEGER NOT NULL);
+                CREATE TABLE edges (source INTEGER NOT NULL, target INTEGER NOT NULL, PRIMARY KEY (source, target))
+                    WITHOUT ROWID;
+                CREATE INDEX edges_target ON edges (target);
+            """)
+            db.execute("INSERT INTO meta VALUES ('format', ?)", (str(GRAPH_FORMAT),))
+            db.executemany("INSERT INTO nodes VALUES (?, ?, ?)",
+                           ((ids[path], path, path in self.nodes) for path in paths))
+            db.executemany("INSERT INTO edges VALUES (?, ?)",
+                           ((ids[source], ids[target]) for source, targets in self.forward.items()
+                            for target in targets))
+            db.commit()
+        finally:
+            db.close()
+        os.replace(tmp_path, db_path)
+
+    @classmethod
+    def load(cls, db_path: str) -> 'LinkGraph':
+        """Lê um grafo gravado por ``save``; ValueError se o arquivo não for um grafo válido."""
+        if not os.path.exists(db_path):
+            raise ValueError(f"grafo inexistente: {db_path}")
+        db = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            row = db.execute("SELECT value FROM meta WHERE key = 'format'").fetchone()
+            if row is None or row[0] != str(GRAPH_FORMAT):
+                raise ValueError(f"formato de grafo não suportado: {db_path}")
+            paths = {}
+            graph = cls()
+            for number, path, is_source in db.execute("SELECT id, path, source FROM nodes"):
+                paths[number] = path
+                if is_source:
+                    graph.nodes.add(path)
+                    graph.forward[path] = set()
+            for source, target in db.execute("SELECT source, target FROM edges"):
+                graph.forward[paths[source]].add(paths[target])
+                graph.reverse.setdefault(paths[target], set()).add(paths[source])
+        except sqlite3.DatabaseError as e:
+            raise ValueError(f"grafo ilegível: {db_path}: {e}") from e
+        finally:
+            db.close()
+        return graph
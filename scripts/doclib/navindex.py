@@ -0,0 +1,322 @@
+"""
+Seções geradas dos documentos de navegação.
+
+Os documentos de navegação (``NAVIGATION.md``, ``MAPA_NAVEGACAO.md``...)
+continuam escritos à mão; só os trechos entre os marcadores
+
+    <!-- indice:inicio lista fonte=templates secoes=3 -->
+    <!-- indice:fim -->
+
+são gerados a partir do índice de arquivos e dos títulos dos documentos.
+Há dois tipos de seção:
+
+- ``arvore``: árvore de diretórios de ``fonte`` até ``nivel`` níveis (2 por
+  padrão), com a quantidade de documentos de cada um;
+- ``lista``: documentos de ``fonte`` (até ``nivel`` níveis, filtrados pelo
+  glob ``arquivo``) agrupados por diretório, com o título principal, o link
+  para a tradução e as primeiras ``secoes`` seções de nível 2.
+
+O esboço (título e seções) de cada documento fica em um ``LinkCache`` e só
+é relido quando o arquivo muda. Um segundo ``LinkCache`` guarda, para cada
+seção gerada, o hash do corpo gravado e o hash do que ela mostra (os
+documentos cobertos e, nas listas, seus títulos, seções e traduções). Uma
+seção só é regenerada quando um dos dois muda, então o resultado não
+depende de quais documentos de navegação as execuções anteriores
+processaram; e só os documentos de navegação com alguma seção alterada são
+regravados.
+"""
+
+import fnmatch
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+from doclib.bilingual import LANGUAGE_SECTIONS, is_translation, translation_candidates
+from doclib.document import MarkdownDocument
+from doclib.link_cache import LinkCache, content_digest
+from doclib.slugs import heading_slugs
+
+NAVINDEX_VERSION = "navindex/3"
+NAVIGATION_DOCS = ("NAVIGATION.md", "MAPA_NAVEGACAO.md", "INDICE_ORGANIZACIONAL.md", "GUIA_CENTRAL.md")
+KINDS = ("arvore", "lista")
+END_MARKER = "<!-- indice:fim -->"
+
+_START = re.compile(r'<!--\s*indice:inicio\s+(\w+)((?:\s+[\w-]+=\S+)*)\s*-->')
+_PARAM = re.compile(r'([\w-]+)=(\S+)')
+
+class IndexSpecError(ValueError):
+    """Marcadores de seção gerada inválidos em um documento de navegação."""
+
+class Outline(NamedTuple):
+    title: str  # título principal (vazio se o documento não tem H1)
+    sections: List[List[str]]  # [título, âncora] das seções de nível 2
+
+class Region(NamedTuple):
+    key: str  # documento#especificação, único no repositório
+    kind: str
+    params: Dict[str, str]
+    start: int  # índice da linha do marcador de início
+    end: int  # índice da linha do marcador de fim
+
+    @property
+    def source(self) -> str:
+        return self.params.get('fonte', '.').strip('/') or '.'
+
+    @property
+    def depth(self) -> Optional[int]:
+        return int(self.params['nivel']) if 'nivel' in self.params else None
+
+    def covers(self, rel_path: str) -> bool:
+        """O documento está no escopo da seção (a lista depende também de ``nivel`` e ``arquivo``)."""
+        source = self.source
+        if source != '.':
+            if not rel_path.startswith(source + '/'):
+                return False
+            rel_path = rel_path[len(source) + 1:]
+        if rel_path.startswith('.') or '/.' in rel_path:
+            return False  # diretórios ocultos (ex: .cursor/)
+        if self.kind == 'lista':
+            depth = self.depth
+            if depth is not None and rel_path.count('/') > depth:
+                return False
+            if is_translation(rel_path):
+                return False
+            pattern = self.params.get('arquivo')
+            if pattern and not fnmatch.fnmatch(os.path.basename(rel_path), pattern):
+                return False
+        return True
+
+class Refresh(NamedTuple):
+    added: Set[str]
+    removed: Set[str]
+    modified: Set[str]  # documentos cujo esboço (título ou seções) mudou
+
+class RegionChange(NamedTuple):
+    document: str
+    region: str
+    changed: bool  # o conteúdo gerado difere do que está no documento
+
+def document_outline(document: MarkdownDocument) -> Outline:
+    """Título principal e seções de nível 2, com as âncoras no estilo do GitHub."""
+    headings = document.headings
+    title = next((h.text for h in headings if h.level == 1), '')
+    slugs = heading_slugs(h.text for h in headings)
+    sections = [[h.text, slug] for h, slug in zip(headings, slugs)
+                if h.level == 2 and h.text.strip().lower() not in LANGUAGE_SECTIONS]
+    return Outline(title, sections)
+
+def find_regions(rel_path: str, lines: List[str]) -> List[Region]:
+    """Seções geradas de um documento de navegação, na ordem em que aparecem."""
+    regions = []
+    seen: Dict[str, int] = {}
+    start = None
+    for index, line in enumerate(lines):
+        stripped = line.strip()
+        match = _START.fullmatch(stripped)
+        if match:
+            if start is not None:
+                raise IndexSpecError(f"{rel_path}:{index + 1}: seção gerada aberta dentro de outra")
+            kind, params = match.group(1), dict(_PARAM.findall(match.group(2)))
+            if kind not in KINDS:
+                raise IndexSpecError(f"{rel_path}:{index + 1}: tipo de seção desconhecido {kind!r}")
+            if 'nivel' in params and not params['nivel'].isdigit():
+                raise IndexSpecError(f"{rel_path}:{index + 1}: nivel deve ser um número")
+            start = (index, kind, params, ' '.join(stripped.split()[2:-1]))
+        elif stripped == END_MARKER:
+            if start is None:
+                raise IndexSpecError(f"{rel_path}:{index + 1}: fim de seção gerada sem início")
+            begin, kind, params, spec = start
+            key = f"{rel_path}#{spec}"
+            seen[key] = seen.get(key, 0) + 1
+            if seen[key] > 1:
+                key += f"#{seen[key]}"
+            regions.append(Region(key, kind, params, begin, index))
+            start = None
+    if start is not None:
+        raise IndexSpecError(f"{rel_path}:{start[0] + 1}: seção gerada sem {END_MARKER}")
+    return regions
+
+def _link_text(text: str) -> str:
+    text = ' '.join(text.replace('*', '').replace('`', '').split())
+    return text.replace('[', '(').replace(']', ')')
+
+def render_tree(region: Region, paths: List[str]) -> List[str]:
+    """Árvore de diretórios com a quantidade de documentos (recursiva) de cada um."""
+    depth = region.depth if region.depth is not None else 2
+    prefix = '' if region.source == '.' else region.source + '/'
+    counts: Dict[str, int] = {}
+    for rel_path in paths:
+        parts = rel_path[len(prefix):].split('/')[:-1]
+        for level in range(1, min(len(parts), depth) + 1):
+            directory = '/'.join(parts[:level])
+            counts[directory] = counts.get(directory, 0) + 1
+    # Ordenar pelas partes do caminho dá a pré-ordem da árvore
+    directories = sorted(counts, key=lambda d: d.split('/'))
+    last_child: Dict[str, str] = {}
+    for directory in directories:
+        last_child[directory.rpartition('/')[0]] = directory
+
+    lines = ['```text', f"{prefix or './'} ({len(paths)} documentos)"]
+    for directory in directories:
+        parts = directory.split('/')
+        ancestors = ['/'.join(parts[:level]) for level in range(1, len(parts))]
+        indent = ''.join('    ' if last_child[a.rpartition('/')[0]] == a else '│   ' for a in ancestors)
+        branch = '└── ' if last_child[directory.rpartition('/')[0]] == directory else '├── '
+        lines.append(f"{indent}{branch}{parts[-1]}/ ({counts[directory]})")
+    lines.append('```')
+    return lines
+
+def render_list(region: Region, document: str, paths: List[str], outlines: Dict[str, Outline],
+                present: Set[str]) -> List[str]:
+    """Documentos agrupados por diretório, com título, tradução e seções."""
+    base = os.path.dirname(document)
+    limit = int(region.params.get('secoes', '0') or 0)
+    lines: List[str] = []
+    current = None
+    for rel_path in sorted(paths, key=lambda p: (os.path.dirname(p), os.path.basename(p) != 'README.md', p)):
+        directory = os.path.dirname(rel_path)
+        if directory != current:
+            if lines:
+                lines.append('')
+            lines.append(f"**{directory or '.'}/**")
+            current = directory
+        outline = outlines.get(rel_path) or Outline('', [])
+        href = os.path.relpath(rel_path, base) if base else rel_path
+        title = _link_text(outline.title) or os.path.basename(rel_path)
+        item = f"- [{title}]({href})"
+        translation = next((c for c in translation_candidates(rel_path) if c in present), None)
+        if translation is not None:
+            item += f" · [PT-BR]({os.path.relpath(translation, base) if base else translation})"
+        lines.append(item)
+        for text, slug in outline.sections[:limit]:
+            lines.append(f"  - [{_link_text(text)}]({href}#{slug})")
+    return lines or ['_Nenhum documento._']
+
+def _body_digest(lines: Iterable[str]) -> str:
+    return hashlib.blake2b('\n'.join(lines).encode('utf-8'), digest_size=16).hexdigest()
+
+def _inputs_digest(region: Region, covered: List[str], outlines: Dict[str, Outline], present: Set[str]) -> str:
+    """Hash do que a seção mostra: os documentos cobertos e, nas listas, títulos, seções e traduções."""
+    if region.kind == 'arvore':
+        shown = covered
+    else:
+        limit = int(region.params.get('secoes', '0') or 0)
+        shown = []
+        for rel_path in covered:
+            outline = outlines.get(rel_path) or Outline('', [])
+            translation = next((c for c in translation_candidates(rel_path) if c in present), None)
+            shown.append([rel_path, outline.title, outline.sections[:limit], translation])
+    return hashlib.blake2b(json.dumps(shown, ensure_ascii=False).encode('utf-8'), digest_size=16).hexdigest()
+
+class NavigationIndex:
+    """Esboços dos documentos e dependências das seções geradas, persistidos em ``cache_dir``."""
+
+    def __init__(self, root: Path, cache_dir: Optional[Path] = None):
+        self.root = Path(root)
+        self.outline_cache = self.region_cache = None
+        if cache_dir is not None:
+            self.outline_cache = LinkCache(Path(cache_dir) / "nav-outlines.json", NAVINDEX_VERSION)
+            self.region_cache = LinkCache(Path(cache_dir) / "nav-sections.json", NAVINDEX_VERSION)
+        self.outlines: Dict[str, Outline] = {}
+        self.parsed = 0  # documentos relidos nesta execução
+
+    def refresh(self, rel_paths: Iterable[str]) -> Refresh:
+        """Atualiza os esboços e informa os documentos novos, removidos e com esboço alterado."""
+        live = set(rel_paths)
+        known = set(self.outline_cache.entries) if self.outline_cache is not None else set()
+        modified = set()
+        for rel_path in sorted(live):
+            outline, changed = self._outline(rel_path)
+            if outline is not None:
+                self.outlines[rel_path] = outline
+            if changed and rel_path in known:
+                modified.add(rel_path)
+        if self.outline_cache is not None:
+            self.outline_cache.prune(live)
+        return Refresh(live - known, known - live, modified)
+
+    def _outline(self, rel_path: str):
+        """(esboço, se mudou desde a última execução); relê o arquivo só se ele mudou."""
+        path = self.root / rel_path
+        try:
+            st = os.stat(path)
+            entry = self.outline_cache.get(rel_path, st) if self.outline_cache is not None else None
+            if entry is not None:
+                return Outline(*entry['result']), False
+            with open(path, 'rb') as f:
+                data = f.read()
+            digest = content_digest(data)
+            entry = self.outline_cache.get_by_digest(rel_path, st, digest) if self.outline_cache is not None else None
+            if entry is not None:
+                return Outline(*entry['result']), False
+            outline = document_outline(MarkdownDocument(data.decode('utf-8'), rel_path))
+        except (OSError, UnicodeDecodeError):
+            return None, True
+        self.parsed += 1
+        previous = self.outline_cache.entries.get(rel_path) if self.outline_cache is not None else None
+        if self.outline_cache is not None:
+            self.outline_cache.store(rel_path, st, digest, (), list(outline))
+        return outline, previous is None or Outline(*previous['result']) != outline
+
+    def update(self, documents: Iterable[str], check: bool = False, force: bool = False) -> List[RegionChange]:
+        """Regenera, em cada documento de navegação, as seções cujo conteúdo mostrado mudou.
+
+        Usa os esboços carregados por ``refresh``. Seções novas, editadas à
+        mão ou com a especificação alterada também são regeneradas. Com
+        ``check`` nada é gravado: apenas informa as seções desatualizadas.
+        """
+        cache = self.region_cache
+        paths = sorted(self.outlines)
+        present = set(paths)
+        changes = []
+        processed: Set[str] = set()
+        seen_regions: Set[str] = set()
+        for document in documents:
+            processed.add(document)
+            path = self.root / document
+            with open(path, 'r', encoding='utf-8') as f:
+                lines = f.read().split('\n')
+            regions = find_regions(document, lines)
+            replacements = []
+            rewrite = False
+            for region in regions:
+                seen_regions.add(region.key)
+                body = lines[region.start + 1:region.end]
+                covered = [p for p in paths if region.covers(p)]
+                inputs = _inputs_digest(region, covered, self.outlines, present)
+                entry = cache.entries.get(region.key) if cache is not None else None
+                stale = force or entry is None or entry['result'] != [_body_digest(body), inputs]
+                if not stale:
+                    continue
+                if region.kind == 'arvore':
+                    rendered = render_tree(region, covered)
+                else:
+                    rendered = render_list(region, document, covered, self.outlines, present)
+                changes.append(RegionChange(document, region.key, rendered != body))
+                replacements.append((region, rendered, inputs))
+                rewrite = rewrite or rendered != body
+            if check or not replacements:
+                continue
+            for region, rendered, _ in reversed(replacements):
+                lines[region.start + 1:region.end] = rendered
+            if rewrite:
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write('\n'.join(lines))
+            if cache is not None:
+                st = os.stat(path)
+                for region, rendered, inputs in replacements:
+                    cache.store(region.key, st, region.key, (), [_body_digest(rendered), inputs])
+        if cache is not None and not check:
+            # Seções apagadas dos documentos processados
+            cache.discard([key for key in cache.entries
+                           if key.split('#', 1)[0] in processed and key not in seen_regions])
+        return changes
+
+    def save(self):
+        if self.outline_cache is not None:
+            self.outline_cache.save()
+        if self.region_cache is not None:
+            self.region_cache.save()
@@ -0,0 +1,145 @@
+"""
+Instrumentação dos scripts (opção ``--profile``).
+
+Mede tempo de relógio e de CPU por fase, a vazão em arquivos e links por
+segundo e os arquivos mais lentos. Para investigação mais funda, grava um
+perfil do cProfile (abrir com ``python -m pstats``) ou um snapshot do
+tracemalloc (``tracemalloc.Snapshot.load``).
+
+Sem ``--profile`` os scripts recebem um ``Profiler`` desligado, cujas
+chamadas não fazem nada, para não espalhar ``if`` pelo código medido.
+"""
+
+import heapq
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+class Profiler:
+    """Acumula tempos por fase e por arquivo."""
+
+    def __init__(self, enabled: bool = True, top: int = 10,
+                 cprofile_path: Optional[str] = None, tracemalloc_path: Optional[str] = None):
+        self.enabled = enabled
+        self.top = top
+        self.cprofile_path = cprofile_path
+        self.tracemalloc_path = tracemalloc_path
+        # fase -> [relógio, cpu, chamadas]; a ordem de inserção é a de exibição
+        self.phases: Dict[str, List[float]] = {}
+        self.parents: Dict[str, Optional[str]] = {}
+        self.files = 0
+        self.parsed = 0
+        self.links = 0
+        self._slowest: List[Tuple[float, str]] = []
+        self._started = (time.perf_counter(), time.process_time())
+        self._cprofile = None
+
+    def start(self):
+        """Inicia as medições profundas pedidas (cProfile/tracemalloc)."""
+        self._started = (time.perf_counter(), time.process_time())
+        if not self.enabled:
+            return
+        if self.tracemalloc_path:
+            import tracemalloc
+            tracemalloc.start(25)
+        if self.cprofile_path:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    @contextmanager
+    def phase(self, name: str, parent: Optional[str] = None):
+        if not self.enabled:
+            yield
+            return
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - wall, time.process_time() - cpu, parent)
+
+    def add(self, name: str, wall: float, cpu: float = 0.0, parent: Optional[str] = None):
+        """Soma uma medição a uma fase (subfases indicam a fase que as contém)."""
+        if not self.enabled:
+            return
+        totals = self.phases.get(name)
+        if totals is None:
+            totals = self.phases[name] = [0.0, 0.0, 0]
+            self.parents[name] = parent
+        totals[0] += wall
+        totals[1] += cpu
+        totals[2] += 1
+
+    def record_file(self, rel_path: str, seconds: float, links: int = 0):
+        """Registra um arquivo analisado; guarda só os ``top`` mais lentos."""
+        if not self.enabled:
+            return
+        self.parsed += 1
+        self.links += links
+        if len(self._slowest) < self.top:
+            heapq.heappush(self._slowest, (seconds, rel_path))
+        elif seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, (seconds, rel_path))
+
+    def stop(self):
+        """Encerra as medições profundas e grava os arquivos pedidos."""
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.cprofile_path)
+            self._cprofile = None
+            print(f"💾 Perfil cProfile salvo em: {self.cprofile_path} (python -m pstats {self.cprofile_path})")
+        if self.tracemalloc_path:
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                snapshot = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                snapshot.dump(self.tracemalloc_path)
+                print(f"💾 Snapshot tracemalloc salvo em: {self.tracemalloc_path} "
+                      f"(atual {current / 1e6:.1f} MB, pico {peak / 1e6:.1f} MB)")
+
+    def report(self):
+        """Imprime o resumo por fase, a vazão e os arquivos mais lentos."""
+        if not self.enabled:
+            return
+        self.stop()
+        wall = time.perf_counter() - self._started[0]
+        cpu = time.process_time() - self._started[1]
+        print("\n⏱️  Perfil de execução")
+        print(f"  {'fase':<28} {'relógio':>10} {'cpu':>10} {'%':>6}")
+        # Subfases logo abaixo da fase que as contém
+        top_level = [name for name, parent in self.parents.items() if parent not in self.phases]
+        for name in top_level:
+            children = [child for child, parent in self.parents.items() if parent == name]
+            for label, phase in [(name, name)] + [(f"  ↳ {child}", child) for child in children]:
+                phase_wall, phase_cpu, _ = self.phases[phase]
+                share = 100 * phase_wall / wall if wall else 0.0
+                print(f"  {label:<28} {phase_wall * 1000:8.1f}ms {phase_cpu * 1000:8.1f}ms {share:5.1f}%")
+        print(f"  {'total':<28} {wall * 1000:8.1f}ms {cpu * 1000:8.1f}ms")
+        if wall:
+            throughput = f"  📄 {self.files} arquivos ({self.files / wall:.0f}/s); {self.parsed} analisados"
+            if self.links:
+                throughput += f", {self.links} links ({self.links / wall:.0f} links/s)"
+            print(throughput)
+        if self._slowest:
+            print("  🐢 Arquivos mais lentos:")
+            for seconds, rel_path in sorted(self._slowest, reverse=True):
+                print(f"    {seconds * 1000:7.2f}ms  {rel_path}")
+
+def add_profile_arguments(parser):
+    """Registra --profile, --profile-top, --cprofile e --tracemalloc."""
+    parser.add_argument("--profile", action="store_true",
+                        help="Mostra tempo de relógio/CPU por fase, vazão e os arquivos mais lentos")
+    parser.add_argument("--profile-top", type=int, default=10, metavar="N",
+                        help="Quantidade de arquivos lentos listados por --profile (padrão: 10)")
+    parser.add_argument("--cprofile", metavar="PATH",
+                        help="Grava um perfil do cProfile da execução (implica --profile)")
+    parser.add_argument("--tracemalloc", metavar="PATH",
+                        help="Grava um snapshot do tracemalloc no fim da execução (implica --profile)")
+
+def profiler_from_args(args) -> Profiler:
+    """Profiler ligado conforme as opções (desligado se nenhuma foi usada)."""
+    enabled = bool(args.profile or args.cprofile or args.tracemalloc)
+    profiler = Profiler(enabled, args.profile_top, args.cprofile, args.tracemalloc)
+    profiler.start()
+    return profiler
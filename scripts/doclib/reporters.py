@@ -0,0 +1,179 @@
+"""
+Relatórios de links em fluxo contínuo.
+
+Cada destino recebe os problemas arquivo por arquivo (``add``) e é fechado
+no fim (``close``); nenhum deles acumula a lista completa em memória. Os
+formatos de máquina (NDJSON e SARIF) são escritos direto no arquivo; o
+relatório markdown, cujo resumo vem antes dos detalhes, escreve o corpo em
+um arquivo temporário e o copia para o destino depois do cabeçalho.
+
+Um problema é um dicionário com ``line``, ``type`` e ``message`` e,
+opcionalmente, ``column``, ``link_url`` e ``suggestion``.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Iterable, List, TextIO
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+# Regras SARIF para os tipos de problema emitidos pelos scripts
+RULES = {
+    'broken_link': 'Link para arquivo ou diretório inexistente',
+    'broken_anchor': 'Link para âncora (#fragmento) inexistente',
+    'broken_external': 'Link externo (http/https) inacessível',
+    'error': 'Arquivo não pôde ser lido',
+}
+
+class Reporter(ABC):
+    """Destino de relatório; conta arquivos e problemas recebidos."""
+
+    def __init__(self):
+        self.files = 0
+        self.issues = 0
+
+    def add(self, rel_path: str, issues: List[Dict]):
+        """Registra os problemas de um arquivo (ignorado se não houver nenhum)."""
+        if not issues:
+            return
+        self.files += 1
+        self.issues += len(issues)
+        self.write_file(rel_path, issues)
+
+    @abstractmethod
+    def write_file(self, rel_path: str, issues: List[Dict]):
+        """Escreve os problemas de um arquivo no destino."""
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class NdjsonReporter(Reporter):
+    """Um objeto JSON por linha e por problema."""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self._stream = open(path, 'w', encoding='utf-8')
+
+    def write_file(self, rel_path: str, issues: List[Dict]):
+        for issue in issues:
+            record = {'file': rel_path.replace(os.sep, '/')}
+            record.update((key, value) for key, value in issue.items() if key != 'file')
+            self._stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def close(self):
+        self._stream.close()
+
+class SarifReporter(Reporter):
+    """SARIF 2.1.0 com um único run; os resultados são escritos à medida que chegam."""
+
+    def __init__(self, path: str, tool_name: str, tool_version: str):
+        super().__init__()
+        self._stream = open(path, 'w', encoding='utf-8')
+        driver = {
+            'name': tool_name,
+            'version': tool_version,
+            'rules': [{'id': rule_id, 'shortDescription': {'text': text}} for rule_id, text in RULES.items()],
+        }
+        head = json.dumps({'$schema': SARIF_SCHEMA, 'version': '2.1.0'}, ensure_ascii=False)[:-1]
+        self._stream.write(f'{head}, "runs": [{{"tool": {{"driver": {json.dumps(driver, ensure_ascii=False)}}}, "results": [\n')
+        self._first = True
+
+    def write_file(self, rel_path: str, issues: List[Dict]):
+        uri = rel_path.replace(os.sep, '/')
+        for issue in issues:
+            location = {'artifactLocation': {'uri': uri}}
+            if issue.get('line'):
+                location['region'] = {'startLine': issue['line'], 'startColumn': issue.get('column', 1)}
+            result = {
+                'ruleId': issue['type'],
+                'level': 'error',
+                'message': {'text': issue['message']},
+                'locations': [{'physicalLocation': location}],
+            }
+            if issue.get('suggestion'):
+                result['properties'] = {'suggestion': issue['suggestion']}
+            self._stream.write(('' if self._first else ',\n') + json.dumps(result, ensure_ascii=False))
+            self._first = False
+
+    def close(self):
+        self._stream.write('\n]}]}\n')
+        self._stream.close()
+
+class MarkdownReporter(Reporter):
+    """Relatório markdown legível: resumo no topo e problemas agrupados por arquivo.
+
+    ``output`` é um caminho (gravado no ``close``) ou um stream de texto já
+    aberto. Subclasses ajustam o layout sobrescrevendo ``header``,
+    ``summary``, ``file_section`` e ``footer``.
+    """
+
+    title = "Relatório de Links Quebrados - Projeto Docs"
+
+    def __init__(self, output):
+        super().__init__()
+        self._output = output
+        # O resumo só é conhecido no fim: o corpo espera em disco, não em memória
+        self._body = tempfile.TemporaryFile('w+', encoding='utf-8')
+
+    def header(self) -> List[str]:
+        return [f"# {self.title}", f"**Data**: {datetime.now().strftime('%c')}", ""]
+
+    def summary(self) -> List[str]:
+        lines = [
+            "## Resumo",
+            f"- **Arquivos com problemas**: {self.files}",
+            f"- **Total de links quebrados**: {self.issues}",
+            "",
+        ]
+        if self.issues == 0:
+            lines.append("✅ **Nenhum link quebrado encontrado!**")
+        else:
+            lines.extend(["## Links Quebrados por Arquivo", ""])
+        return lines
+
+    def file_section(self, rel_path: str, issues: List[Dict]) -> Iterable[str]:
+        yield f"### {rel_path}"
+        yield ""
+        for issue in issues:
+            if issue.get('suggestion'):
+                yield f"- **Linha {issue['line']}**: {issue['message']} → sugestão: `{issue['suggestion']}`"
+            elif issue['type'] in ('broken_link', 'broken_anchor', 'broken_external'):
+                yield f"- **Linha {issue['line']}**: {issue['message']}"
+            else:
+                yield f"- **Erro**: {issue['message']}"
+        yield ""
+
+    def footer(self) -> List[str]:
+        return []
+
+    def write_file(self, rel_path: str, issues: List[Dict]):
+        for line in self.file_section(rel_path, issues):
+            self._body.write('\n' + line)
+
+    def close(self):
+        if self._body is None:
+            return
+        if isinstance(self._output, (str, os.PathLike)):
+            with open(self._output, 'w', encoding='utf-8') as stream:
+                self._write_to(stream)
+        else:
+            self._write_to(self._output)
+        self._body.close()
+        self._body = None
+
+    def _write_to(self, stream: TextIO):
+        stream.write('\n'.join(self.header() + self.summary()))
+        self._body.seek(0)
+        shutil.copyfileobj(self._body, stream)
+        for line in self.footer():
+            stream.write('\n' + line)
@@ -0,0 +1,64 @@
+"""
+Resolução léxica de links contra um índice de caminhos em memória.
+
+Em vez de consultar o sistema de arquivos (``Path.resolve``,
+``os.path.exists``) a cada link, os caminhos são normalizados como texto e
+procurados no índice montado pela varredura da árvore. O resultado de cada
+par (diretório de origem, href) é memorizado, já que os mesmos links se
+repetem em vários arquivos de um mesmo diretório.
+"""
+
+import os
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+class PathIndex:
+    """Caminhos (arquivos e diretórios) relativos a ``root``."""
+
+    def __init__(self, root: str, paths: Iterable[str] = ()):
+        self.root = os.path.abspath(root)
+        self.paths: Set[str] = set(paths)
+        self._memo: Dict[Tuple[str, str], Optional[str]] = {}
+
+    def __contains__(self, rel_path: str) -> bool:
+        return rel_path in self.paths
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def add(self, rel_path: str):
+        self.paths.add(rel_path)
+
+    def relative(self, abs_path: str) -> Optional[str]:
+        """Caminho relativo à raiz, ou None se estiver fora dela ('' é a própria raiz)."""
+        if abs_path == self.root:
+            return ''
+        prefix = self.root if self.root.endswith(os.sep) else self.root + os.sep
+        if abs_path.startswith(prefix):
+            return abs_path[len(prefix):]
+        return None
+
+    def resolve(self, source_dir: str, href_path: str) -> Optional[str]:
+        """Caminho relativo à raiz apontado por ``href_path`` (sem fragmento).
+
+        ``source_dir`` é o diretório do arquivo que contém o link. Caminhos
+        iniciados por '/' são relativos à raiz. Retorna None quando o alvo
+        sai da raiz. Nenhuma chamada ao sistema de arquivos é feita.
+        """
+        key = (source_dir, href_path)
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+
+        if href_path.startswith('/'):
+            joined = os.path.join(self.root, href_path.lstrip('/'))
+        else:
+            joined = os.path.join(os.path.abspath(source_dir), href_path)
+        rel_path = self.relative(os.path.normpath(joined))
+        self._memo[key] = rel_path
+        return rel_path
+
+    def exists(self, source_dir: str, href_path: str) -> bool:
+        """Equivalente léxico de ``os.path.exists`` para um link."""
+        rel_path = self.resolve(source_dir, href_path)
+        return rel_path is not None and (rel_path == '' or rel_path in self.paths)
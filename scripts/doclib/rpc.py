@@ -0,0 +1,158 @@
+"""
+JSON-RPC 2.0 mínimo sobre socket Unix, uma mensagem JSON por linha.
+
+O servidor roda em um único thread com ``selectors``: conexões de clientes
+e descritores extras (ex: o inotify do observador) compartilham o mesmo
+laço, então o estado em memória nunca é acessado concorrentemente.
+"""
+
+import inspect
+import json
+import os
+import selectors
+import socket
+from typing import Any, Callable, Dict, Optional
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+class JsonRpcServer:
+    """Despacha ``{"method": "x"}`` para ``handler.rpc_x(**params)``."""
+
+    def __init__(self, socket_path: str, handler: Any):
+        self.socket_path = socket_path
+        self.handler = handler
+        self._selector = selectors.DefaultSelector()
+        self._buffers: Dict[socket.socket, bytes] = {}
+        self._tick: Optional[Callable[[], None]] = None
+        self._tick_interval: Optional[float] = None
+        self._running = False
+
+    def add_reader(self, fileobj, callback: Callable[[], None]):
+        """Chama ``callback`` sempre que ``fileobj`` estiver legível."""
+        self._selector.register(fileobj, selectors.EVENT_READ, ('reader', callback))
+
+    def set_tick(self, interval: Optional[float], callback: Callable[[], None]):
+        """Chama ``callback`` pelo menos a cada ``interval`` segundos."""
+        self._tick_interval = interval
+        self._tick = callback
+
+    def stop(self):
+        self._running = False
+
+    def serve_forever(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.socket_path)
+        listener.listen()
+        listener.setblocking(False)
+        self._selector.register(listener, selectors.EVENT_READ, ('accept', None))
+        self._running = True
+        try:
+            while self._running:
+                for key, _ in self._selector.select(self._tick_interval):
+                    kind, callback = key.data
+                    if kind == 'accept':
+                        conn, _ = listener.accept()
+                        conn.setblocking(False)
+                        self._buffers[conn] = b''
+                        self._selector.register(conn, selectors.EVENT_READ, ('client', None))
+                    elif kind == 'client':
+                        self._read_client(key.fileobj)
+                    else:
+                        callback()
+                if self._tick is not None:
+                    self._tick()
+        finally:
+            for conn in list(self._buffers):
+                self._close_client(conn)
+            self._selector.unregister(listener)
+            listener.close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def _close_client(self, conn: socket.socket):
+        self._selector.unregister(conn)
+        self._buffers.pop(conn, None)
+        conn.close()
+
+    def _read_client(self, conn: socket.socket):
+        try:
+            data = conn.recv(65536)
+        except ConnectionError:
+            data = b''
+        if not data:
+            self._close_client(conn)
+            return
+        buffer = self._buffers[conn] + data
+        *lines, self._buffers[conn] = buffer.split(b'\n')
+        for line in lines:
+            if line.strip():
+                response = self.dispatch(line)
+                if response is not None:
+                    conn.setblocking(True)
+                    conn.sendall(response + b'\n')
+                    conn.setblocking(False)
+
+    def dispatch(self, line: bytes) -> Optional[bytes]:
+        """Processa uma requisição e devolve a resposta serializada (None para notificações)."""
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return _error(None, PARSE_ERROR, 'JSON inválido')
+        if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+            return _error(None, INVALID_REQUEST, 'Requisição inválida')
+
+        request_id = request.get('id')
+        method = getattr(self.handler, 'rpc_' + request['method'], None)
+        if method is None:
+            return _error(request_id, METHOD_NOT_FOUND, f"Método desconhecido: {request['method']}")
+
+        params = request.get('params', {})
+        if not isinstance(params, (list, dict)):
+            return _error(request_id, INVALID_PARAMS, 'params deve ser uma lista ou um objeto')
+        args, kwargs = (params, {}) if isinstance(params, list) else ((), params)
+        # Só a assinatura decide se os parâmetros são inválidos: um TypeError
+        # levantado dentro do método é erro interno
+        try:
+            inspect.signature(method).bind(*args, **kwargs)
+        except TypeError as e:
+            return _error(request_id, INVALID_PARAMS, str(e))
+        try:
+            result = method(*args, **kwargs)
+        except Exception as e:
+            return _error(request_id, INTERNAL_ERROR, str(e))
+        if 'id' not in request:
+            return None
+        return json.dumps({'jsonrpc': '2.0', 'id': request_id, 'result': result},
+                          ensure_ascii=False).encode('utf-8')
+
+def _error(request_id, code: int, message: str) -> bytes:
+    return json.dumps({'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}},
+                      ensure_ascii=False).encode('utf-8')
+
+class JsonRpcClient:
+    """Cliente síncrono que mantém a conexão aberta entre chamadas."""
+
+    def __init__(self, socket_path: str):
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.connect(socket_path)
+        self._file = self._sock.makefile('rb')
+        self._next_id = 0
+
+    def call(self, method: str, **params) -> Any:
+        self._next_id += 1
+        request = {'jsonrpc': '2.0', 'id': self._next_id, 'method': method, 'params': params}
+        self._sock.sendall(json.dumps(request, ensure_ascii=False).encode('utf-8') + b'\n')
+        response = json.loads(self._file.readline())
+        if 'error' in response:
+            raise RuntimeError(response['error']['message'])
+        return response['result']
+
+    def close(self):
+        self._file.close()
+        self._sock.close()
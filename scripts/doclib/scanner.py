@@ -0,0 +1,87 @@
+"""
+Varredura única da árvore de documentação.
+
+Um só percurso com ``os.scandir`` produz o índice de caminhos (arquivos e
+diretórios) usado na resolução de links e a fila de arquivos markdown a
+verificar. Diretórios que casam com os globs de exclusão são podados antes
+de serem percorridos, então ``.git``, ``node_modules`` e afins nunca são
+listados.
+"""
+
+import fnmatch
+import os
+import re
+from typing import Iterable, List, Optional, Pattern, Set
+
+# Diretórios que nunca contêm documentação
+DEFAULT_EXCLUDES = ('.git', 'node_modules', '.cache', '__pycache__', '.venv', 'venv')
+
+def compile_excludes(patterns: Iterable[str]) -> Optional[Pattern]:
+    """Compila os globs de exclusão em uma única regex.
+
+    Cada glob é comparado tanto com o nome da entrada quanto com o caminho
+    relativo à raiz (com '/'), então ``node_modules`` e ``openspec/changes/*``
+    funcionam.
+    """
+    patterns = list(patterns)
+    if not patterns:
+        return None
+    return re.compile('|'.join(fnmatch.translate(pattern) for pattern in patterns))
+
+class TreeScan:
+    """Resultado da varredura: fila de trabalho e índice de caminhos."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.markdown_files: List[str] = []
+        self.files: Set[str] = set()
+        self.dirs: Set[str] = set()
+
+    @property
+    def paths(self) -> Set[str]:
+        """Arquivos e diretórios, relativos à raiz."""
+        return self.files | self.dirs
+
+def scan_order_key(rel_path: str):
+    """Chave que ordena caminhos relativos como ``scan_tree`` os visita."""
+    parts = rel_path.replace(os.sep, '/').split('/')
+    # Em cada nível, arquivos (0) vêm antes de subdiretórios (1)
+    return [(1, part) for part in parts[:-1]] + [(0, parts[-1])]
+
+def scan_tree(root, excludes: Iterable[str] = DEFAULT_EXCLUDES, suffix: str = '.md') -> TreeScan:
+    """Percorre ``root`` uma única vez, em ordem determinística.
+
+    Dentro de cada diretório as entradas são visitadas em ordem alfabética,
+    arquivos antes de subdiretórios, então a fila de trabalho não depende da
+    ordem do sistema de arquivos.
+    """
+    root = str(root)
+    scan = TreeScan(root)
+    exclude = compile_excludes(excludes)
+    stack = ['']
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            with os.scandir(os.path.join(root, rel_dir) if rel_dir else root) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            rel_path = f'{rel_dir}/{entry.name}' if rel_dir else entry.name
+            if exclude is not None and (exclude.match(entry.name) or exclude.match(rel_path)):
+                continue
+            rel_native = rel_path if os.sep == '/' else rel_path.replace('/', os.sep)
+            # d_type do scandir: sem stat por entrada
+            if entry.is_dir(follow_symlinks=False):
+                scan.dirs.add(rel_native)
+                subdirs.append(rel_path)
+            else:
+                scan.files.add(rel_native)
+                if entry.name.endswith(suffix):
+                    scan.markdown_files.append(os.path.join(root, rel_native))
+
+        # Pilha: empilha ao contrário para visitar em ordem alfabética
+        stack.extend(reversed(subdirs))
+    return scan
@@ -0,0 +1,213 @@
+"""
+Índice de busca textual (BM25) sobre os documentos markdown.
+
+O índice invertido fica em SQLite: para cada termo, os documentos em que
+aparece, a frequência e as seções (títulos) onde ocorre. A atualização é
+incremental: cada documento guarda mtime, tamanho e hash do conteúdo, e só
+os arquivos alterados são relidos e reindexados. A consulta lê apenas as
+listas dos termos pedidos, então responde em milissegundos mesmo sem
+carregar o índice inteiro.
+
+A tokenização ignora acentos e caixa (``configuração`` casa com
+``configuracao``) e descarta palavras muito comuns em português e inglês.
+"""
+
+import math
+import os
+import re
+import sqlite3
+import unicodedata
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from doclib.document import MarkdownDocument
+from doclib.link_cache import content_digest
+
+INDEX_FORMAT = 1
+# Parâmetros usuais do BM25
+K1 = 1.2
+B = 0.75
+# Seções guardadas por termo e documento (para mostrar onde o termo aparece)
+MAX_SECTIONS = 8
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+_STOPWORDS = """
+a o as os um uma uns umas de do da dos das em no na nos nas por para com sem que se e ou
+ao aos à às é ser são foi como mais mas não sua seu suas seus ele ela isso este esta esse essa
+the an of to in on for with and or is are be by as at it this that from not your you can will
+"""
+
+class Hit(NamedTuple):
+    path: str
+    score: float
+    sections: List[Tuple[int, str]]  # (linha, título) onde os termos aparecem; linha 0 = antes do 1º título
+
+class UpdateStats(NamedTuple):
+    indexed: int
+    removed: int
+    unchanged: int
+
+def fold(text: str) -> str:
+    """Minúsculas e sem acentos."""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+STOPWORDS = frozenset(fold(_STOPWORDS).split())
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN.findall(fold(text)) if len(token) > 1 and token not in STOPWORDS]
+
+def document_terms(document: MarkdownDocument) -> Tuple[int, List[Tuple[int, str]], Dict[str, List]]:
+    """Tamanho em termos, seções e ``termo -> [frequência, [índices de seção]]`` de um documento.
+
+    A seção 0 é o trecho antes do primeiro título; o texto de cada título
+    conta como parte da sua seção.
+    """
+    sections = [(0, '')] + [(heading.line, heading.text) for heading in document.headings]
+    heading_at = {heading.line: index for index, heading in enumerate(document.headings, start=1)}
+    terms: Dict[str, List] = {}
+    length = 0
+    section = 0
+    for number, line in enumerate(document.text.split('\n'), start=1):
+        section = heading_at.get(number, section)
+        for token in tokenize(line):
+            length += 1
+            entry = terms.get(token)
+            if entry is None:
+                terms[token] = [1, [section]]
+            else:
+                entry[0] += 1
+                if entry[1][-1] != section and len(entry[1]) < MAX_SECTIONS:
+                    entry[1].append(section)
+    return length, sections, terms
+
+class SearchIndex:
+    """Índice invertido persistido em SQLite."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.db = sqlite3.connect(db_path)
+        row = None
+        try:
+            row = self.db.execute("SELECT value FROM meta WHERE key = 'format'").fetchone()
+        except sqlite3.DatabaseError:
+            pass
+        if row is None or row[0] != str(INDEX_FORMAT):
+            self._create()
+
+    def _create(self):
+        """Recria as tabelas (índice ausente ou de outro formato)."""
+        self.db.executescript("""
+            DROP TABLE IF EXISTS meta;
+            DROP TABLE IF EXISTS docs;
+            DROP TABLE IF EXISTS sections;
+            DROP TABLE IF EXISTS postings;
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE docs (id INTEGER PRIMARY KEY, path TEXT UNIQUE, mtime_ns INTEGER,
+                               size INTEGER, digest TEXT, length INTEGER);
+            CREATE TABLE sections (doc INTEGER, idx INTEGER, line INTEGER, title TEXT,
+                                   PRIMARY KEY (doc, idx)) WITHOUT ROWID;
+            CREATE TABLE postings (term TEXT, doc INTEGER, tf INTEGER, sections TEXT,
+                                   PRIMARY KEY (term, doc)) WITHOUT ROWID;
+            CREATE INDEX postings_doc ON postings (doc);
+        """)
+        self.db.execute("INSERT INTO meta VALUES ('format', ?)", (str(INDEX_FORMAT),))
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+    def __len__(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def update(self, root: str, rel_paths: Iterable[str]) -> UpdateStats:
+        """Sincroniza o índice com ``rel_paths``: reindexa os alterados e remove os que sumiram."""
+        known = {path: (doc_id, mtime_ns, size, digest) for doc_id, path, mtime_ns, size, digest
+                 in self.db.execute("SELECT id, path, mtime_ns, size, digest FROM docs")}
+        live = set()
+        indexed = unchanged = 0
+        with self.db:
+            for rel_path in rel_paths:
+                live.add(rel_path)
+                full_path = os.path.join(root, rel_path)
+                try:
+                    st = os.stat(full_path)
+                    entry = known.get(rel_path)
+                    if entry is not None and entry[1] == st.st_mtime_ns and entry[2] == st.st_size:
+                        unchanged += 1
+                        continue
+                    with open(full_path, 'rb') as f:
+                        data = f.read()
+                    digest = content_digest(data)
+                    if entry is not None and entry[3] == digest:
+                        # Só o mtime mudou (ex: touch)
+                        self.db.execute("UPDATE docs SET mtime_ns = ?, size = ? WHERE id = ?",
+                                        (st.st_mtime_ns, st.st_size, entry[0]))
+                        unchanged += 1
+                        continue
+                    document = MarkdownDocument(data.decode('utf-8'), rel_path)
+                except (OSError, UnicodeDecodeError):
+                    continue
+                if entry is not None:
+                    self._remove(entry[0])
+                self._add(rel_path, st, digest, document)
+                indexed += 1
+            removed = [entry[0] for path, entry in known.items() if path not in live]
+            for doc_id in removed:
+                self._remove(doc_id)
+        return UpdateStats(indexed, len(removed), unchanged)
+
+    def _add(self, rel_path: str, st: os.stat_result, digest: str, document: MarkdownDocument):
+        length, sections, terms = document_terms(document)
+        doc_id = self.db.execute("INSERT INTO docs (path, mtime_ns, size, digest, length) VALUES (?, ?, ?, ?, ?)",
+                                 (rel_path, st.st_mtime_ns, st.st_size, digest, length)).lastrowid
+        self.db.executemany("INSERT INTO sections VALUES (?, ?, ?, ?)",
+                            ((doc_id, index, line, title) for index, (line, title) in enumerate(sections)))
+        self.db.executemany("INSERT INTO postings VALUES (?, ?, ?, ?)",
+                            ((term, doc_id, tf, ','.join(map(str, where))) for term, (tf, where) in terms.items()))
+
+    def _remove(self, doc_id: int):
+        self.db.execute("DELETE FROM postings WHERE doc = ?", (doc_id,))
+        self.db.execute("DELETE FROM sections WHERE doc = ?", (doc_id,))
+        self.db.execute("DELETE FROM docs WHERE id = ?", (doc_id,))
+
+    def search(self, query: str, limit: int = 10, prefix: Optional[str] = None) -> List[Hit]:
+        """Documentos mais relevantes para ``query`` (BM25), opcionalmente sob o diretório ``prefix``."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        count, total_length = self.db.execute("SELECT COUNT(*), COALESCE(SUM(length), 0) FROM docs").fetchone()
+        if not terms or not count:
+            return []
+        average = total_length / count
+        if prefix:
+            prefix = prefix.rstrip('/') + '/'
+        scores: Dict[str, float] = {}
+        where: Dict[str, List[int]] = {}
+        ids: Dict[str, int] = {}
+        for term in terms:
+            rows = self.db.execute("SELECT d.path, d.id, p.tf, p.sections, d.length FROM postings p "
+                                   "JOIN docs d ON d.id = p.doc WHERE p.term = ?", (term,)).fetchall()
+            if not rows:
+                continue
+            idf = math.log(1 + (count - len(rows) + 0.5) / (len(rows) + 0.5))
+            for path, doc_id, tf, sections, length in rows:
+                if prefix and not path.startswith(prefix):
+                    continue
+                norm = tf + K1 * (1 - B + B * length / average)
+                scores[path] = scores.get(path, 0.0) + idf * tf * (K1 + 1) / norm
+                where.setdefault(path, []).extend(int(s) for s in sections.split(','))
+                ids[path] = doc_id
+        best = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+        hits = []
+        for path, score in best:
+            # Seções com mais ocorrências dos termos primeiro, na ordem do documento em caso de empate
+            counts: Dict[int, int] = {}
+            for index in where[path]:
+                counts[index] = counts.get(index, 0) + 1
+            ranked = sorted(counts, key=lambda index: (-counts[index], index))[:3]
+            placeholders = ','.join('?' * len(ranked))
+            titles = dict(((idx, (line, title)) for idx, line, title in self.db.execute(
+                f"SELECT idx, line, title FROM sections WHERE doc = ? AND idx IN ({placeholders})",
+                [ids[path], *ranked])))
+            hits.append(Hit(path, score, [titles[index] for index in ranked if index in titles]))
+        return hits
@@ -0,0 +1,148 @@
+"""
+Divisão determinística do trabalho entre nós de CI.
+
+Cada arquivo pertence a exatamente um shard, escolhido por um hash estável
+do caminho relativo (não depende de ``PYTHONHASHSEED`` nem da ordem da
+varredura). Cada shard grava um resultado parcial em JSON; o subcomando
+``merge`` dos scripts junta os parciais e gera o mesmo relatório de uma
+execução em um único nó.
+
+A resolução de links precisa do índice global de arquivos. Em vez de cada
+shard percorrer a árvore inteira, um passo anterior grava um manifesto
+(subcomando ``manifest``) que os shards apenas leem.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, List, Tuple
+
+from doclib.scanner import TreeScan, scan_order_key
+
+MANIFEST_FORMAT = 1
+PARTIAL_FORMAT = 1
+
+class ShardError(Exception):
+    """Parciais incompatíveis, incompletos ou manifesto inválido."""
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Converte ``"i/N"`` (1 <= i <= N) em ``(i, N)``; usado como ``type`` no argparse."""
+    try:
+        index, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise ValueError(f"shard inválido: {spec!r} (use i/N, ex: 1/4)")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"shard fora do intervalo: {spec!r}")
+    return index, count
+
+def shard_of(rel_path: str, count: int) -> int:
+    """Shard (a partir de 1) de um caminho relativo."""
+    key = rel_path.replace(os.sep, '/').encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'big') % count + 1
+
+def in_shard(rel_path: str, shard: Tuple[int, int]) -> bool:
+    index, count = shard
+    return shard_of(rel_path, count) == index
+
+def write_manifest(path: str, scan: TreeScan):
+    """Grava os arquivos e diretórios de uma varredura (relativos à raiz)."""
+    data = {
+        'format': MANIFEST_FORMAT,
+        'files': sorted(p.replace(os.sep, '/') for p in scan.files),
+        'dirs': sorted(p.replace(os.sep, '/') for p in scan.dirs),
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(data, ensure_ascii=False))
+
+def read_manifest(path: str, root: str, suffix: str = '.md') -> TreeScan:
+    """Reconstrói a varredura a partir do manifesto, sem tocar na árvore."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ShardError(f"manifesto ilegível: {path}: {e}") from e
+    if data.get('format') != MANIFEST_FORMAT:
+        raise ShardError(f"formato de manifesto não suportado: {path}")
+
+    scan = TreeScan(str(root))
+    scan.files = {p.replace('/', os.sep) for p in data['files']}
+    scan.dirs = {p.replace('/', os.sep) for p in data['dirs']}
+    scan.markdown_files = [os.path.join(scan.root, p)
+                           for p in sorted((p for p in scan.files if p.endswith(suffix)), key=scan_order_key)]
+    return scan
+
+def write_partial(path: str, tool: str, shard: Tuple[int, int], files: Dict[str, Any]):
+    """Grava o resultado parcial de um shard (``files``: caminho relativo -> resultado)."""
+    data = {'format': PARTIAL_FORMAT, 'tool': tool, 'shard': list(shard), 'files': files}
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(data, ensure_ascii=False))
+
+def read_partials(paths: Iterable[str], tool: str) -> List[Tuple[str, Any]]:
+    """Junta os parciais de todos os shards, na ordem da varredura.
+
+    Exige que todos venham da mesma versão do script, com o mesmo N, e que
+    nenhum shard falte ou se repita.
+    """
+    merged: Dict[str, Any] = {}
+    seen = set()
+    count = None
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ShardError(f"parcial ilegível: {path}: {e}") from e
+        if data.get('format') != PARTIAL_FORMAT or data.get('tool') != tool:
+            raise ShardError(f"parcial de outra ferramenta ou versão: {path} ({data.get('tool')})")
+        index, shard_count = data['shard']
+        if count is None:
+            count = shard_count
+        if shard_count != count:
+            raise ShardError(f"parciais com números de shards diferentes: {count} e {shard_count}")
+        if index in seen:
+            raise ShardError(f"shard {index}/{count} repetido: {path}")
+        seen.add(index)
+        merged.update(data['files'])
+
+    missing = sorted(set(range(1, (count or 0) + 1)) - seen)
+    if count is None or missing:
+        raise ShardError(f"shards ausentes: {', '.join(f'{i}/{count}' for i in missing) or 'nenhum parcial'}")
+    return sorted(merged.items(), key=lambda item: scan_order_key(item[0]))
+
+def partial_path(name: str, shard: Tuple[int, int]) -> str:
+    """Nome padrão do parcial de um shard (no diretório atual)."""
+    return f"{name}.shard-{shard[0]}-of-{shard[1]}.json"
+
+def _shard_type(spec: str) -> Tuple[int, int]:
+    try:
+        return parse_shard(spec)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def add_shard_arguments(parser: argparse.ArgumentParser, commands=None) -> argparse.ArgumentParser:
+    """Registra --shard/--manifest/--partial e os subcomandos ``merge`` e ``manifest``.
+
+    ``commands`` é o grupo de subcomandos do script, quando ele tem outros
+    além destes. Devolve o parser do ``merge`` para que o script acrescente
+    as opções de relatório. Opções repetidas nos subcomandos usam
+    ``SUPPRESS`` para não sobrescrever as do parser principal.
+    """
+    parser.add_argument("--shard", type=_shard_type, metavar="I/N",
+                        help="Processa apenas o shard I de N (partição estável por hash do caminho) "
+                             "e grava um resultado parcial em vez do relatório")
+    parser.add_argument("--manifest", metavar="PATH",
+                        help="Lê o índice de arquivos do manifesto (subcomando manifest) em vez de percorrer a árvore")
+    parser.add_argument("--partial", metavar="PATH",
+                        help="Arquivo do resultado parcial de --shard (padrão: <script>.shard-I-of-N.json)")
+    if commands is None:
+        commands = parser.add_subparsers(dest="command", metavar="{merge,manifest}")
+    merge = commands.add_parser("merge", help="Junta os parciais dos shards no relatório completo")
+    merge.add_argument("partials", nargs="+", metavar="PARCIAL")
+    merge.add_argument("--manifest", default=argparse.SUPPRESS, metavar="PATH",
+                       help="Manifesto da árvore, se disponível")
+    manifest = commands.add_parser("manifest", help="Percorre a árvore uma vez e grava o manifesto compartilhado")
+    manifest.add_argument("output", metavar="PATH")
+    manifest.add_argument("--exclude", action="append", default=argparse.SUPPRESS, metavar="GLOB",
+                          help="Glob de arquivos/diretórios a ignorar (além dos padrões)")
+    return merge
@@ -0,0 +1,143 @@
+"""
+Âncoras (#fragmento) no estilo do GitHub.
+
+Cada documento tem seu conjunto de slugs calculado uma única vez a partir
+dos títulos já extraídos pelo modelo de documento; o SlugIndex guarda esses
+conjuntos por caminho relativo para que validar um fragmento seja apenas
+uma consulta em um set.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Set
+from urllib.parse import unquote
+
+from doclib.document import MarkdownDocument
+
+# Formatação inline removida antes de gerar o slug (o GitHub usa o texto renderizado)
+_IMAGE = re.compile(r'!\[([^\]]*)\]\([^)]*\)')
+_LINK = re.compile(r'\[([^\]]*)\]\([^)]*\)')
+_HTML_TAG = re.compile(r'<[^>]+>')
+# Ênfase com '*' vale dentro de palavras; com '_' só entre fronteiras de
+# palavra (``snake_case`` não é ênfase). Trechos de código ficam intactos.
+_EMPHASIS = re.compile(r'(\*{1,3})(?=\S)(.+?)(?<=\S)\1|(?<!\w)(_{1,3})(?=\S)(.+?)(?<=\S)\3(?!\w)')
+_CODE_SPAN = re.compile(r'(`[^`]*`)')
+_NON_SLUG = re.compile(r'[^\w\- ]')
+_HTML_ANCHOR = re.compile(r'<a\s+(?:[^>]*?\s)?(?:name|id)="([^"]+)"')
+
+def _emphasis_text(match) -> str:
+    return match.group(2) if match.group(1) else match.group(4)
+
+def github_slug(text: str) -> str:
+    """Slug de um título como o GitHub gera (sem o sufixo de duplicados)."""
+    if '[' in text:
+        text = _IMAGE.sub(r'\1', text)
+        text = _LINK.sub(r'\1', text)
+    if '<' in text:
+        text = _HTML_TAG.sub('', text)
+    if '*' in text or '_' in text:
+        text = ''.join(part if index % 2 else _EMPHASIS.sub(_emphasis_text, part)
+                       for index, part in enumerate(_CODE_SPAN.split(text)))
+    # Mantém letras, dígitos, '_', '-' e espaços (que viram '-'); emojis e
+    # pontuação somem
+    return _NON_SLUG.sub('', text.strip().lower()).replace(' ', '-')
+
+def heading_slugs(titles: Iterable[str]) -> List[str]:
+    """Slugs de uma sequência de títulos, com sufixos -1, -2... para repetidos."""
+    seen: Dict[str, int] = {}
+    slugs = []
+    for title in titles:
+        base = github_slug(title)
+        count = seen.get(base, 0)
+        seen[base] = count + 1
+        slugs.append(base if count == 0 else f'{base}-{count}')
+    return slugs
+
+def document_slugs(document: MarkdownDocument) -> Set[str]:
+    """Todas as âncoras de um documento: títulos e ``<a name/id="...">``.
+
+    Títulos que começam com emoji geram slugs com hífen inicial
+    (``## 🎯 Visão Geral`` -> ``-visão-geral``); a forma sem os hífens das
+    pontas também é aceita, pois é assim que os documentos costumam citá-los.
+    """
+    slugs = set()
+    for slug in heading_slugs(heading.text for heading in document.headings):
+        slugs.add(slug)
+        slugs.add(slug.strip('-'))
+    slugs.update(match.group(1).lower() for match in _HTML_ANCHOR.finditer(document.text))
+    return slugs
+
+def normalize_fragment(fragment: str) -> str:
+    """Forma canônica de um fragmento de URL para comparação com slugs."""
+    return unquote(fragment).lower()
+
+class SlugIndex:
+    """Âncoras de cada arquivo markdown, indexadas pelo caminho relativo."""
+
+    def __init__(self):
+        self._slugs: Dict[str, Set[str]] = {}
+
+    def __contains__(self, rel_path: str) -> bool:
+        return rel_path in self._slugs
+
+    def add(self, rel_path: str, slugs: Iterable[str]):
+        self._slugs[rel_path] = set(slugs)
+
+    def add_document(self, rel_path: str, document: MarkdownDocument) -> Set[str]:
+        slugs = document_slugs(document)
+        self._slugs[rel_path] = slugs
+        return slugs
+
+    def discard(self, rel_path: str):
+        self._slugs.pop(rel_path, None)
+
+    def get(self, rel_path: str) -> Optional[Set[str]]:
+        return self._slugs.get(rel_path)
+
+    def has_anchor(self, rel_path: str, fragment: str) -> bool:
+        """Verifica se o fragmento existe no arquivo; arquivos desconhecidos não são julgados."""
+        slugs = self._slugs.get(rel_path)
+        if slugs is None:
+            return True
+        return normalize_fragment(fragment) in slugs
+
+class AnchorGate:
+    """Libera cada arquivo para o relatório assim que suas âncoras podem ser julgadas.
+
+    Os arquivos entram em ``add`` à medida que são verificados. Um arquivo
+    cujas âncoras apontam para arquivos ``expected`` ainda não indexados
+    fica retido até eles chegarem; os demais saem na hora. Só os retidos
+    ficam em memória.
+    """
+
+    def __init__(self, slug_index: SlugIndex, expected: Iterable[str]):
+        self.slug_index = slug_index
+        self.remaining: Set[str] = set(expected)  # ainda vão chegar
+        self._held: Dict[str, list] = {}  # arquivo -> [item, alvos ainda não indexados]
+        self._waiting: Dict[str, List[str]] = {}  # alvo -> arquivos retidos à espera dele
+
+    def add(self, rel_path: str, slugs: Optional[Iterable[str]], anchors: Iterable, item) -> list:
+        """Indexa as âncoras de ``rel_path`` e devolve os itens liberados, na ordem de chegada."""
+        self.remaining.discard(rel_path)
+        if slugs is not None:
+            self.slug_index.add(rel_path, slugs)
+        released = []
+        targets = {target for target, fragment, *_ in anchors if fragment and target in self.remaining}
+        if targets:
+            self._held[rel_path] = [item, targets]
+            for target in targets:
+                self._waiting.setdefault(target, []).append(rel_path)
+        else:
+            released.append(item)
+        for waiter in self._waiting.pop(rel_path, ()):
+            held = self._held[waiter]
+            held[1].discard(rel_path)
+            if not held[1]:
+                released.append(self._held.pop(waiter)[0])
+        return released
+
+    def flush(self) -> list:
+        """Itens ainda retidos por alvos que não chegaram (as âncoras deles não são julgadas)."""
+        released = [item for item, _ in self._held.values()]
+        self._held.clear()
+        self._waiting.clear()
+        return released
@@ -0,0 +1,102 @@
+"""
+Sugestões de correção para links quebrados.
+
+Um índice invertido de trigramas sobre os nomes dos arquivos válidos reduz
+cada consulta a poucas listas de postagem: só os caminhos que compartilham
+trigramas com o nome procurado são pontuados, então milhares de links
+quebrados são resolvidos sem comparar cada um com todos os arquivos.
+"""
+
+import heapq
+import os
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+# Similaridade mínima do nome do arquivo e pontuação final para sugerir um alvo
+MIN_NAME_SCORE = 0.5
+MIN_SCORE = 0.6
+# Candidatos mais promissores (por trigramas em comum) pontuados por completo
+SHORTLIST = 50
+# Arquivos que representam o próprio diretório: o nome relevante é o da pasta
+DIRECTORY_PAGES = ('readme.md', 'index.md')
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """Trigramas de um nome, com bordas marcadas para valorizar início e fim."""
+    padded = f'  {text.lower()} '
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+def page_name(path: str) -> str:
+    """Nome comparado na busca: o do arquivo sem extensão, ou o da pasta para README/index."""
+    name = os.path.basename(path)
+    if name.lower() in DIRECTORY_PAGES:
+        return os.path.basename(os.path.dirname(path))
+    return os.path.splitext(name)[0]
+
+def dice(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+class PathSuggester:
+    """Índice aproximado de caminhos relativos à raiz."""
+
+    def __init__(self, paths: Iterable[str]):
+        self.paths: List[str] = sorted(set(paths))
+        self._grams: List[FrozenSet[str]] = []
+        self._dirs: List[FrozenSet[str]] = []
+        self._postings: Dict[str, List[int]] = {}
+        self._by_name: Dict[str, List[int]] = {}
+        for path_id, path in enumerate(self.paths):
+            name = page_name(path)
+            grams = trigrams(name)
+            self._grams.append(grams)
+            self._dirs.append(frozenset(os.path.dirname(path).lower().split(os.sep)) - {''})
+            self._by_name.setdefault(name.lower(), []).append(path_id)
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(path_id)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def suggest(self, wanted: str, limit: int = 1, exclude: Iterable[str] = ()) -> List[Tuple[str, float]]:
+        """Caminhos mais parecidos com ``wanted``, com pontuação entre 0 e 1.
+
+        O nome do arquivo pesa mais que o diretório: um arquivo movido de
+        pasta costuma manter o nome, um arquivo renomeado costuma ficar perto
+        da pasta original. Só são sugeridos arquivos com a mesma extensão.
+        """
+        name = page_name(wanted)
+        extension = os.path.splitext(wanted)[1].lower()
+        grams = trigrams(name)
+        hits = Counter()
+        for gram in grams:
+            hits.update(self._postings.get(gram, ()))
+        shortlist = {path_id for path_id, _ in heapq.nlargest(SHORTLIST, hits.items(), key=lambda item: item[1])}
+        shortlist.update(self._by_name.get(name.lower(), ()))
+
+        wanted_dirs = frozenset(os.path.dirname(wanted).lower().split(os.sep)) - {''}
+        scored = []
+        for path_id in shortlist:
+            path = self.paths[path_id]
+            if path in exclude or os.path.splitext(path)[1].lower() != extension:
+                continue
+            name_score = dice(grams, self._grams[path_id])
+            if name_score < MIN_NAME_SCORE:
+                continue
+            dirs = self._dirs[path_id]
+            union = len(wanted_dirs | dirs)
+            dir_score = len(wanted_dirs & dirs) / union if union else 1.0
+            score = round(0.7 * name_score + 0.3 * dir_score, 3)
+            if score >= MIN_SCORE:
+                scored.append((score, path))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [(path, score) for score, path in scored[:limit]]
+
+    def best(self, wanted: str, margin: float = 0.0, exclude: Iterable[str] = ()) -> Optional[Tuple[str, float]]:
+        """Melhor sugestão, desde que supere a segunda por ``margin``."""
+        ranked = self.suggest(wanted, limit=2, exclude=exclude)
+        if not ranked:
+            return None
+        if len(ranked) > 1 and ranked[0][1] - ranked[1][1] < margin:
+            return None
+        return ranked[0]
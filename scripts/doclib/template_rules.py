@@ -0,0 +1,323 @@
+"""
+Regras de conformidade derivadas dos títulos dos templates.
+
+Cada template em ``templates/`` define as seções do seu tipo de documento:
+as seções de nível 2 do seu esboço são as obrigatórias, sem marcação no
+próprio template (que é copiado para criar documentos novos). Os títulos
+aceitam as duas línguas: a variante do template em ``pt-br/`` (ou a
+inglesa, acima dela) é alinhada seção a seção, e os títulos dos templates
+que existem só em uma língua são traduzidos pelos exemplos — os pares
+EN/PT-BR de documentos (os casos) cujos títulos de nível 2 se alinham um a
+um ensinam a tradução de cada título.
+
+O esboço de cada template e de cada exemplo fica em um ``LinkCache``,
+invalidado pelo mtime e tamanho do arquivo (ou, se só estes mudaram, pelo
+hash do conteúdo), e as regras derivadas de cada tipo ficam no mesmo cache
+pelo hash das variantes do template e do glossário; assim um template novo
+não exige mudança de código e as execuções seguintes não voltam a analisar
+os templates nem a derivar as regras. Só a expressão que reúne as regras de
+um tipo é compilada, e apenas quando um documento desse tipo é comparado.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Pattern, Tuple
+
+from doclib.bilingual import LANGUAGE_SECTIONS, TRANSLATION_DIR, pair_documents
+from doclib.document import MarkdownDocument
+from doclib.link_cache import LinkCache, content_digest
+
+# Muda quando a forma de derivar as regras muda (invalida o cache de esboços e regras)
+DERIVATION_VERSION = "template-rules/3"
+
+# Título normalizado em português -> títulos equivalentes em inglês
+Glossary = Dict[str, List[str]]
+
+_NUMBERING = re.compile(r'^\d+(?:\.\d+)*\.?\s+')
+_PLACEHOLDER = re.compile(r'\[[^\]]*\]')
+_PARENTHESES = re.compile(r'\(([^)]*)\)')
+_NON_WORD = re.compile(r'[^\w\s]|_')
+
+class Section(NamedTuple):
+    level: int
+    title: str
+
+class SectionRule(NamedTuple):
+    label: str  # exibido quando a seção falta
+    pattern: str  # expressão que reconhece o título normalizado (compilada só no rule_matcher)
+    level: int
+
+class SectionNode:
+    """Título do documento na árvore de seções."""
+    __slots__ = ('level', 'title', 'line', 'empty', 'children')
+
+    def __init__(self, level: int, title: str, line: int):
+        self.level = level
+        self.title = title
+        self.line = line
+        self.empty = True  # sem texto nem subseções
+        self.children: List['SectionNode'] = []
+
+class StructureReport(NamedTuple):
+    missing: List[str]  # rótulos das seções obrigatórias ausentes
+    issues: List[str]  # ordem, nível, duplicatas e seções vazias
+
+def normalize_title(text: str) -> str:
+    """Título sem numeração, ênfase, emoji e pontuação, em minúsculas."""
+    text = _PLACEHOLDER.sub(' ', text.strip())
+    text = _NON_WORD.sub(' ', _NUMBERING.sub('', text))
+    return ' '.join(text.lower().split())
+
+def display_title(text: str) -> str:
+    """Título como escrito no template, sem ênfase, emoji e numeração."""
+    text = _PLACEHOLDER.sub(' ', text.replace('*', '').replace('`', ''))
+    text = ' '.join(word for word in _NUMBERING.sub('', text.strip()).split() if any(c.isalnum() for c in word))
+    return text.rstrip(':')
+
+def title_alternatives(text: str, glossary: Glossary) -> List[str]:
+    """Formas aceitas de um título: o texto, os parênteses à parte e as traduções."""
+    forms = [normalize_title(_PARENTHESES.sub(' ', text))]
+    forms.extend(normalize_title(inner) for inner in _PARENTHESES.findall(text))
+    alternatives = []
+    for form in forms:
+        if not form:
+            continue
+        alternatives.append(form)
+        alternatives.extend(pt for pt, en in glossary.items() if form in en)
+        if form in glossary:
+            alternatives.extend(glossary[form])
+        else:
+            # As traduções dos exemplos costumam encurtar o título ("Padrões" para
+            # "Padrões Arquiteturais"): vale a de um título contido neste
+            alternatives.extend(en for pt, translations in glossary.items()
+                                if re.search(r'(?<!\w)' + re.escape(pt) + r'(?!\w)', form) for en in translations)
+    return list(dict.fromkeys(alternatives))
+
+def template_outline(document: MarkdownDocument) -> List[Section]:
+    """Títulos de um template.
+
+    Templates que descrevem o documento dentro de blocos ```markdown (ex:
+    ``high-level-architecture-template.md``) têm o esboço lido desses blocos.
+    """
+    fenced = [MarkdownDocument(block.code) for block in document.code_blocks if block.lang in ('markdown', 'md')]
+    fenced = [block for block in fenced if block.headings]
+    return [Section(heading.level, heading.text) for source in fenced or [document] for heading in source.headings]
+
+def document_outline(document: MarkdownDocument) -> List[Section]:
+    """Títulos de um documento de exemplo (sem a leitura dos blocos ```markdown)."""
+    return [Section(heading.level, heading.text) for heading in document.headings]
+
+def learn_glossary(pairs: Iterable[Tuple[List[Section], List[Section]]]) -> Glossary:
+    """Traduções dos títulos a partir de pares (inglês, português) de esboços.
+
+    Só os pares com o mesmo número de seções de nível 2 (fora a seção de
+    versões de idioma) são usados, alinhados pela posição; um par em que a
+    tradução omitiu ou acrescentou uma seção não diz qual título corresponde
+    a qual.
+    """
+    glossary: Dict[str, set] = {}
+    for english, portuguese in pairs:
+        titles = [[normalize_title(_PARENTHESES.sub(' ', section.title)) for section in outline if section.level == 2]
+                  for outline in (english, portuguese)]
+        en, pt = [[title for title in outline if title and title not in LANGUAGE_SECTIONS] for outline in titles]
+        if len(en) != len(pt):
+            continue
+        for en_title, pt_title in zip(en, pt):
+            if en_title != pt_title:
+                glossary.setdefault(pt_title, set()).add(en_title)
+    return {pt: sorted(en) for pt, en in sorted(glossary.items())}
+
+def language_variants(template: Path) -> List[Path]:
+    """O template e sua versão na outra língua, se existir."""
+    if template.parent.name == TRANSLATION_DIR:
+        other = template.parent.parent / template.name
+    else:
+        other = template.parent / TRANSLATION_DIR / template.name
+    return [template] + ([other] if other.is_file() else [])
+
+def derive_rules(outlines: List[List[Section]], glossary: Glossary) -> List[SectionRule]:
+    """Regras de um tipo de documento a partir dos esboços das variantes do template.
+
+    Cada seção de nível 2 do template é obrigatória. As variantes são
+    alinhadas pela posição das seções quando têm o mesmo número de títulos.
+    """
+    primary = outlines[0]
+    aligned = [outline for outline in outlines if len(outline) == len(primary)]
+    rules = []
+    for index, section in enumerate(primary):
+        if section.level != 2:
+            continue
+        versions = [outline[index] for outline in aligned]
+        alternatives = []
+        for version in versions:
+            alternatives.extend(title_alternatives(version.title, glossary))
+        alternatives = list(dict.fromkeys(a for a in alternatives if a))
+        if not alternatives:
+            continue
+        label = display_title(section.title)
+        own = {normalize_title(_PARENTHESES.sub(' ', section.title))}
+        own.update(normalize_title(inner) for inner in _PARENTHESES.findall(section.title))
+        others = [a for a in alternatives if a not in own]
+        if others:
+            label += f" ({' | '.join(others)})"
+        pattern = r'(?<!\w)(?:' + '|'.join(map(re.escape, alternatives)) + r')(?!\w)'
+        rules.append(SectionRule(label, pattern, section.level))
+    return rules
+
+def heading_tree(document: MarkdownDocument) -> List[SectionNode]:
+    """Árvore de seções do documento (raízes), montada em uma passada pelos títulos."""
+    lines = document.text.split('\n')
+    headings = document.headings
+    roots: List[SectionNode] = []
+    stack: List[SectionNode] = []
+    for index, heading in enumerate(headings):
+        node = SectionNode(heading.level, heading.text, heading.line)
+        end = headings[index + 1].line - 1 if index + 1 < len(headings) else len(lines)
+        node.empty = not any(line.strip() for line in lines[heading.line:end])
+        while stack and stack[-1].level >= node.level:
+            stack.pop()
+        if stack:
+            stack[-1].children.append(node)
+            stack[-1].empty = False
+        else:
+            roots.append(node)
+        stack.append(node)
+    return roots
+
+def _preorder(nodes: List[SectionNode]):
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(node.children))
+
+def rule_matcher(rules: List[SectionRule]) -> Optional[Pattern]:
+    """Uma única expressão com um grupo por regra: cada título é testado uma vez."""
+    if not rules:
+        return None
+    return re.compile('|'.join(f'(?P<r{index}>{rule.pattern})' for index, rule in enumerate(rules)))
+
+def compare_structure(rules: List[SectionRule], matcher: Optional[Pattern],
+                      document: MarkdownDocument) -> StructureReport:
+    """Alinha a árvore de seções do documento com as regras do template.
+
+    Cada título é associado à regra que satisfaz em uma passada (tempo
+    linear no número de títulos); depois, na ordem do template, cada regra
+    tem sua seção conferida quanto a nível, repetição, conteúdo e ordem.
+    """
+    if matcher is None:
+        return StructureReport([], [])
+    matches: List[List[SectionNode]] = [[] for _ in rules]
+    for node in _preorder(heading_tree(document)):
+        match = matcher.search(normalize_title(node.title))
+        if match:
+            matches[int(match.lastgroup[1:])].append(node)
+
+    missing, issues = [], []
+    previous = None
+    for rule, nodes in zip(rules, matches):
+        if not nodes:
+            missing.append(rule.label)
+            continue
+        same_level = [node for node in nodes if node.level == rule.level]
+        chosen = same_level[0] if same_level else nodes[0]
+        if not same_level:
+            issues.append(f"linha {chosen.line}: \"{chosen.title}\" no nível {chosen.level}, esperado {rule.level}")
+        for duplicate in same_level[1:]:
+            issues.append(f"linha {duplicate.line}: \"{duplicate.title}\" repete a seção da linha {chosen.line}")
+        if chosen.empty:
+            issues.append(f"linha {chosen.line}: seção \"{chosen.title}\" vazia")
+        if previous is not None and chosen.line < previous.line:
+            issues.append(f"linha {chosen.line}: \"{chosen.title}\" deveria vir depois de \"{previous.title}\"")
+        else:
+            previous = chosen
+    return StructureReport(missing, issues)
+
+def _rules_key(doc_type: str) -> str:
+    """Entrada das regras derivadas no cache (não colide com caminhos de templates)."""
+    return ":rules:" + doc_type
+
+class TemplateRules:
+    """Regras por tipo de documento, com os esboços e as regras derivadas cacheados em disco."""
+
+    def __init__(self, templates_dir: Path, mapping: Dict[str, str], cache_path: Optional[Path] = None,
+                 examples_dir: Optional[Path] = None):
+        self.templates_dir = Path(templates_dir)
+        self.mapping = mapping
+        self.cache = LinkCache(cache_path, DERIVATION_VERSION) if cache_path is not None else None
+        self.rules: Dict[str, List[SectionRule]] = {}
+        self.matchers: Dict[str, Optional[Pattern]] = {}
+        self.sources: Dict[str, str] = {}  # template -> hash do conteúdo
+        examples: Dict[str, str] = {}  # exemplo -> hash do conteúdo (fora da versão: só o glossário conta)
+        self.glossary = learn_glossary(self._example_pairs(Path(examples_dir), examples)) if examples_dir else {}
+        live = set(examples)
+        for doc_type, template_name in mapping.items():
+            self.rules[doc_type] = self._derived(doc_type, language_variants(self.templates_dir / template_name))
+            live.add(_rules_key(doc_type))
+        if self.cache is not None:
+            self.cache.prune(live | set(self.sources))
+            self.cache.save()
+
+    def compare(self, doc_type: str, document: MarkdownDocument) -> StructureReport:
+        """Compara o documento com as regras do seu tipo (vazio para tipos sem template)."""
+        rules = self.rules.get(doc_type, [])
+        if doc_type not in self.matchers:
+            self.matchers[doc_type] = rule_matcher(rules)  # compilada no primeiro documento do tipo
+        return compare_structure(rules, self.matchers[doc_type], document)
+
+    @property
+    def version(self) -> str:
+        """Identifica o conjunto de regras: muda quando algum template ou o glossário muda."""
+        return DERIVATION_VERSION + ":" + hashlib.blake2b(
+            json.dumps([sorted(self.sources.items()), self.glossary]).encode("utf-8"), digest_size=8).hexdigest()
+
+    def _example_pairs(self, examples_dir: Path, digests: Dict[str, str]):
+        """Esboços dos pares (inglês, português) de documentos de exemplo."""
+        rel_paths = [os.path.relpath(os.path.join(directory, name), examples_dir)
+                     for directory, _, names in os.walk(examples_dir) for name in sorted(names) if name.endswith('.md')]
+        for english, portuguese in pair_documents(rel_paths).pairs:
+            yield (self._outline(examples_dir / english, digests, document_outline),
+                   self._outline(examples_dir / portuguese, digests, document_outline))
+
+    def _derived(self, doc_type: str, variants: List[Path]) -> List[SectionRule]:
+        """Regras de um tipo (do cache se nem as variantes do template nem o glossário mudaram)."""
+        outlines = [self._outline(variant, self.sources) for variant in variants]
+        if not outlines[0]:
+            return []
+        key = _rules_key(doc_type)
+        digest = hashlib.blake2b(json.dumps(
+            [[self.sources[os.path.relpath(variant, self.templates_dir)] for variant in variants], self.glossary]
+        ).encode("utf-8"), digest_size=16).hexdigest()
+        st = os.stat(variants[0])
+        entry = self.cache.get_by_digest(key, st, digest) if self.cache is not None else None
+        if entry is not None:
+            return [SectionRule(*rule) for rule in entry['result']]
+        rules = derive_rules(outlines, self.glossary)
+        if self.cache is not None:
+            self.cache.store(key, st, digest, (), [list(rule) for rule in rules])
+        return rules
+
+    def _outline(self, path: Path, digests: Dict[str, str],
+                 extract: Callable[[MarkdownDocument], List[Section]] = template_outline) -> List[Section]:
+        """Esboço de um template ou exemplo (do cache se ele não mudou); vazio se não existir."""
+        rel_path = os.path.relpath(path, self.templates_dir)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return []
+        entry = self.cache.get(rel_path, st) if self.cache is not None else None
+        if entry is None:
+            with open(path, 'rb') as f:
+                data = f.read()
+            digest = content_digest(data)
+            entry = self.cache.get_by_digest(rel_path, st, digest) if self.cache is not None else None
+            if entry is None:
+                outline = extract(MarkdownDocument(data.decode('utf-8'), str(path)))
+                entry = {'digest': digest, 'result': [list(section) for section in outline]}
+                if self.cache is not None:
+                    self.cache.store(rel_path, st, digest, (), entry['result'])
+        digests[rel_path] = entry['digest']
+        return [Section(*section) for section in entry['result']]
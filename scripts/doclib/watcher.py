@@ -0,0 +1,198 @@
+"""
+Observação da árvore de documentação.
+
+No Linux usa inotify (via ctypes, sem dependências externas), com um watch
+por diretório; em outros sistemas, ou se inotify não estiver disponível,
+cai para uma varredura periódica comparando mtime e tamanho. Os dois
+observadores expõem a mesma interface não bloqueante: ``changes()`` devolve
+os caminhos relativos alterados desde a última chamada, ou None quando é
+preciso revarrer tudo (ex: fila de eventos do kernel estourou). ``watch``
+bloqueia entregando cada lote de alterações a um callback.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import selectors
+import struct
+import sys
+import time
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+from doclib.scanner import DEFAULT_EXCLUDES, compile_excludes, scan_tree
+
+# Constantes de <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, 'O_CLOEXEC', 0o2000000)
+
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+_EVENT = struct.Struct('iIII')
+
+class InotifyWatcher:
+    """Observador baseado em inotify, recursivo por diretório."""
+
+    interval = None  # eventos chegam pelo descritor, sem polling
+
+    def __init__(self, root: str, excludes: Iterable[str] = DEFAULT_EXCLUDES):
+        self.root = os.path.abspath(root)
+        self._exclude = compile_excludes(excludes)
+        self._excludes = tuple(excludes)
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 falhou')
+        self._dirs: Dict[int, str] = {}
+        self._pending: Set[str] = set()
+        self._watch_tree('')
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _excluded(self, name: str, rel_path: str) -> bool:
+        return self._exclude is not None and bool(self._exclude.match(name) or self._exclude.match(rel_path))
+
+    def _watch_dir(self, rel_dir: str):
+        path = os.path.join(self.root, rel_dir) if rel_dir else self.root
+        wd = self._add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd >= 0:
+            self._dirs[wd] = rel_dir
+
+    def _watch_tree(self, rel_dir: str):
+        """Registra watches para um diretório e todos os seus subdiretórios."""
+        self._watch_dir(rel_dir)
+        base = os.path.join(self.root, rel_dir) if rel_dir else self.root
+        scan = scan_tree(base, self._excludes)
+        for sub_dir in scan.dirs:
+            self._watch_dir(os.path.join(rel_dir, sub_dir) if rel_dir else sub_dir)
+        return scan
+
+    def changes(self) -> Optional[Set[str]]:
+        """Caminhos alterados desde a última chamada (não bloqueia)."""
+        overflow = False
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+
+                if mask & IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                if mask & IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                rel_dir = self._dirs.get(wd)
+                if rel_dir is None or not name:
+                    continue
+                rel_path = os.path.join(rel_dir, name) if rel_dir else name
+                if self._excluded(name, rel_path):
+                    continue
+                self._pending.add(rel_path)
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    # Arquivos criados antes do watch existir também contam
+                    scan = self._watch_tree(rel_path)
+                    self._pending.update(os.path.join(rel_path, p) for p in scan.files | scan.dirs)
+
+        if overflow:
+            self._pending.clear()
+            return None
+        pending, self._pending = self._pending, set()
+        return pending
+
+class PollingWatcher:
+    """Observador portátil: revarre a árvore a cada ``interval`` segundos."""
+
+    def __init__(self, root: str, excludes: Iterable[str] = DEFAULT_EXCLUDES, interval: float = 1.0):
+        self.root = os.path.abspath(root)
+        self.interval = interval
+        self._excludes = tuple(excludes)
+        self._last_poll = 0.0
+        self._snapshot = self._take_snapshot()
+
+    def fileno(self) -> Optional[int]:
+        return None
+
+    def close(self):
+        pass
+
+    def _take_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        scan = scan_tree(self.root, self._excludes)
+        snapshot = {rel_dir: (0, -1) for rel_dir in scan.dirs}
+        for rel_path in scan.files:
+            try:
+                st = os.stat(os.path.join(self.root, rel_path))
+            except OSError:
+                continue
+            snapshot[rel_path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def changes(self) -> Optional[Set[str]]:
+        now = time.monotonic()
+        if now - self._last_poll < self.interval:
+            return set()
+        self._last_poll = now
+        snapshot = self._take_snapshot()
+        old = self._snapshot
+        self._snapshot = snapshot
+        changed = {p for p in snapshot.keys() ^ old.keys()}
+        changed.update(p for p, state in snapshot.items() if p in old and old[p] != state)
+        return changed
+
+def create_watcher(root: str, excludes: Iterable[str] = DEFAULT_EXCLUDES, poll_interval: float = 1.0):
+    """inotify quando disponível; caso contrário, polling."""
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(root, excludes)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root, excludes, poll_interval)
+
+def watch(watcher, on_change: Callable[[Optional[Set[str]]], None], debounce: float = 0.05):
+    """Chama ``on_change`` a cada lote de alterações, até KeyboardInterrupt.
+
+    Editores costumam salvar em várias operações (arquivo temporário +
+    rename); ``debounce`` agrupa os eventos que chegam logo após o primeiro.
+    """
+    selector = None
+    if watcher.fileno() is not None:
+        selector = selectors.DefaultSelector()
+        selector.register(watcher.fileno(), selectors.EVENT_READ)
+    try:
+        while True:
+            if selector is not None:
+                selector.select()
+                time.sleep(debounce)
+            else:
+                time.sleep(watcher.interval)
+            changed = watcher.changes()
+            if changed is None or changed:
+                on_change(changed)
+    finally:
+        if selector is not None:
+            selector.close()
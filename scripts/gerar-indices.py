@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Regenera as seções geradas dos documentos de navegação.
+
+Os trechos entre ``<!-- indice:inicio TIPO param=valor -->`` e
+``<!-- indice:fim -->`` em NAVIGATION.md, MAPA_NAVEGACAO.md,
+INDICE_ORGANIZACIONAL.md e GUIA_CENTRAL.md são montados a partir da
+varredura da árvore e dos títulos dos documentos; o resto do texto não é
+tocado. A cada execução só os documentos alterados são relidos e só as
+seções que dependem deles são regeneradas (veja ``doclib/navindex.py``).
+
+Exemplos:
+    python3 scripts/gerar-indices.py
+    python3 scripts/gerar-indices.py --check        # falha se algum índice estiver desatualizado
+    python3 scripts/gerar-indices.py --full NAVIGATION.md
+"""
+
+import argparse
+import os
+from pathlib import Path
+
+from doclib.navindex import NAVIGATION_DOCS, IndexSpecError, NavigationIndex
+from doclib.profiling import add_profile_arguments, profiler_from_args
+from doclib.scanner import DEFAULT_EXCLUDES, scan_tree
+from doclib.sharding import ShardError, read_manifest
+
+DOCS_ROOT = Path(__file__).parent.parent
+CACHE_DIR = DOCS_ROOT / ".cache"
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Regenera as seções geradas dos documentos de navegação.")
+    parser.add_argument("documents", nargs="*", metavar="DOC",
+                        help="Documentos de navegação, relativos à raiz (padrão: os quatro documentos centrais)")
+    parser.add_argument("--check", action="store_true",
+                        help="Não grava nada; termina com código 1 se alguma seção estiver desatualizada")
+    parser.add_argument("--full", action="store_true", help="Regenera todas as seções, mesmo sem mudanças")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Relê todos os documentos ignorando o cache de esboços e dependências")
+    parser.add_argument("--manifest", metavar="PATH",
+                        help="Lê o índice de arquivos do manifesto dos verificadores em vez de percorrer a árvore")
+    parser.add_argument("--exclude", action="append", default=[], metavar="GLOB",
+                        help="Glob de arquivos/diretórios a ignorar (além dos padrões)")
+    add_profile_arguments(parser)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    profiler = profiler_from_args(args)
+    documents = args.documents or list(NAVIGATION_DOCS)
+    missing = [doc for doc in documents if not (DOCS_ROOT / doc).is_file()]
+    if missing:
+        print(f"❌ Documento(s) não encontrado(s): {', '.join(missing)}")
+        return 2
+
+    with profiler.phase("varredura"):
+        try:
+            scan = (read_manifest(args.manifest, str(DOCS_ROOT)) if args.manifest
+                    else scan_tree(DOCS_ROOT, DEFAULT_EXCLUDES + tuple(args.exclude)))
+        except ShardError as e:
+            print(f"❌ {e}")
+            return 2
+    rel_paths = [os.path.relpath(p, scan.root).replace(os.sep, '/') for p in scan.markdown_files]
+    profiler.files += len(rel_paths)
+
+    index = NavigationIndex(DOCS_ROOT, None if args.no_cache else CACHE_DIR)
+    with profiler.phase("esboços"):
+        refresh = index.refresh(rel_paths)
+    profiler.parsed += index.parsed
+    with profiler.phase("seções geradas"):
+        try:
+            changes = index.update(documents, check=args.check, force=args.full)
+        except IndexSpecError as e:
+            print(f"❌ {e}")
+            return 2
+    if not args.check:
+        index.save()
+
+    print(f"🔎 {index.parsed} documento(s) relido(s); {len(refresh.added)} novo(s), "
+          f"{len(refresh.removed)} removido(s), {len(refresh.modified)} com títulos alterados")
+    outdated = [change for change in changes if change.changed]
+    for change in outdated:
+        print(f"{'⚠️ ' if args.check else '📝'} {change.region}")
+    if args.check:
+        if outdated:
+            print(f"❌ {len(outdated)} seção(ões) desatualizada(s); rode scripts/gerar-indices.py")
+        else:
+            print("✅ Índices de navegação atualizados")
+    else:
+        print(f"✅ {len(outdated)} seção(ões) reescrita(s), {len(changes) - len(outdated)} conferida(s) sem mudança")
+    profiler.report()
+    return 1 if args.check and outdated else 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,56 @@
+"""Testes da verificação de sintaxe dos blocos de código (doclib.codecheck)."""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from doclib import codecheck
+from doclib.codecheck import BlockCache, Checker, block_key, check_cached, prepare
+
+SLOW = Checker("lento", (sys.executable, "-c", "import time; time.sleep(5)"))
+MISSING = Checker("ausente", ("verificador-que-nao-existe",))
+PYTHON = Checker("python", ())
+
+class CheckCachedTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache_path = Path(self._tmp.name) / "code-blocks.json"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def run_once(self, checker, code):
+        code = prepare(code)
+        key = block_key(checker, code)
+        cache = BlockCache(self.cache_path)
+        results, pending = check_cached({key: (checker, code)}, cache, workers=1)
+        cache.save()
+        return results[key], pending
+
+    def test_timed_out_block_is_checked_again(self):
+        with mock.patch.object(codecheck, "TIMEOUT", 0.2):
+            result, pending = self.run_once(SLOW, "x")
+            self.assertTrue(result.transient)
+            self.assertIn("tempo esgotado", result.error)
+            _, pending_again = self.run_once(SLOW, "x")
+        self.assertEqual(pending_again, pending)
+
+    def test_missing_tool_is_not_cached(self):
+        result, _ = self.run_once(MISSING, "x")
+        self.assertTrue(result.transient)
+        _, pending = self.run_once(MISSING, "x")
+        self.assertEqual(len(pending), 1)
+
+    def test_syntax_errors_are_cached(self):
+        result, _ = self.run_once(PYTHON, "def f(:\n")
+        self.assertFalse(result.transient)
+        self.assertIsNotNone(result.error)
+        cached, pending = self.run_once(PYTHON, "def f(:\n")
+        self.assertEqual((pending, cached), ([], result))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+"""Testes da verificação de links externos (doclib.external) contra um servidor HTTP local."""
+
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from doclib.external import ExternalCache, check_urls, normalize_url
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, como os servidores reais
+    requests = []
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def _respond(self, send_body):
+        _Handler.requests.append((self.command, self.path))
+        status, headers, body = 200, {}, b"ok"
+        if self.path == "/missing":
+            status, body = 404, b"not found"
+        elif self.path == "/moved":
+            status, headers = 301, {"Location": "/ok"}
+        elif self.path == "/loop":
+            status, headers = 302, {"Location": "/loop"}
+        elif self.path == "/no-head" and self.command == "HEAD":
+            status = 405
+        elif self.path == "/busy":
+            status = 503
+        elif self.path == "/slow":
+            time.sleep(1)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class ExternalCheckTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        cls.server.daemon_threads = True
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        _Handler.requests.clear()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache_path = Path(self._tmp.name) / "external-links.json"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def check(self, *paths, cache=None, timeout=5.0):
+        urls = [self.base + path for path in paths]
+        results = check_urls(urls, cache, timeout=timeout)
+        return [results[url] for url in urls]
+
+    def test_ok(self):
+        result, = self.check("/ok")
+        self.assertEqual((result["status"], result["ok"]), (200, True))
+        self.assertEqual(_Handler.requests, [("HEAD", "/ok")])
+
+    def test_not_found_falls_back_to_get(self):
+        result, = self.check("/missing")
+        self.assertEqual((result["status"], result["ok"]), (404, False))
+        self.assertEqual(_Handler.requests, [("HEAD", "/missing"), ("GET", "/missing")])
+
+    def test_head_not_allowed_uses_get(self):
+        result, = self.check("/no-head")
+        self.assertEqual((result["status"], result["ok"]), (200, True))
+
+    def test_redirect_is_followed(self):
+        result, = self.check("/moved")
+        self.assertEqual((result["status"], result["ok"]), (200, True))
+        self.assertIn(("HEAD", "/ok"), _Handler.requests)
+
+    def test_redirect_loop_is_not_judged(self):
+        result, = self.check("/loop")
+        self.assertIsNone(result["ok"])
+        self.assertIn("redirecionamentos", result["error"])
+
+    def test_timeout_is_transient(self):
+        result, = self.check("/slow", timeout=0.2)
+        self.assertIsNone(result["status"])
+        self.assertIsNone(result["ok"])
+        self.assertTrue(result["error"])
+
+    def test_cache_is_reused_within_ttl(self):
+        cache = ExternalCache(self.cache_path, ttl=3600)
+        self.check("/ok", "/missing", cache=cache)
+        sent = len(_Handler.requests)
+        self.assertTrue(self.cache_path.exists())
+
+        reloaded = ExternalCache(self.cache_path, ttl=3600)
+        ok, missing = self.check("/ok", "/missing", cache=reloaded)
+        self.assertEqual(len(_Handler.requests), sent)
+        self.assertEqual((ok["ok"], missing["ok"]), (True, False))
+
+    def test_expired_and_transient_results_are_checked_again(self):
+        cache = ExternalCache(self.cache_path, ttl=3600)
+        self.check("/ok", "/busy", cache=cache)
+        self.assertIsNone(cache.get(self.base + "/busy"))
+        self.assertIsNone(cache.get(self.base + "/ok", now=time.time() + 7200))
+
+        expired = ExternalCache(self.cache_path, ttl=0)
+        _Handler.requests.clear()
+        self.check("/ok", cache=expired)
+        self.assertEqual(_Handler.requests, [("HEAD", "/ok")])
+
+class NormalizeUrlTest(unittest.TestCase):
+    def test_title_brackets_and_fragment_are_dropped(self):
+        self.assertEqual(normalize_url('<https://example.com/a b>'), "https://example.com/a b")
+        self.assertEqual(normalize_url('https://example.com/a#x "Título"'), "https://example.com/a")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+"""Testes do fluxo de issues do verificador de links (verificar-links.py)."""
+
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS))
+
+_spec = importlib.util.spec_from_file_location("verificar_links", SCRIPTS / "verificar-links.py")
+verificar_links = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(verificar_links)
+
+class StreamingIssuesTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        self.write("a.md", "# A\n\n[quebrado](nao-existe.md)\n")
+        self.write("b.md", "# B\n\n[adiante](c.md#sumiu) e [ok](c.md#c)\n")
+        self.write("c.md", "# C\n")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write(self, rel_path, text):
+        with open(os.path.join(self.root, rel_path), "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def test_file_issues_leave_before_later_files_are_checked(self):
+        checker = verificar_links.LinkChecker(self.root)
+        checker.markdown_files = [os.path.join(self.root, name) for name in ("a.md", "b.md", "c.md")]
+        seen = []
+
+        def checked():
+            for item in checker.iter_checked():
+                seen.append(os.path.basename(item[0]))
+                yield item
+
+        issues = checker.merge_results(checked(), checker.markdown_files)
+        file_path, file_issues = next(issues)
+        self.assertEqual(os.path.basename(file_path), "a.md")
+        self.assertEqual(seen, ["a.md"])
+        self.assertEqual([issue["type"] for issue in file_issues], ["broken_link"])
+
+    def test_forward_anchors_wait_for_their_target(self):
+        checker = verificar_links.LinkChecker(self.root)
+        checker.markdown_files = [os.path.join(self.root, name) for name in ("a.md", "b.md", "c.md")]
+        issues = dict(checker.iter_issues())
+        anchors = issues[os.path.join(self.root, "b.md")]
+        self.assertEqual([issue["link_url"] for issue in anchors], ["c.md#sumiu"])
+        self.assertEqual(anchors[0]["type"], "broken_anchor")
+
+class ScopeFilesTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        for name, text in (("a.md", "[removido](gone.md)\n"), ("b.md", "cita gone no texto\n"), ("c.md", "# C\n")):
+            with open(os.path.join(self.root, name), "w", encoding="utf-8") as f:
+                f.write(text)
+        self.checker = verificar_links.LinkChecker(self.root, valid_files={"a.md", "b.md", "c.md"})
+        self.changes = verificar_links.GitChanges()
+        self.changes.deleted.add("gone.md")
+        self.graph = verificar_links.LinkGraph()
+        self.graph.set_links("a.md", ["gone.md"])
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def scope(self, graph=None, graph_saved=0.0):
+        return [os.path.basename(path) for path in self.checker.scope_files(self.changes, None, graph, graph_saved)]
+
+    def test_saved_graph_replaces_the_text_search(self):
+        self.assertEqual(self.scope(self.graph, time.time() + 1), ["a.md"])
+
+    def test_files_modified_after_the_graph_are_searched(self):
+        saved = os.stat(os.path.join(self.root, "c.md")).st_mtime
+        os.utime(os.path.join(self.root, "b.md"), (saved + 10, saved + 10))
+        self.assertEqual(self.scope(self.graph, saved), ["a.md", "b.md"])
+
+    def test_without_graph_every_file_is_searched(self):
+        self.assertEqual(self.scope(), ["a.md", "b.md"])
+
+if __name__ == "__main__":
+    unittest.main()
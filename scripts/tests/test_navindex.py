@@ -0,0 +1,65 @@
+"""Testes da regeneração incremental das seções de navegação (doclib.navindex)."""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from doclib.navindex import NavigationIndex
+
+INDEX = "# Índice\n\n<!-- indice:inicio lista fonte=templates -->\n<!-- indice:fim -->\n"
+MAP = "# Mapa\n\n<!-- indice:inicio arvore fonte=guias -->\n<!-- indice:fim -->\n"
+
+class IncrementalUpdateTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.write("INDICE.md", INDEX)
+        self.write("MAPA.md", MAP)
+        self.write("templates/adr-template.md", "# ADR\n\n## Contexto\n")
+        self.write("guias/inicio.md", "# Início\n")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write(self, rel_path, text):
+        path = self.root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+    def run_index(self, documents, check=False, cache=True):
+        index = NavigationIndex(self.root, self.root / ".cache" if cache else None)
+        rel_paths = [os.path.relpath(os.path.join(directory, name), self.root)
+                     for directory, _, names in os.walk(self.root) if ".cache" not in directory
+                     for name in names if name.endswith(".md")]
+        index.refresh(rel_paths)
+        changes = index.update(documents, check=check)
+        if not check:
+            index.save()
+        return [change.region for change in changes if change.changed]
+
+    def test_partial_run_does_not_hide_changes_from_other_documents(self):
+        self.run_index(["INDICE.md", "MAPA.md"])
+        self.assertEqual(self.run_index(["INDICE.md", "MAPA.md"], check=True), [])
+
+        self.write("templates/novo-template.md", "# Novo\n")
+        self.run_index(["MAPA.md"])
+        self.assertEqual(self.run_index(["INDICE.md", "MAPA.md"], check=True), ["INDICE.md#lista fonte=templates"])
+        self.assertEqual(self.run_index(["INDICE.md", "MAPA.md"], check=True, cache=False),
+                         ["INDICE.md#lista fonte=templates"])
+
+        self.run_index(["INDICE.md", "MAPA.md"])
+        self.assertIn("novo-template.md", (self.root / "INDICE.md").read_text(encoding="utf-8"))
+        self.assertEqual(self.run_index(["INDICE.md", "MAPA.md"], check=True), [])
+
+    def test_title_change_regenerates_the_list(self):
+        self.run_index(["INDICE.md"])
+        self.write("templates/adr-template.md", "# Architecture Decision Record\n\n## Contexto\n")
+        self.assertEqual(self.run_index(["INDICE.md"]), ["INDICE.md#lista fonte=templates"])
+        self.assertIn("Architecture Decision Record", (self.root / "INDICE.md").read_text(encoding="utf-8"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+"""Testes do verificador de links reais (verificar-links-reais.py)."""
+
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS))
+
+from doclib.link_cache import LinkCache
+from doclib.profiling import Profiler
+
+_spec = importlib.util.spec_from_file_location("verificar_links_reais", SCRIPTS / "verificar-links-reais.py")
+verificar_links_reais = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(verificar_links_reais)
+
+class UnreadableFileTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        with open(os.path.join(self.root, "ok.md"), "w", encoding="utf-8") as f:
+            f.write("# Ok\n\n[quebrado](nao-existe.md)\n")
+        with open(os.path.join(self.root, "latin1.md"), "wb") as f:
+            f.write("# Ação\n".encode("latin-1"))
+        self.files = [os.path.join(self.root, name) for name in ("latin1.md", "ok.md")]
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def results(self, cache):
+        return dict(verificar_links_reais.iter_results(self.files, self.root, cache, set(), None,
+                                                       Profiler(enabled=False)))
+
+    def test_unreadable_file_is_reported_and_not_cached(self):
+        cache = LinkCache(Path(self.root) / ".cache" / "reais.json", "teste")
+        for current in (cache, None):
+            results = self.results(current)
+            issues = verificar_links_reais.broken_link_issues(results["latin1.md"], verificar_links_reais.SlugIndex())
+            self.assertEqual([issue["type"] for issue in issues], ["error"])
+            self.assertIn("Erro ao ler arquivo", issues[0]["message"])
+            self.assertEqual(len(results["ok.md"]["broken"]), 1)
+        self.assertNotIn("latin1.md", LinkCache(Path(self.root) / ".cache" / "reais.json", "teste").entries)
+
+if __name__ == "__main__":
+    unittest.main()
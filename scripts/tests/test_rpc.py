@@ -0,0 +1,44 @@
+"""Testes do despacho de requisições JSON-RPC (doclib.rpc)."""
+
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from doclib.rpc import INTERNAL_ERROR, INVALID_PARAMS, METHOD_NOT_FOUND, JsonRpcServer
+
+class _Handler:
+    def rpc_soma(self, a, b=0):
+        return a + b
+
+    def rpc_falha(self):
+        return len(None)  # TypeError dentro do método
+
+class DispatchTest(unittest.TestCase):
+    def setUp(self):
+        self.server = JsonRpcServer("/nao/usado.sock", _Handler())
+
+    def call(self, method, params=None):
+        request = {"jsonrpc": "2.0", "id": 1, "method": method}
+        if params is not None:
+            request["params"] = params
+        return json.loads(self.server.dispatch(json.dumps(request).encode("utf-8")))
+
+    def test_result(self):
+        self.assertEqual(self.call("soma", {"a": 2, "b": 3})["result"], 5)
+        self.assertEqual(self.call("soma", [2])["result"], 2)
+
+    def test_wrong_params_are_invalid_params(self):
+        for params in ({"c": 1}, [], [1, 2, 3], "a"):
+            self.assertEqual(self.call("soma", params)["error"]["code"], INVALID_PARAMS)
+
+    def test_type_error_inside_the_method_is_internal(self):
+        self.assertEqual(self.call("falha")["error"]["code"], INTERNAL_ERROR)
+
+    def test_unknown_method(self):
+        self.assertEqual(self.call("nenhum")["error"]["code"], METHOD_NOT_FOUND)
+
+if __name__ == "__main__":
+    unittest.main()
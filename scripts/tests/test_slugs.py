@@ -0,0 +1,34 @@
+"""Testes das âncoras no estilo do GitHub (doclib.slugs)."""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from doclib.document import MarkdownDocument
+from doclib.slugs import document_slugs, heading_slugs
+
+class HeadingSlugsTest(unittest.TestCase):
+    def test_underscores_inside_words_are_kept(self):
+        self.assertEqual(heading_slugs(["Use snake_case_name here"]), ["use-snake_case_name-here"])
+
+    def test_code_spans_are_not_emphasis(self):
+        self.assertEqual(heading_slugs(["`__init__` method"]), ["__init__-method"])
+
+    def test_emphasis_is_removed(self):
+        self.assertEqual(heading_slugs(["**Negrito** e _itálico_"]), ["negrito-e-itálico"])
+        self.assertEqual(heading_slugs(["a*b*c"]), ["abc"])
+
+    def test_emoji_and_duplicates(self):
+        self.assertEqual(heading_slugs(["🎯 Visão Geral", "Exemplo", "Exemplo"]),
+                         ["-visão-geral", "exemplo", "exemplo-1"])
+
+    def test_document_slugs_accept_trimmed_form(self):
+        slugs = document_slugs(MarkdownDocument("# 🎯 Visão Geral\n\n## Use snake_case\n"))
+        self.assertIn("-visão-geral", slugs)
+        self.assertIn("visão-geral", slugs)
+        self.assertIn("use-snake_case", slugs)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""Testes das regras de conformidade derivadas dos templates (doclib.template_rules)."""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from doclib.document import MarkdownDocument
+from doclib.template_rules import TemplateRules
+
+TEMPLATE = "# Template: ADR\n\n## Contexto\n\n### Status\n\n## Decisão\n\n## Consequências Gerais\n"
+
+class TemplateRulesTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.write("templates/adr-template.md", TEMPLATE)
+        self.write("cases/adr-001.md", "# ADR 1\n\n## Context\n\n## Decision\n\n## Consequences\n\n## Language Versions\n")
+        self.write("cases/pt-br/adr-001.pt-br.md", "# ADR 1\n\n## Contexto\n\n## Decisão\n\n## Consequências\n")
+        # Tradução com uma seção a menos: não ensina nada
+        self.write("cases/adr-002.md", "# ADR 2\n\n## Status\n\n## Context\n")
+        self.write("cases/pt-br/adr-002.pt-br.md", "# ADR 2\n\n## Decisão Errada\n")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write(self, rel_path, text):
+        path = self.root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+    def rules(self, cache=True):
+        return TemplateRules(self.root / "templates", {"adr": "adr-template.md"},
+                             self.root / ".cache" / "template-rules.json" if cache else None, self.root / "cases")
+
+    def missing(self, text, rules=None):
+        return (rules or self.rules()).compare("adr", MarkdownDocument(text)).missing
+
+    def test_every_level_two_section_is_required(self):
+        self.assertEqual(self.missing("# ADR\n\n## Contexto\n\ntexto\n"),
+                         ["Decisão (decision)", "Consequências Gerais (consequences)"])
+
+    def test_titles_are_translated_by_aligned_pairs(self):
+        rules = self.rules()
+        self.assertEqual(rules.glossary, {"consequências": ["consequences"], "contexto": ["context"],
+                                          "decisão": ["decision"]})
+        self.assertEqual(self.missing("# ADR\n\n## Context\n\n## Decision\n\n## Consequences\n", rules), [])
+
+    def test_cached_rules_follow_the_examples(self):
+        self.rules()
+        self.write("cases/pt-br/adr-001.pt-br.md", "# ADR 1\n\n## Contexto\n\n## Deliberação\n\n## Consequências\n")
+        rules = self.rules()
+        self.assertEqual(rules.version, self.rules(cache=False).version)
+        self.assertEqual(self.missing("# ADR\n\n## Context\n\n## Decision\n\n## Consequences\n", rules),
+                         ["Decisão"])
+
+if __name__ == "__main__":
+    unittest.main()
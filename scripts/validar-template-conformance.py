@@ -4,15 +4,34 @@ Script para validar conformidade de documentos com templates
 Conforme requisito do OpenSpec: Template Conformance
 """
 
+import argparse
 import os
-import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from doclib.bilingual import (TRANSLATION_DIR, canonical_paths, compare_fingerprints, original_candidates,
+                              pair_documents, read_fingerprint)
+from doclib.doctypes import TEMPLATE, TypeIndex
+from doclib.document import MarkdownDocument, parse_markdown
+from doclib.gitscope import GitError, changed_files
+from doclib.link_cache import LinkCache, content_digest
+from doclib.profiling import Profiler, add_profile_arguments, profiler_from_args
+from doclib.resolver import PathIndex
+from doclib.scanner import DEFAULT_EXCLUDES, TreeScan, scan_tree
+from doclib.sharding import (ShardError, add_shard_arguments, in_shard, partial_path, read_manifest,
+                             read_partials, write_manifest, write_partial)
+from doclib.template_rules import StructureReport, TemplateRules
+from doclib.watcher import create_watcher, watch
 
 DOCS_ROOT = Path(__file__).parent.parent
 TEMPLATES_DIR = DOCS_ROOT / "templates"
 CASES_DIR = DOCS_ROOT / "cases"
 
+# Identifica os resultados parciais de --shard; muda junto com as regras
+VALIDATOR_VERSION = "validar-template-conformance/2"
+
 # Mapeamento de tipos de documentos para templates
 TEMPLATE_MAPPING = {
     "high-level-architecture": "high-level-architecture-template.md",
@@ -22,118 +41,126 @@ TEMPLATE_MAPPING = {
     "adr": "adr-template.md",
 }
 
-# Seções obrigatórias para cada tipo de template
-REQUIRED_SECTIONS = {
-    "high-level-architecture": [
-        r"#.*[Hh]igh.*[Ll]evel.*[Aa]rchitecture|#.*[Aa]rquitetura.*[Aa]lto.*[Nn]ível",
-        r"##?\s*[Oo]verview|##?\s*[Vv]isão\s*[Gg]eral",
-        r"##?\s*[Aa]rchitectural\s*[Oo]bjectives|##?\s*[Oo]bjetivos\s*[Aa]rquiteturais",
-        r"##?\s*[Aa]rchitecture\s*[Dd]iagram|##?\s*[Dd]iagrama",
-    ],
-    "data-governance": [
-        r"##?\s*.*[Bb]asic\s*[Ii]nformation|##?\s*.*[Ii]nformações\s*[Bb]ásicas",
-        r"##?\s*.*[Dd]ata\s*[Cc]lassification|##?\s*.*[Cc]lassificação",
-        r"##?\s*.*[Dd]ata\s*[Pp]olicies|##?\s*.*[Pp]olíticas",
-    ],
-    "engineering-guidelines": [
-        r"##?\s*[Bb]asic\s*[Ii]nformation|##?\s*[Ii]nformações\s*[Bb]ásicas",
-        r"##?\s*[Cc]ode\s*[Qq]uality|##?\s*[Qq]ualidade",
-        r"##?\s*[Tt]esting|##?\s*[Tt]estes",
-    ],
-    "use-case": [
-        r"##?\s*[Bb]asic\s*[Ii]nformation|##?\s*[Ii]nformações\s*[Bb]ásicas",
-        r"##?\s*[Aa]ctors|##?\s*[Aa]tores",
-        r"##?\s*[Pp]reconditions|##?\s*[Pp]ré.*[Cc]ondições",
-        r"##?\s*[Ff]low|##?\s*[Ff]luxo",
-    ],
-    "adr": [
-        r"##?\s*[Ss]tatus",
-        r"##?\s*[Cc]ontext",
-        r"##?\s*[Dd]ecision|##?\s*[Dd]ecisão",
-        r"##?\s*[Cc]onsequences|##?\s*[Cc]onsequências",
-    ],
-}
+# As seções obrigatórias são as de nível 2 de cada template; os casos, com
+# suas traduções, ensinam os títulos equivalentes em inglês. Os esboços ficam em cache
+RULES_CACHE = ".cache/template-rules.json"
+_rules: Optional[TemplateRules] = None
+# Tipo de cada documento (front-matter, título e caminho), atualizado incrementalmente
+TYPE_INDEX = ".cache/document-types.json"
+
+def section_rules() -> TemplateRules:
+    """Regras derivadas dos templates, carregadas uma vez por processo."""
+    global _rules
+    if _rules is None:
+        _rules = TemplateRules(TEMPLATES_DIR, TEMPLATE_MAPPING, DOCS_ROOT / RULES_CACHE, CASES_DIR)
+    return _rules
+
+def document_type(md_file: Path, index: TypeIndex) -> str:
+    """Tipo validável de um documento; "unknown" para os que não são validados (README, pt-br)."""
+    if "README" in md_file.name or "pt-br" in str(md_file):
+        return "unknown"
+    doc_type = index.type_of(md_file)
+    return doc_type if doc_type in TEMPLATE_MAPPING else "unknown"
+
+def type_index(persist: bool = True) -> TypeIndex:
+    """Índice de tipos dos documentos (em memória se ``persist`` for falso)."""
+    template_types = {template: doc_type for doc_type, template in TEMPLATE_MAPPING.items()}
+    return TypeIndex(DOCS_ROOT, DOCS_ROOT / TYPE_INDEX if persist else None, template_types)
 
-def detect_document_type(file_path: Path) -> str:
-    """Detecta o tipo de documento pelo nome do arquivo"""
-    name_lower = file_path.name.lower()
+def validate_structure(content: Union[str, MarkdownDocument], doc_type: str) -> StructureReport:
+    """Compara a árvore de títulos do documento com a do template do seu tipo
     
-    if "high-level-architecture" in name_lower or "arquitetura" in name_lower:
-        return "high-level-architecture"
-    elif "data-governance" in name_lower or "governança" in name_lower:
-        return "data-governance"
-    elif "engineering-guidelines" in name_lower or "diretrizes" in name_lower:
-        return "engineering-guidelines"
-    elif "uc-" in name_lower or "use-case" in name_lower or "caso-de-uso" in name_lower:
-        return "use-case"
-    elif "adr-" in name_lower:
-        return "adr"
+    As regras são comparadas apenas com os títulos, não com o texto
+    inteiro: uma menção em um parágrafo, em um link ``(#status)`` ou em um
+    bloco de código não conta como seção. Além das seções ausentes, aponta
+    seções fora de ordem, no nível errado, repetidas ou vazias.
+    """
+    if doc_type == "unknown":
+        return StructureReport([], [])  # Skip validation for unknown types
     
-    return "unknown"
+    if not isinstance(content, MarkdownDocument):
+        content = parse_markdown(content)
+    return section_rules().compare(doc_type, content)
 
-def validate_sections(content: str, doc_type: str) -> Tuple[bool, List[str]]:
+def validate_sections(content: Union[str, MarkdownDocument], doc_type: str) -> Tuple[bool, List[str]]:
     """Valida se o documento contém as seções obrigatórias"""
-    if doc_type == "unknown":
-        return True, []  # Skip validation for unknown types
-    
-    missing_sections = []
-    required = REQUIRED_SECTIONS.get(doc_type, [])
-    
-    for pattern in required:
-        if not re.search(pattern, content, re.IGNORECASE | re.MULTILINE):
-            missing_sections.append(pattern)
-    
-    return len(missing_sections) == 0, missing_sections
+    missing = validate_structure(content, doc_type).missing
+    return len(missing) == 0, missing
 
-def main():
-    """Valida conformidade de documentos dos casos com templates"""
-    print("🔍 Validando conformidade de templates...\n")
-    
-    results = []
-    
-    # Processar casos
-    for case_dir in CASES_DIR.iterdir():
-        if not case_dir.is_dir() or case_dir.name.startswith("."):
-            continue
-        
-        print(f"📁 Processando caso: {case_dir.name}")
-        
-        # Processar arquivos .md (exceto README e pt-br)
-        for md_file in case_dir.rglob("*.md"):
-            if "README" in md_file.name or "pt-br" in str(md_file):
-                continue
-            
-            doc_type = detect_document_type(md_file)
-            if doc_type == "unknown":
+def conforms(result: Dict, strict: bool = False) -> bool:
+    """Se o documento é conforme; no modo estrito, também sem problemas de estrutura."""
+    return result["valid"] and not (strict and result["structure"])
+
+def case_documents(scan: Optional[TreeScan] = None) -> Iterator[Tuple[str, List[Path]]]:
+    """Casos, em ordem, com seus documentos markdown (do disco ou de um manifesto)."""
+    if scan is None:
+        for case_dir in sorted(CASES_DIR.iterdir()):
+            if not case_dir.is_dir() or case_dir.name.startswith("."):
                 continue
-            
-            try:
-                content = md_file.read_text(encoding="utf-8")
-                is_valid, missing = validate_sections(content, doc_type)
-                
-                relative_path = md_file.relative_to(DOCS_ROOT)
-                results.append({
-                    "file": str(relative_path),
-                    "type": doc_type,
-                    "valid": is_valid,
-                    "missing_sections": missing,
-                })
-                
-                if is_valid:
-                    print(f"  ✅ {md_file.name} - Conforme")
-                else:
-                    print(f"  ⚠️  {md_file.name} - Faltam {len(missing)} seções")
-                    
-            except Exception as e:
-                print(f"  ❌ {md_file.name} - Erro: {e}")
+            yield case_dir.name, list(map(Path, scan_tree(case_dir).markdown_files))
+        return
     
-    # Resumo
+    prefix = os.path.relpath(CASES_DIR, DOCS_ROOT) + os.sep
+    names = sorted(rel_dir[len(prefix):] for rel_dir in scan.dirs
+                   if rel_dir.startswith(prefix) and os.sep not in rel_dir[len(prefix):])
+    for name in names:
+        if name.startswith("."):
+            continue
+        case_prefix = os.path.join(str(CASES_DIR), name) + os.sep
+        yield name, [Path(md_file) for md_file in scan.markdown_files if md_file.startswith(case_prefix)]
+
+def repository_documents(index: TypeIndex, scan: TreeScan) -> Iterator[Tuple[str, List[Path]]]:
+    """Diretórios de primeiro nível do repositório que têm documentos validáveis."""
+    groups: Dict[str, List[Path]] = {}
+    for md_file in scan.markdown_files:
+        rel_path = os.path.relpath(md_file, DOCS_ROOT)
+        groups.setdefault(rel_path.split(os.sep, 1)[0] if os.sep in rel_path else ".", []).append(Path(md_file))
+    for name, md_files in sorted(groups.items()):
+        if any(document_type(md_file, index) != "unknown" for md_file in md_files):
+            yield name, md_files
+
+def skipped_documents(index: TypeIndex, scan: TreeScan) -> Dict[str, List[str]]:
+    """Documentos que --all não valida, agrupados pelo motivo."""
+    skipped: Dict[str, List[str]] = {"sem tipo reconhecido": [], "README ou tradução": [], "templates": []}
+    for md_file in scan.markdown_files:
+        md_file = Path(md_file)
+        rel_path = os.path.relpath(md_file, DOCS_ROOT)
+        if "README" in md_file.name or "pt-br" in str(md_file):
+            skipped["README ou tradução"].append(rel_path)
+        elif index.type_of(md_file) == TEMPLATE:
+            skipped["templates"].append(rel_path)
+        elif document_type(md_file, index) == "unknown":
+            skipped["sem tipo reconhecido"].append(rel_path)
+    return skipped
+
+def print_skipped(skipped: Dict[str, List[str]], total: int, list_paths: bool) -> None:
+    """Mostra quantos documentos ficaram fora da validação e, sob pedido, quais."""
+    count = sum(len(paths) for paths in skipped.values())
+    if not count:
+        return
+    reasons = ", ".join(f"{len(paths)} {reason}" for reason, paths in skipped.items() if paths)
+    print(f"\n❓ {count} de {total} documento(s) não validados: {reasons}")
+    unknown = skipped["sem tipo reconhecido"]
+    by_dir: Dict[str, int] = {}
+    for rel_path in unknown:
+        top = rel_path.split(os.sep, 1)[0] if os.sep in rel_path else "."
+        by_dir[top] = by_dir.get(top, 0) + 1
+    for top, n in sorted(by_dir.items(), key=lambda item: (-item[1], item[0])):
+        print(f"   {top}/: {n} sem tipo reconhecido")
+    if list_paths:
+        for rel_path in sorted(unknown):
+            print(f"   - {rel_path}")
+    elif unknown:
+        print("   (use --unclassified para listar os documentos sem tipo reconhecido)")
+
+def print_summary(results: List[Dict], strict: bool = False) -> int:
+    """Imprime o resumo da validação e devolve o código de saída."""
     print("\n" + "="*60)
     print("📊 RESUMO DE VALIDAÇÃO")
     print("="*60)
     
     total = len(results)
-    valid = sum(1 for r in results if r["valid"])
+    valid = sum(1 for r in results if conforms(r, strict))
     invalid = total - valid
     
     print(f"\nTotal de documentos validados: {total}")
@@ -143,17 +170,407 @@ def main():
     if invalid > 0:
         print("\n📋 Documentos não conformes:")
         for r in results:
-            if not r["valid"]:
+            if not conforms(r, strict):
                 print(f"\n  📄 {r['file']}")
                 print(f"     Tipo: {r['type']}")
-                print(f"     Seções faltantes: {len(r['missing_sections'])}")
-                for pattern in r['missing_sections']:
-                    print(f"       - {pattern}")
+                if r['missing_sections']:
+                    print(f"     Seções faltantes: {len(r['missing_sections'])}")
+                    for pattern in r['missing_sections']:
+                        print(f"       - {pattern}")
+                if strict and r['structure']:
+                    print(f"     Problemas de estrutura: {len(r['structure'])}")
+                    for issue in r['structure']:
+                        print(f"       - {issue}")
     
     print("\n" + "="*60)
     
     return 0 if invalid == 0 else 1
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Valida conformidade de documentos com templates.")
+    parser.add_argument("--all", action="store_true",
+                        help="Valida os documentos do repositório cujo tipo é reconhecido (ADR, caso de uso, ...), "
+                             "não só os casos; os demais são contados no resumo")
+    parser.add_argument("--unclassified", action="store_true",
+                        help="Com --all, lista os documentos sem tipo reconhecido, que não são validados")
+    parser.add_argument("--strict", action="store_true",
+                        help="Exige também a estrutura do template: ordem, nível, seções repetidas ou vazias")
+    parser.add_argument("--pairs", action="store_true",
+                        help="Compara os pares EN/PT-BR do repositório (títulos, blocos de código e links) "
+                             "em vez da conformidade com templates")
+    parser.add_argument("--since", metavar="REV",
+                        help="Valida apenas os documentos alterados desde REV (git diff até a árvore de trabalho)")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="Número de processos para a validação (0 = todos os núcleos)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Valida todos os documentos ignorando o cache de resultados")
+    parser.add_argument("--watch", action="store_true",
+                        help="Observa os casos e revalida cada documento quando ele muda")
+    add_profile_arguments(parser)
+    add_shard_arguments(parser)
+    return parser.parse_args()
+
+def main():
+    """Valida conformidade de documentos dos casos com templates"""
+    args = parse_args()
+    
+    if args.command == "manifest":
+        scan = scan_tree(DOCS_ROOT, DEFAULT_EXCLUDES + tuple(getattr(args, "exclude", [])))
+        write_manifest(args.output, scan)
+        print(f"🗂️  Manifesto salvo em: {args.output} ({len(scan.files)} arquivos, {len(scan.dirs)} diretórios)")
+        return 0
+    if args.command == "merge":
+        try:
+            entries = read_partials(args.partials, VALIDATOR_VERSION)
+        except ShardError as e:
+            print(f"❌ {e}")
+            return 2
+        print(f"🔗 Juntando {len(args.partials)} parciais ({len(entries)} documentos)...")
+        return print_summary([result for _, result in entries], args.strict)
+    
+    if args.watch:
+        unsupported = [flag for flag, value in (("--pairs", args.pairs), ("--since", args.since),
+                                                ("--shard", args.shard), ("--manifest", args.manifest)) if value]
+        if unsupported:
+            print(f"❌ --watch não pode ser combinado com {', '.join(unsupported)}")
+            return 2
+        return watch_cases(args)
+    
+    scan = None
+    if args.manifest:
+        try:
+            scan = read_manifest(args.manifest, str(DOCS_ROOT))
+        except ShardError as e:
+            print(f"❌ {e}")
+            return 2
+    
+    if args.pairs:
+        return check_pairs(scan or scan_tree(DOCS_ROOT), profiler_from_args(args))
+    
+    only = None
+    if args.since:
+        try:
+            changes = changed_files(str(DOCS_ROOT), args.since)
+        except GitError as e:
+            print(f"❌ Erro ao consultar o git: {e}")
+            return 2
+        only = {DOCS_ROOT / rel_path for rel_path in changes.changed}
+        print(f"🔍 Validando conformidade de templates (alterados desde {args.since})...\n")
+    elif args.shard:
+        print(f"🔍 Validando conformidade de templates (shard {args.shard[0]}/{args.shard[1]})...\n")
+    else:
+        print("🔍 Validando conformidade de templates...\n")
+    
+    profiler = profiler_from_args(args)
+    index = type_index(not args.no_cache)
+    with profiler.phase("varredura"):
+        if args.all:
+            scan = scan or scan_tree(DOCS_ROOT)
+            cases = list(repository_documents(index, scan))
+        else:
+            cases = list(case_documents(scan))
+    # Carregadas antes do pool: os processos filhos as herdam
+    with profiler.phase("regras dos templates"):
+        rules = section_rules()
+    cache = None
+    if not args.no_cache:
+        with profiler.phase("carga do cache"):
+            cache = LinkCache(DOCS_ROOT / ".cache" / "validar-template-conformance.json",
+                              VALIDATOR_VERSION + ":" + rules.version)
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    results = []
+    
+    # Processar casos
+    with profiler.phase("validação"):
+        validate_cases(cases, args, only, results, profiler, cache, workers, index, "diretório" if args.all else "caso")
+    with profiler.phase("gravação do cache"):
+        if args.all and only is None and not args.shard:
+            index.prune(os.path.relpath(md_file, DOCS_ROOT) for md_file in scan.markdown_files)
+        index.save()
+        if cache is not None:
+            if only is None and not args.shard:
+                cache.prune({str(md_file.relative_to(DOCS_ROOT)) for _, md_files in cases for md_file in md_files})
+            cache.save()
+    
+    if args.shard:
+        output = args.partial or partial_path("validar-template-conformance", args.shard)
+        write_partial(output, VALIDATOR_VERSION, args.shard, {r["file"]: r for r in results})
+        print(f"\n💾 Resultado parcial salvo em: {output}")
+        profiler.report()
+        return 0
+    
+    if args.all and only is None:
+        print_skipped(skipped_documents(index, scan), len(scan.markdown_files), args.unclassified)
+    exit_code = print_summary(results, args.strict)
+    profiler.report()
+    return exit_code
+
+def check_pairs(scan: TreeScan, profiler: Profiler) -> int:
+    """Modo --pairs: compara cada documento em inglês com sua tradução PT-BR."""
+    print("🔍 Verificando pares de documentos EN/PT-BR...\n")
+    index = PathIndex(scan.root, scan.files | scan.dirs)
+    with profiler.phase("pareamento"):
+        pairing = pair_documents(os.path.relpath(md_file, scan.root) for md_file in scan.markdown_files)
+        canonical = canonical_paths(pairing)
+    profiler.files += 2 * len(pairing.pairs)
+    
+    divergent = 0
+    with profiler.phase("impressões digitais"):
+        for original, translation in pairing.pairs:
+            fingerprints = [read_fingerprint(scan.root, rel_path, index, canonical)
+                            for rel_path in (original, translation)]
+            if None in fingerprints:
+                print(f"  ❌ {original} ↔ {translation} - Erro de leitura")
+                divergent += 1
+                continue
+            problems = compare_fingerprints(*fingerprints)
+            if problems:
+                divergent += 1
+                print(f"  ⚠️  {original} ↔ {translation}")
+                for problem in problems:
+                    print(f"     - {problem}")
+    
+    for rel_path in pairing.orphans:
+        print(f"  ❓ {rel_path} - Tradução sem original ({' ou '.join(original_candidates(rel_path))})")
+    for rel_path in pairing.untranslated:
+        print(f"  🌐 {rel_path} - Sem tradução em {TRANSLATION_DIR}/")
+    
+    print("\n" + "="*60)
+    print(f"📊 {len(pairing.pairs)} pares: {len(pairing.pairs) - divergent} em sincronia, {divergent} divergentes")
+    print(f"   {len(pairing.orphans)} tradução(ões) sem original, {len(pairing.untranslated)} documento(s) sem tradução")
+    print("="*60)
+    profiler.report()
+    return 0 if divergent == 0 and not pairing.orphans else 1
+
+def check_document(md_file: Path, doc_type: str, profiler: Profiler,
+                   content: Union[str, MarkdownDocument, None] = None) -> Dict:
+    """Lê (se ``content`` não for informado) e valida um documento de caso."""
+    started = time.perf_counter()
+    if content is None:
+        with profiler.phase("leitura", "validação"):
+            with open(md_file, "r", encoding="utf-8") as f:
+                content = f.read()
+    if isinstance(content, MarkdownDocument):
+        document = content
+    else:
+        with profiler.phase("análise do markdown", "validação"):
+            document = parse_markdown(content, str(md_file))
+    with profiler.phase("regras de seções", "validação"):
+        report = validate_structure(document, doc_type)
+    relative_path = str(md_file.relative_to(DOCS_ROOT))
+    profiler.record_file(relative_path, time.perf_counter() - started)
+    return {
+        "file": relative_path,
+        "type": doc_type,
+        "valid": not report.missing,
+        "missing_sections": report.missing,
+        "structure": report.issues,
+    }
+
+def watch_cases(args) -> int:
+    """Modo --watch: revalida só os documentos alterados e mostra o que mudou.
+    
+    Observa o mesmo escopo da execução única: os casos ou, com --all, o
+    repositório inteiro; com --strict, problemas de estrutura também
+    contam como não conformidade.
+    """
+    watch_root = DOCS_ROOT if args.all else CASES_DIR
+    profiler = Profiler(enabled=False)
+    index = type_index(persist=False)
+    results: Dict[str, Dict] = {}
+    
+    def revalidate(md_file: Path) -> Optional[Dict]:
+        if not md_file.is_file():
+            return None
+        try:
+            index.forget(md_file)
+            doc_type = document_type(md_file, index)
+            if doc_type == "unknown":
+                return None
+            loaded = index.take(md_file)
+            return check_document(md_file, doc_type, profiler, loaded.document if loaded is not None else None)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"  ❌ {md_file.name} - Erro: {e}")
+            return None
+    
+    def load_all():
+        results.clear()
+        if args.all:
+            groups = [("", list(map(Path, scan_tree(DOCS_ROOT).markdown_files)))]
+        else:
+            groups = case_documents()
+        for _, md_files in groups:
+            for md_file in md_files:
+                result = revalidate(md_file)
+                if result is not None:
+                    results[result["file"]] = result
+    
+    load_all()
+    invalid = sum(1 for r in results.values() if not conforms(r, args.strict))
+    print(f"📈 {len(results)} documentos {'do repositório' if args.all else 'de casos'}; {invalid} não conforme(s)")
+    print(f"👀 Observando {watch_root} (Ctrl+C para sair)")
+    
+    def on_change(changed):
+        if changed is None:
+            load_all()
+            print("🔄 Eventos perdidos: todos os documentos foram revalidados")
+            return
+        for rel_path in sorted(changed):
+            if not rel_path.endswith(".md"):
+                continue
+            md_file = watch_root / rel_path
+            key = str(md_file.relative_to(DOCS_ROOT))
+            before = results.pop(key, None)
+            after = revalidate(md_file)
+            if after is None:
+                if before is not None:
+                    print(f"  🗑️  {key} - removido")
+                continue
+            results[key] = after
+            if conforms(after, args.strict):
+                fixed = before is not None and not conforms(before, args.strict)
+                print(f"  ✅ {key} - Conforme" + (" (corrigido)" if fixed else ""))
+                continue
+            if after["missing_sections"]:
+                print(f"  ⚠️  {key} - Faltam {len(after['missing_sections'])} seções")
+                old_missing = set(before["missing_sections"]) if before is not None else set()
+                for pattern in after["missing_sections"]:
+                    marker = "+" if pattern not in old_missing else " "
+                    print(f"     {marker} {pattern}")
+            if args.strict and after["structure"]:
+                print(f"  ⚠️  {key} - {len(after['structure'])} problemas de estrutura")
+                old_issues = set(before["structure"]) if before is not None else set()
+                for issue in after["structure"]:
+                    marker = "+" if issue not in old_issues else " "
+                    print(f"     {marker} {issue}")
+    
+    watcher = create_watcher(str(watch_root))
+    try:
+        watch(watcher, on_change)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return 0
+
+def _validate_batch(items: List[Tuple[str, str, Optional[str]]]) -> List[Dict]:
+    """Valida um lote de documentos dentro de um worker do pool."""
+    return [validate_file(Path(md_file), doc_type, Profiler(enabled=False), content)
+            for md_file, doc_type, content in items]
+
+def validate_file(md_file: Path, doc_type: str, profiler: Profiler,
+                  content: Union[str, MarkdownDocument, None] = None) -> Dict:
+    """Como ``check_document``, mas devolve ``{"error": ...}`` em vez de propagar a exceção."""
+    try:
+        return check_document(md_file, doc_type, profiler, content)
+    except Exception as e:
+        return {"error": str(e)}
+
+def validate_pending(pending: List[Tuple[Path, str, Union[str, MarkdownDocument, None]]], workers: int,
+                     profiler: Profiler) -> List[Dict]:
+    """Valida os documentos na ordem recebida, em um pool de processos quando ``workers > 1``."""
+    if workers <= 1 or len(pending) < 2:
+        return [validate_file(md_file, doc_type, profiler, content) for md_file, doc_type, content in pending]
+    
+    # Lotes contíguos: poucos lotes por worker equilibram carga sem
+    # multiplicar o custo de serialização entre processos; aos workers vai
+    # só o texto, que é mais barato de serializar que o documento analisado
+    items = [(str(md_file), doc_type, content.text if isinstance(content, MarkdownDocument) else content)
+             for md_file, doc_type, content in pending]
+    batch_count = min(len(items), workers * 4)
+    batch_size = -(-len(items) // batch_count)
+    batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+    outcomes = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for batch in executor.map(_validate_batch, batches):
+            outcomes.extend(batch)
+    return outcomes
+
+def validate_cases(cases, args, only, results: List[Dict], profiler, cache: Optional[LinkCache] = None,
+                   workers: int = 1, index: Optional[TypeIndex] = None, label: str = "caso"):
+    """Valida os documentos de cada caso, acrescentando o resultado de cada um a ``results``.
+    
+    Documentos cujo conteúdo não mudou desde a última execução (com as
+    mesmas regras) vêm do ``cache`` sem serem relidos.
+    """
+    if index is None:
+        index = type_index(persist=False)
+    outcomes = {}
+    selected = []
+    for case_name, md_files in cases:
+        # Processar arquivos .md (exceto README e pt-br)
+        for md_file in md_files:
+            if only is not None and md_file not in only:
+                index.take(md_file)  # pode ter sido lido ao escolher os diretórios (--all)
+                continue
+            
+            relative_path = md_file.relative_to(DOCS_ROOT)
+            if args.shard and not in_shard(str(relative_path), args.shard):
+                index.take(md_file)
+                continue
+            
+            try:
+                doc_type = document_type(md_file, index)
+            except (OSError, UnicodeDecodeError) as e:
+                outcomes[md_file] = {"error": str(e)}
+                continue
+            if doc_type == "unknown":
+                continue
+            selected.append((case_name, md_file, doc_type))
+    profiler.files += len(selected)
+    
+    pending = []
+    stats, digests = {}, {}
+    for _, md_file, doc_type in selected:
+        # Documento já lido pela classificação: não é relido nem reanalisado
+        loaded = index.take(md_file)
+        content = loaded.document if loaded is not None else None
+        if cache is not None:
+            rel_path = str(md_file.relative_to(DOCS_ROOT))
+            try:
+                if loaded is not None:
+                    st, digest = loaded.st, loaded.digest
+                    entry = cache.get_by_digest(rel_path, st, digest)
+                else:
+                    st = os.stat(md_file)
+                    entry = cache.get(rel_path, st)
+                    if entry is None:
+                        with open(md_file, "rb") as f:
+                            data = f.read()
+                        digest = content_digest(data)
+                        entry = cache.get_by_digest(rel_path, st, digest)
+                        content = data.decode("utf-8")
+                if entry is None:
+                    stats[md_file], digests[md_file] = st, digest
+            except (OSError, UnicodeDecodeError):
+                # Erros de leitura não são cacheados; a validação os reporta
+                entry = None
+            if entry is not None:
+                outcomes[md_file] = entry["result"]
+                continue
+        pending.append((md_file, doc_type, content))
+    
+    for (md_file, _, _), outcome in zip(pending, validate_pending(pending, workers, profiler)):
+        outcomes[md_file] = outcome
+        if "error" not in outcome and md_file in stats:
+            cache.store(outcome["file"], stats[md_file], digests[md_file], (), outcome)
+    
+    for case_name, md_files in cases:
+        print(f"📁 Processando {label}: {case_name}")
+        for md_file in md_files:
+            outcome = outcomes.get(md_file)
+            if outcome is None:
+                continue
+            if "error" in outcome:
+                print(f"  ❌ {md_file.name} - Erro: {outcome['error']}")
+                continue
+            results.append(outcome)
+            if conforms(outcome, args.strict):
+                print(f"  ✅ {md_file.name} - Conforme")
+            elif outcome["valid"]:
+                print(f"  ⚠️  {md_file.name} - {len(outcome['structure'])} problemas de estrutura")
+            else:
+                print(f"  ⚠️  {md_file.name} - Faltam {len(outcome['missing_sections'])} seções")
+
 if __name__ == "__main__":
     exit(main())
-
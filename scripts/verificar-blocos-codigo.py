@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Verifica a sintaxe dos blocos de código embutidos nos documentos markdown.
+
+Os blocos são extraídos pelo mesmo analisador dos verificadores de links e
+verificados em um pool de processos: Python com ``compile()``, JSON com
+``json.loads`` e as demais linguagens com as ferramentas instaladas na
+máquina (veja ``--list``). O resultado de cada bloco fica em
+.cache/code-blocks.json pelo hash do código, então só os trechos editados
+são verificados de novo.
+
+Exemplos:
+    python3 scripts/verificar-blocos-codigo.py
+    python3 scripts/verificar-blocos-codigo.py --dir architecture --lang python -j 0
+    python3 scripts/verificar-blocos-codigo.py --checker sql="sqlite3 :memory:"
+"""
+
+import argparse
+import os
+from pathlib import Path
+
+from doclib.codecheck import (BlockCache, block_key, check_cached, default_checkers, normalize_lang,
+                              parse_checker, prepare)
+from doclib.document import MarkdownDocument
+from doclib.profiling import add_profile_arguments, profiler_from_args
+from doclib.scanner import DEFAULT_EXCLUDES, scan_tree
+from doclib.sharding import ShardError, read_manifest
+
+DOCS_ROOT = Path(__file__).parent.parent
+CACHE_PATH = DOCS_ROOT / ".cache" / "code-blocks.json"
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Verifica a sintaxe dos blocos de código nos documentos.")
+    parser.add_argument("--dir", metavar="DIR", help="Verifica apenas os documentos sob DIR (ex: architecture)")
+    parser.add_argument("--lang", action="append", default=[], metavar="LANG",
+                        help="Verifica apenas os blocos desta linguagem (pode repetir)")
+    parser.add_argument("--checker", action="append", default=[], metavar="LANG=COMANDO",
+                        help="Acrescenta ou substitui um verificador; o código vai pela entrada padrão "
+                             "ou, se o comando tiver {file}, por um arquivo temporário")
+    parser.add_argument("--list", action="store_true", help="Lista os verificadores disponíveis e sai")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="Número de processos para a verificação (0 = todos os núcleos)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Verifica todos os blocos ignorando o cache de resultados")
+    parser.add_argument("--manifest", metavar="PATH",
+                        help="Lê o índice de arquivos do manifesto dos verificadores em vez de percorrer a árvore")
+    parser.add_argument("--exclude", action="append", default=[], metavar="GLOB",
+                        help="Glob de arquivos/diretórios a ignorar (além dos padrões)")
+    add_profile_arguments(parser)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    profiler = profiler_from_args(args)
+    checkers = default_checkers()
+    try:
+        for spec in args.checker:
+            checker = parse_checker(spec)
+            checkers[checker.lang] = checker
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 2
+    if args.list:
+        for lang, checker in sorted(checkers.items()):
+            print(f"  {lang:12} {' '.join(checker.command) if checker.command else '(embutido)'}")
+        return 0
+    only = {normalize_lang(lang) for lang in args.lang}
+    prefix = args.dir.rstrip('/') + '/' if args.dir else None
+
+    with profiler.phase("varredura"):
+        try:
+            scan = (read_manifest(args.manifest, str(DOCS_ROOT)) if args.manifest
+                    else scan_tree(DOCS_ROOT, DEFAULT_EXCLUDES + tuple(args.exclude)))
+        except ShardError as e:
+            print(f"❌ {e}")
+            return 2
+
+    # Blocos de cada documento: (caminho, linha da cerca, linguagem, chave)
+    blocks = []
+    code_by_key = {}
+    skipped = {}
+    with profiler.phase("extração dos blocos"):
+        for md_file in scan.markdown_files:
+            rel_path = os.path.relpath(md_file, scan.root)
+            if prefix and not rel_path.startswith(prefix):
+                continue
+            try:
+                with open(md_file, 'r', encoding='utf-8') as f:
+                    document = MarkdownDocument(f.read(), rel_path)
+            except (OSError, UnicodeDecodeError):
+                continue
+            profiler.files += 1
+            profiler.parsed += 1
+            for block in document.code_blocks:
+                lang = normalize_lang(block.lang)
+                if not lang or (only and lang not in only):
+                    continue
+                checker = checkers.get(lang)
+                if checker is None:
+                    skipped[lang] = skipped.get(lang, 0) + 1
+                    continue
+                code = prepare(block.code)
+                key = block_key(checker, code)
+                code_by_key[key] = (checker, code)
+                blocks.append((rel_path, block.line, lang, key))
+
+    cache = BlockCache(None if args.no_cache else CACHE_PATH)
+    with profiler.phase("verificação"):
+        workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+        results, pending = check_cached(code_by_key, cache, workers)
+    if not (prefix or only or args.no_cache):
+        cache.prune(code_by_key)
+    if not args.no_cache:
+        cache.save()
+
+    failures = 0
+    unchecked = 0
+    counts = {}
+    for rel_path, line, lang, key in blocks:
+        counts[lang] = counts.get(lang, 0) + 1
+        result = results[key]
+        if result.error is None:
+            continue
+        if result.transient:
+            # Não é erro do trecho: fica fora do cache e é verificado de novo na próxima execução
+            unchecked += 1
+            print(f"⚠️  {rel_path}:{line} [{lang}] não verificado: {result.error}")
+            continue
+        failures += 1
+        # Linha da cerca + linha do erro dentro do trecho
+        where = line + result.line if result.line else line
+        print(f"❌ {rel_path}:{where} [{lang}] {result.error}")
+
+    summary = ", ".join(f"{lang}: {count}" for lang, count in sorted(counts.items()))
+    print(f"\n📊 {len(blocks)} bloco(s) verificado(s) ({summary or 'nenhum'}); "
+          f"{len(pending)} trecho(s) novo(s) ou alterado(s), {len(code_by_key) - len(pending)} do cache")
+    if unchecked:
+        print(f"⚠️  {unchecked} bloco(s) não verificado(s) (tempo esgotado ou verificador indisponível)")
+    if skipped:
+        print("⏭️  Sem verificador: " + ", ".join(f"{lang} ({count})" for lang, count in sorted(skipped.items())))
+    print(f"❌ {failures} bloco(s) com erro de sintaxe" if failures else "✅ Nenhum erro de sintaxe")
+    profiler.report()
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    exit(main())
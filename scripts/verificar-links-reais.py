@@ -3,17 +3,31 @@
 Script para verificar links quebrados ignorando arquivos de relatório.
 """
 
+import argparse
 import os
-import re
-from datetime import datetime
+import time
 
-def find_markdown_files(root_dir):
-    markdown_files = []
-    for dirpath, _, filenames in os.walk(root_dir):
-        for f in filenames:
-            if f.endswith('.md'):
-                markdown_files.append(os.path.join(dirpath, f))
-    return markdown_files
+from doclib.document import MarkdownDocument, parse_markdown, read_document
+from doclib.link_cache import LinkCache, content_digest
+from doclib.profiling import Profiler, add_profile_arguments, profiler_from_args
+from doclib.reporters import MarkdownReporter, NdjsonReporter, SarifReporter
+from doclib.resolver import PathIndex
+from doclib.scanner import DEFAULT_EXCLUDES, scan_tree
+from doclib.sharding import (ShardError, add_shard_arguments, in_shard, partial_path, read_manifest,
+                             read_partials, write_manifest, write_partial)
+from doclib.slugs import AnchorGate, SlugIndex, document_slugs
+
+# Muda sempre que a lógica de validação mudar, invalidando o cache
+CHECKER_VERSION = "verificar-links-reais/6"
+
+def find_markdown_files(root_dir, all_paths=None, excludes=DEFAULT_EXCLUDES):
+    """Lista os arquivos markdown; se ``all_paths`` for dado, registra nele
+    todos os arquivos e diretórios encontrados (relativos a ``root_dir``)."""
+    scan = scan_tree(root_dir, excludes)
+    if all_paths is not None:
+        all_paths.update(scan.files)
+        all_paths.update(scan.dirs)
+    return scan.markdown_files
 
 def is_report_file(filepath):
     """Verifica se o arquivo é um relatório que deve ser ignorado."""
@@ -32,27 +46,41 @@ def is_report_file(filepath):
     
     return filename in report_files
 
-def check_links_in_file(filepath, root_dir):
+def check_links_in_file(filepath, root_dir, slug_index=None):
+    result, _ = check_links_in_content(read_document(filepath), filepath, root_dir)
+    if slug_index is None:
+        # Sem índice global, apenas as âncoras do próprio arquivo são conhecidas
+        slug_index = SlugIndex()
+        slug_index.add(os.path.relpath(filepath, root_dir), result['slugs'])
+    return format_broken_links(result, slug_index)
+
+def check_links_in_content(content, filepath, root_dir, path_index=None):
+    """Verifica os links de um conteúdo já lido (texto ou MarkdownDocument).
+
+    Devolve o resultado do arquivo e os alvos consultados (relativos a
+    ``root_dir``). O resultado traz os links quebrados, as âncoras do arquivo
+    e os fragmentos a validar depois contra o índice de âncoras.
+
+    Com ``path_index`` a existência dos alvos é verificada no índice em
+    memória, sem nenhuma chamada ao sistema de arquivos por link.
+    """
     broken_links = []
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
+    anchors = []
+    targets = set()
+    relative_filepath = os.path.relpath(filepath, root_dir)
 
-    # Regex para encontrar links Markdown: [texto do link](caminho/do/arquivo.md)
-    # e links de imagem: ![alt text](caminho/da/imagem.png)
+    # Links Markdown: [texto do link](caminho/do/arquivo.md)
+    # links de imagem: ![alt text](caminho/da/imagem.png)
     # e links HTML: <a href="caminho/do/arquivo.md">
-    link_pattern = re.compile(r'\[.*?\]\((.*?)\)|\!\[.*?\]\((.*?)\)|<a href="(.*?)">')
-    matches = link_pattern.finditer(content)
-
-    for match in matches:
-        link_path = None
-        if match.group(1):
-            link_path = match.group(1)
-        elif match.group(2):
-            link_path = match.group(2)
-        elif match.group(3):
-            link_path = match.group(3)
-
-        if link_path and not link_path.startswith(('http://', 'https://', '#', 'mailto:')):
+    document = content if isinstance(content, MarkdownDocument) else parse_markdown(content, filepath)
+
+    for link in document.links:
+        link_path = link.url
+        column = document.column_of(link.offset)
+
+        if link_path.startswith('#'):
+            anchors.append([relative_filepath, link_path[1:], link.line, column, link_path])
+        elif link_path and not link_path.startswith(('http://', 'https://', '#', 'mailto:')):
             # Remove âncoras de links internos (ex: #secao)
             link_path_without_anchor = link_path.split('#')[0]
 
@@ -66,69 +94,282 @@ def check_links_in_file(filepath, root_dir):
 
             # Normaliza o caminho para remover '..' e '.'
             abs_link_path = os.path.normpath(abs_link_path)
+            if link_path_without_anchor:
+                targets.add(os.path.relpath(abs_link_path, root_dir))
 
-            if not os.path.exists(abs_link_path) and link_path_without_anchor:
-                line_number = content.count('\n', 0, match.start()) + 1
-                broken_links.append(f"- **Linha {line_number}**: Link quebrado: [{link_path}]({link_path})")
-    return broken_links
+            if path_index is not None:
+                exists = path_index.exists(os.path.dirname(filepath), link_path_without_anchor)
+            else:
+                exists = os.path.exists(abs_link_path)
 
-def main():
-    docs_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-    markdown_files = find_markdown_files(docs_root)
-    
-    report_path = os.path.join(docs_root, 'RELATORIO_LINKS_REAIS.md')
-    
-    total_broken_links = 0
-    files_with_problems = 0
-    
-    report_content = []
-    report_content.append(f"# Relatório de Links Quebrados REAIS - Projeto Docs")
-    report_content.append(f"**Data**: {datetime.now().strftime('%c')}")
-    report_content.append(f"**Nota**: Ignorando arquivos de relatório para mostrar apenas links reais quebrados\n")
-    
-    broken_links_by_file = {}
+            if not exists and link_path_without_anchor:
+                broken_links.append([link.line, column, link_path])
+            elif '#' in link_path and abs_link_path.endswith('.md'):
+                target = os.path.relpath(abs_link_path, root_dir) if link_path_without_anchor else relative_filepath
+                anchors.append([target, link_path.split('#', 1)[1], link.line, column, link_path])
+
+    result = {
+        'broken': broken_links,
+        'slugs': sorted(document_slugs(document)),
+        'anchors': anchors,
+    }
+    return result, targets
+
+def read_error_result(error):
+    """Resultado de um arquivo que não pôde ser lido (não vai para o cache)."""
+    return {'broken': [], 'slugs': [], 'anchors': [], 'error': f'Erro ao ler arquivo: {error}'}
+
+def broken_link_issues(result, slug_index):
+    """Problemas de um arquivo, com links e âncoras na ordem do texto."""
+    if result.get('error'):
+        return [{'line': 0, 'type': 'error', 'message': result['error']}]
+    problems = [(line, column, 'broken_link', 'Link quebrado', link_path)
+                for line, column, link_path in result['broken']]
+    for target, fragment, line, column, link_path in result['anchors']:
+        if fragment and not slug_index.has_anchor(target, fragment):
+            problems.append((line, column, 'broken_anchor', 'Âncora inexistente', link_path))
+    problems.sort(key=lambda problem: (problem[0], problem[1]))
+    return [{'line': line, 'column': column, 'type': issue_type, 'link_url': link_path,
+             'message': f"{kind}: [{link_path}]({link_path})"}
+            for line, column, issue_type, kind, link_path in problems]
+
+def format_broken_links(result, slug_index):
+    """Linhas do relatório para um arquivo, com links e âncoras na ordem do texto."""
+    return [f"- **Linha {issue['line']}**: {issue['message']}" for issue in broken_link_issues(result, slug_index)]
+
+class RealLinksReport(MarkdownReporter):
+    """Layout do RELATORIO_LINKS_REAIS.md."""
+
+    title = "Relatório de Links Quebrados REAIS - Projeto Docs"
+
+    def header(self):
+        lines = super().header()
+        lines.insert(2, "**Nota**: Ignorando arquivos de relatório para mostrar apenas links reais quebrados")
+        return lines
+
+    def summary(self):
+        return [
+            "## Resumo",
+            f"- **Arquivos com problemas**: {self.files}",
+            f"- **Total de links quebrados**: {self.issues}",
+            "",
+            "## Links Quebrados por Arquivo" if self.issues else "## 🎉 Nenhum link quebrado encontrado!",
+        ]
+
+    def file_section(self, rel_path, issues):
+        yield ""
+        yield f"### {rel_path}"
+        yield ""
+        for issue in issues:
+            if issue['type'] == 'error':
+                yield f"- **Erro**: {issue['message']}"
+            else:
+                yield f"- **Linha {issue['line']}**: {issue['message']}"
+
+def analyze_file(text, md_file, root_dir, path_index, profiler, started):
+    """Analisa um conteúdo já lido, medindo extração e resolução com ``profiler``."""
+    with profiler.phase('extração (regex)', 'verificação'):
+        document = parse_markdown(text, md_file)
+        link_count = len(document.links)
+    with profiler.phase('resolução', 'verificação'):
+        result, targets = check_links_in_content(document, md_file, root_dir, path_index)
+    profiler.record_file(os.path.relpath(md_file, root_dir), time.perf_counter() - started, link_count)
+    return result, targets
 
-    print("🔍 Verificando links REAIS na documentação (ignorando relatórios)...")
+def check_with_cache(md_file, relative_filepath, root_dir, cache, dirty, path_index=None, profiler=None):
+    """Verifica um arquivo reaproveitando o resultado em cache quando possível."""
+    if profiler is None:
+        profiler = Profiler(enabled=False)
+    started = time.perf_counter()
+    try:
+        st = os.stat(md_file)
+        entry = None if relative_filepath in dirty else cache.get(relative_filepath, st)
+        if entry is not None:
+            return entry['result']
 
+        with profiler.phase('leitura', 'verificação'):
+            with open(md_file, 'rb') as f:
+                data = f.read()
+        digest = content_digest(data)
+        if relative_filepath not in dirty:
+            entry = cache.get_by_digest(relative_filepath, st, digest)
+            if entry is not None:
+                return entry['result']
+        text = data.decode('utf-8')
+    except (OSError, UnicodeDecodeError) as e:
+        cache.discard([relative_filepath])
+        return read_error_result(e)
+
+    result, targets = analyze_file(text, md_file, root_dir, path_index, profiler, started)
+    cache.store(relative_filepath, st, digest, targets, result)
+    return result
+
+def iter_results(markdown_files, docs_root, cache, dirty, path_index, profiler, prune=True):
+    """Gera ``(arquivo, resultado)`` de cada markdown, um por vez, ignorando os relatórios.
+
+    Com ``cache``, ele é gravado (e, com ``prune``, podado) quando o gerador termina.
+    """
     for md_file in markdown_files:
         relative_filepath = os.path.relpath(md_file, docs_root)
-        
+
         # Ignora arquivos de relatório
         if is_report_file(relative_filepath):
             print(f"⏭️  Ignorando arquivo de relatório: {relative_filepath}")
             continue
-        
-        broken = check_links_in_file(md_file, docs_root)
-        if broken:
-            files_with_problems += 1
-            total_broken_links += len(broken)
-            broken_links_by_file[relative_filepath] = broken
-    
-    report_content.append(f"## Resumo")
-    report_content.append(f"- **Arquivos com problemas**: {files_with_problems}")
-    report_content.append(f"- **Total de links quebrados**: {total_broken_links}\n")
-    
-    if broken_links_by_file:
-        report_content.append(f"## Links Quebrados por Arquivo")
-        for filename, links in broken_links_by_file.items():
-            report_content.append(f"\n### {filename}\n")
-            report_content.extend(links)
-    else:
-        report_content.append("## 🎉 Nenhum link quebrado encontrado!")
 
-    with open(report_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(report_content))
+        if cache is None:
+            started = time.perf_counter()
+            try:
+                with profiler.phase('leitura', 'verificação'):
+                    with open(md_file, 'r', encoding='utf-8') as f:
+                        text = f.read()
+            except (OSError, UnicodeDecodeError) as e:
+                result = read_error_result(e)
+            else:
+                result, _ = analyze_file(text, md_file, docs_root, path_index, profiler, started)
+        else:
+            result = check_with_cache(md_file, relative_filepath, docs_root, cache, dirty, path_index, profiler)
+        yield relative_filepath, result
 
-    print(f"📊 Relatório salvo em: {report_path}")
-    print(f"📈 Total de arquivos com problemas: {files_with_problems}")
-    print(f"🔗 Total de links quebrados: {total_broken_links}\n")
+    if cache is not None:
+        with profiler.phase('gravação do cache', 'verificação'):
+            if prune:
+                cache.prune({os.path.relpath(md_file, docs_root) for md_file in markdown_files})
+            cache.save()
 
-    if files_with_problems > 0:
-        print("❌ Links quebrados encontrados:")
-        for filename in broken_links_by_file.keys():
-            print(f"  📄 {filename}: {len(broken_links_by_file[filename])} problemas")
-    else:
+def parse_args():
+    parser = argparse.ArgumentParser(description="Verifica links quebrados ignorando arquivos de relatório.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Verifica todos os arquivos ignorando o cache incremental")
+    parser.add_argument("--exclude", action="append", default=[], metavar="GLOB",
+                        help="Glob de arquivos/diretórios a ignorar (além de: %s)" % ", ".join(DEFAULT_EXCLUDES))
+    parser.add_argument("--ndjson", metavar="PATH",
+                        help="Grava também os problemas em NDJSON (um objeto por linha), à medida que são encontrados")
+    parser.add_argument("--sarif", metavar="PATH",
+                        help="Grava também os problemas em SARIF 2.1.0, para code scanning em CI")
+    add_profile_arguments(parser)
+    merge = add_shard_arguments(parser)
+    merge.add_argument("--ndjson", default=argparse.SUPPRESS, metavar="PATH",
+                       help="Grava também os problemas em NDJSON")
+    merge.add_argument("--sarif", default=argparse.SUPPRESS, metavar="PATH",
+                       help="Grava também os problemas em SARIF 2.1.0")
+    return parser.parse_args()
+
+def write_reports(results, expected, report_path, args):
+    """Valida as âncoras e envia os problemas aos relatórios à medida que ``results`` chega.
+
+    ``results`` são pares ``(arquivo, resultado)`` cobrindo ``expected``. Cada
+    arquivo vai para os destinos assim que os alvos das suas âncoras foram
+    indexados; só os que apontam para arquivos ainda não lidos esperam.
+    """
+    report = RealLinksReport(report_path)
+    reporters = [report]
+    if args.ndjson:
+        reporters.append(NdjsonReporter(args.ndjson))
+    if args.sarif:
+        reporters.append(SarifReporter(args.sarif, "verificar-links-reais", CHECKER_VERSION))
+
+    # Cada fragmento custa uma consulta em set no índice de âncoras
+    slug_index = SlugIndex()
+    gate = AnchorGate(slug_index, expected)
+
+    def emit(relative_filepath, result):
+        issues = broken_link_issues(result, slug_index)
+        if not issues:
+            return
+        for reporter in reporters:
+            reporter.add(relative_filepath, issues)
+        if report.files == 1:
+            print("❌ Links quebrados encontrados:")
+        print(f"  📄 {relative_filepath}: {len(issues)} problemas")
+
+    for relative_filepath, result in results:
+        for released in gate.add(relative_filepath, result['slugs'], result['anchors'], (relative_filepath, result)):
+            emit(*released)
+    for released in gate.flush():
+        emit(*released)
+    for reporter in reporters:
+        reporter.close()
+
+    print(f"\n📊 Relatório salvo em: {report_path}")
+    print(f"📈 Total de arquivos com problemas: {report.files}")
+    print(f"🔗 Total de links quebrados: {report.issues}\n")
+
+    if report.files == 0:
         print("✅ Nenhum link quebrado encontrado. A documentação está impecável!")
 
+def main():
+    args = parse_args()
+    docs_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    report_path = os.path.join(docs_root, 'RELATORIO_LINKS_REAIS.md')
+    excludes = DEFAULT_EXCLUDES + tuple(getattr(args, 'exclude', []))
+
+    if args.command == "manifest":
+        scan = scan_tree(docs_root, excludes)
+        write_manifest(args.output, scan)
+        print(f"🗂️  Manifesto salvo em: {args.output} ({len(scan.files)} arquivos, {len(scan.dirs)} diretórios)")
+        return 0
+    if args.command == "merge":
+        try:
+            entries = read_partials(args.partials, CHECKER_VERSION)
+        except ShardError as e:
+            print(f"❌ {e}")
+            return 2
+        print(f"🔗 Juntando {len(args.partials)} parciais ({len(entries)} arquivos)...")
+        write_reports(entries, [relative_filepath for relative_filepath, _ in entries], report_path, args)
+        return 0
+
+    profiler = profiler_from_args(args)
+    cache = None
+    dirty = set()
+    all_paths = set()
+    with profiler.phase('varredura'):
+        if args.manifest:
+            try:
+                scan = read_manifest(args.manifest, docs_root)
+            except ShardError as e:
+                print(f"❌ {e}")
+                return 2
+            markdown_files = scan.markdown_files
+            all_paths = scan.paths
+        else:
+            markdown_files = find_markdown_files(docs_root, all_paths, excludes)
+        path_index = PathIndex(docs_root, all_paths)
+    if args.shard:
+        markdown_files = [md_file for md_file in markdown_files
+                          if in_shard(os.path.relpath(md_file, docs_root), args.shard)]
+    profiler.files = len(markdown_files)
+    if not args.no_cache:
+        with profiler.phase('carga do cache'):
+            cache = LinkCache(os.path.join(docs_root, '.cache', 'verificar-links-reais.json'), CHECKER_VERSION)
+            # Arquivos que apontam para alvos criados ou removidos precisam ser revalidados
+            dirty = cache.dependents(cache.changed_targets(all_paths))
+            if args.shard:
+                # Os de outros shards não serão revalidados aqui
+                cache.discard(dirty - {os.path.relpath(md_file, docs_root) for md_file in markdown_files})
+    
+    if args.shard:
+        print(f"🔍 Verificando links REAIS do shard {args.shard[0]}/{args.shard[1]} ({len(markdown_files)} arquivos)...")
+    else:
+        print("🔍 Verificando links REAIS na documentação (ignorando relatórios)...")
+
+    results = iter_results(markdown_files, docs_root, cache, dirty, path_index, profiler, prune=not args.shard)
+    if args.shard:
+        with profiler.phase('verificação'):
+            partial = dict(results)
+        output = args.partial or partial_path("verificar-links-reais", args.shard)
+        write_partial(output, CHECKER_VERSION, args.shard, partial)
+        print(f"💾 Resultado parcial salvo em: {output}")
+        profiler.report()
+        return 0
+
+    # Cada arquivo vai para os relatórios assim que verificado (e suas âncoras, julgadas)
+    expected = [os.path.relpath(md_file, docs_root) for md_file in markdown_files]
+    with profiler.phase('verificação'):
+        write_reports(results, [rel_path for rel_path in expected if not is_report_file(rel_path)],
+                      report_path, args)
+    profiler.report()
+    return 0
+
 if __name__ == "__main__":
-    main()
+    exit(main())
@@ -3,202 +3,1343 @@
 Script para verificar links quebrados na documentação do projeto docs.
 """
 
+import argparse
+import io
 import os
-import re
 import glob
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Set, Tuple
+
+from doclib.document import MarkdownDocument, parse_markdown, read_document
+from doclib.external import ExternalCache, check_urls, is_external, normalize_url
+from doclib.gitscope import GitChanges, GitError, changed_files, export_tree, tracked_files
+from doclib.link_cache import LinkCache, content_digest
+from doclib.linkgraph import LinkGraph
+from doclib.profiling import Profiler, add_profile_arguments, profiler_from_args
+from doclib.reporters import MarkdownReporter, NdjsonReporter, SarifReporter
+from doclib.resolver import PathIndex
+from doclib.rpc import JsonRpcServer
+from doclib.scanner import DEFAULT_EXCLUDES, scan_tree
+from doclib.sharding import (ShardError, add_shard_arguments, in_shard, partial_path, read_manifest,
+                             read_partials, write_manifest, write_partial)
+from doclib.slugs import AnchorGate, SlugIndex, document_slugs, normalize_fragment
+from doclib.suggest import PathSuggester
+from doclib.watcher import create_watcher, watch
+
+DOCS_ROOT = Path(__file__).resolve().parent.parent
+
+# Muda sempre que a lógica de validação mudar, invalidando o cache
+CHECKER_VERSION = "verificar-links/7"
+
+# Páginas de entrada da navegação: o que nenhuma delas alcança é órfão
+ENTRY_PAGES = ("README.md", "GUIA_CENTRAL.md")
+
+# Correção automática (--fix) só quando a sugestão é forte e sem empate próximo
+FIX_MIN_SCORE = 0.75
+FIX_MARGIN = 0.05
+
+# Checker do processo worker, criado uma única vez pelo initializer do pool
+_worker_checker = None
+
+def _init_worker(docs_root: str, valid_files: Set[str]):
+    """Inicializa o worker reaproveitando o índice de arquivos já construído."""
+    global _worker_checker
+    _worker_checker = LinkChecker(docs_root, valid_files=valid_files)
+
+def _check_shard(file_paths: List[str]) -> List[Tuple]:
+    """Verifica um lote de arquivos dentro do worker."""
+    return [(file_path, *_worker_checker._check_file(file_path)) for file_path in file_paths]
 
 class LinkChecker:
-    def __init__(self, docs_root: str):
+    def __init__(self, docs_root: str, valid_files: Optional[Set[str]] = None,
+                 excludes: Iterable[str] = DEFAULT_EXCLUDES):
         self.docs_root = Path(docs_root)
         self.broken_links = []
-        self.valid_files = set()
-        self.scan_files()
+        self.slug_index = SlugIndex()
+        # Resolução léxica com memo por (diretório, href): nenhum stat por link
+        self.resolver = PathIndex(str(self.docs_root))
+        self.excludes = tuple(excludes)
+        self.markdown_files = []
+        self._suggester = None
+        self.profiler = Profiler(enabled=False)
+        if valid_files is not None:
+            # Índice pré-construído (ex: compartilhado com os workers)
+            self.valid_files = set(valid_files)
+        else:
+            self.valid_files = set()
+            self.scan_files()
+    
+    @staticmethod
+    def index_files(rel_paths: Iterable[str]) -> Set[str]:
+        """Índice de arquivos válidos: todos os arquivos e, para markdown, também o caminho sem extensão."""
+        valid_files = set()
+        for rel_path in rel_paths:
+            valid_files.add(rel_path)
+            if rel_path.endswith('.md'):
+                valid_files.add(rel_path[:-3])
+        return valid_files
     
     def scan_files(self):
-        """Escaneia todos os arquivos markdown para criar índice de arquivos válidos."""
-        for md_file in self.docs_root.rglob("*.md"):
-            # Caminho relativo ao docs_root
-            rel_path = md_file.relative_to(self.docs_root)
-            self.valid_files.add(str(rel_path))
-            # Também adiciona versão sem extensão
-            self.valid_files.add(str(rel_path.with_suffix("")))
-    
-    def extract_links(self, content: str) -> List[Tuple[str, int]]:
-        """Extrai links markdown do conteúdo."""
-        # Padrão para links markdown [texto](url)
-        link_pattern = r'\[([^\]]+)\]\(([^)]+)\)'
-        links = []
+        """Escaneia a árvore para criar o índice de arquivos válidos.
+        
+        Inclui todos os tipos de arquivo (imagens, exemplos de código...),
+        não apenas markdown, para que links para assets também sejam
+        resolvidos. A mesma varredura produz a fila de arquivos markdown
+        usada por check_all_files.
+        """
+        scan = scan_tree(self.docs_root, self.excludes)
+        self.markdown_files = scan.markdown_files
+        self.valid_files.update(self.index_files(scan.files))
+    
+    def scope_files(self, changes: GitChanges, cache: Optional[LinkCache] = None,
+                    graph: Optional[LinkGraph] = None, graph_saved: float = 0.0) -> List[str]:
+        """Arquivos markdown a validar para um conjunto de mudanças do git.
+        
+        Inclui os markdown alterados e os arquivos que apontam para algo que
+        foi removido ou renomeado. Com cache, esses últimos vêm do índice
+        reverso; sem cache, do grafo de links salvo (``graph``, gravado em
+        ``graph_saved``), mais os arquivos modificados depois dele que citam
+        o nome do alvo removido. Sem nenhum dos dois, todos os markdown são
+        lidos à procura desse nome.
+        """
+        scope = {rel_path for rel_path in changes.changed
+                 if rel_path.endswith('.md') and rel_path in self.valid_files}
         
-        for match in re.finditer(link_pattern, content):
-            link_text = match.group(1)
-            link_url = match.group(2)
-            line_number = content[:match.start()].count('\n') + 1
-            links.append((link_text, link_url, line_number))
+        if changes.deleted:
+            removed = set(changes.deleted)
+            removed.update(rel_path[:-3] for rel_path in changes.deleted if rel_path.endswith('.md'))
+            if cache is not None and cache.entries:
+                scope.update(cache.dependents(removed))
+            elif graph is not None:
+                for target in removed:
+                    scope.update(graph.links_to(target))
+                # Links criados depois do grafo não estão nele
+                scope.update(self._files_mentioning(changes.deleted, self._modified_since(graph_saved)))
+            else:
+                print("ℹ️  Sem cache nem grafo de links salvo: procurando quem cita os arquivos removidos "
+                      "em todos os markdown (varredura completa)")
+                scope.update(self._files_mentioning(changes.deleted))
         
-        return links
+        return [os.path.join(self.docs_root, rel_path) for rel_path in sorted(scope)
+                if rel_path in self.valid_files]
+    
+    def _modified_since(self, timestamp: float) -> List[str]:
+        """Markdown do índice modificados depois de ``timestamp`` (só um stat por arquivo)."""
+        modified = []
+        for rel_path in self.valid_files:
+            if not rel_path.endswith('.md'):
+                continue
+            try:
+                if os.stat(os.path.join(self.docs_root, rel_path)).st_mtime > timestamp:
+                    modified.append(rel_path)
+            except OSError:
+                continue
+        return modified
+    
+    def _files_mentioning(self, rel_paths: Iterable[str], candidates: Optional[Iterable[str]] = None) -> Set[str]:
+        """Markdown (dentre ``candidates``, ou todos) cujo texto cita o nome (sem extensão) de algum dos caminhos.
+        
+        README.md e index.md são citados pelo diretório: para eles vale o nome
+        do diretório pai ou o caminho completo, nunca o nome genérico.
+        """
+        names = set()
+        for rel_path in rel_paths:
+            if os.path.basename(rel_path) in ('README.md', 'index.md'):
+                names.add(os.path.basename(os.path.dirname(rel_path)) or rel_path)
+            else:
+                names.add(os.path.splitext(os.path.basename(rel_path))[0])
+        names.discard('')
+        mentioning = set()
+        for rel_path in self.valid_files if candidates is None else candidates:
+            if not rel_path.endswith('.md'):
+                continue
+            try:
+                with open(os.path.join(self.docs_root, rel_path), 'r', encoding='utf-8') as f:
+                    content = f.read()
+            except (OSError, UnicodeDecodeError):
+                continue
+            if any(name in content for name in names):
+                mentioning.add(rel_path)
+        return mentioning
+    
+    def extract_links(self, content) -> List[Tuple[str, str, int]]:
+        """Extrai links markdown ([texto](url) e imagens) do conteúdo.
+        
+        Aceita o texto bruto ou um MarkdownDocument já analisado.
+        """
+        document = content if isinstance(content, MarkdownDocument) else parse_markdown(content)
+        return [(link.text, link.url, link.line) for link in document.links if link.kind != 'html']
     
     def is_valid_link(self, link_url: str, current_file: str) -> bool:
         """Verifica se um link é válido."""
+        candidates = self.link_candidates(link_url, current_file)
+        if candidates is None:
+            return True
+        
+        return any(path in self.valid_files for path in candidates)
+    
+    def link_candidates(self, link_url: str, current_file: str) -> Optional[List[str]]:
+        """Caminhos do índice que tornariam o link válido.
+        
+        Retorna None para links que não são verificados (externos e seções)
+        e lista vazia para links que apontam para fora do docs_root.
+        """
         # Ignora links externos
         if link_url.startswith(('http://', 'https://', 'mailto:', '#')):
-            return True
+            return None
         
-        # Ignora links para seções (começam com #)
+        # Links para seções (começam com #) são validados pelo índice de âncoras
         if link_url.startswith('#'):
-            return True
+            return None
         
         # Remove fragmentos (#section)
         clean_url = link_url.split('#')[0]
         
-        # Se é um caminho relativo
-        if not clean_url.startswith('/'):
-            # Caminho relativo ao arquivo atual
-            current_dir = Path(current_file).parent
-            target_path = current_dir / clean_url
-        else:
-            # Caminho absoluto
-            target_path = self.docs_root / clean_url.lstrip('/')
+        # Normaliza o caminho (relativo ao arquivo atual, ou ao docs_root se começa com '/')
+        rel_path = self.resolver.resolve(os.path.dirname(current_file), clean_url)
         
-        # Normaliza o caminho
-        try:
-            target_path = target_path.resolve()
-            docs_path = self.docs_root.resolve()
-            
-            # Verifica se está dentro do docs_root
-            if not str(target_path).startswith(str(docs_path)):
-                return False
-            
-            # Verifica se o arquivo existe
-            rel_path = target_path.relative_to(docs_path)
-            
-            # Tenta diferentes extensões
-            possible_paths = [
-                str(rel_path),
-                str(rel_path) + '.md',
-                str(rel_path) + '/README.md',
-                str(rel_path) + '/index.md'
-            ]
-            
-            for path in possible_paths:
-                if path in self.valid_files:
-                    return True
-            
-            return False
-            
-        except (ValueError, OSError):
-            return False
+        # Verifica se está dentro do docs_root
+        if rel_path is None:
+            return []
+        
+        if rel_path == '':
+            return ['README.md', 'index.md']
+        
+        # Barra final só pode apontar para diretório
+        if clean_url.endswith('/'):
+            return [os.path.join(rel_path, 'README.md'), os.path.join(rel_path, 'index.md')]
+        
+        # Tenta diferentes extensões
+        return [
+            rel_path,
+            rel_path + '.md',
+            os.path.join(rel_path, 'README.md'),
+            os.path.join(rel_path, 'index.md')
+        ]
     
     def check_file(self, file_path: str) -> List[Dict]:
-        """Verifica links em um arquivo específico."""
+        """Verifica links em um arquivo específico.
+        
+        Âncoras são verificadas contra o índice de âncoras atual; para
+        arquivos ainda não indexados, o fragmento não é julgado.
+        """
+        issues, _, slugs, anchors, _ = self._check_file(file_path)
+        rel_path = os.path.relpath(file_path, self.docs_root)
+        if slugs is not None and rel_path not in self.slug_index:
+            self.slug_index.add(rel_path, slugs)
+        return self.merge_anchor_issues(file_path, issues, anchors)
+    
+    def _check_file(self, file_path: str, content: Optional[str] = None) -> Tuple:
+        """Verifica um arquivo e devolve também os alvos consultados pelos links.
+        
+        Retorna (issues, alvos, âncoras do arquivo, fragmentos a validar,
+        arquivos apontados pelos links válidos). Os fragmentos são resolvidos
+        depois, quando o índice de âncoras de todos os arquivos estiver
+        completo.
+        """
         issues = []
+        targets = set()
+        anchors = []
+        profiler = self.profiler
+        started = time.perf_counter()
         
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except Exception as e:
-            issues.append({
-                'file': file_path,
-                'line': 0,
-                'type': 'error',
-                'message': f'Erro ao ler arquivo: {e}'
-            })
-            return issues
+        if content is None:
+            try:
+                with profiler.phase('leitura', 'verificação'):
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        content = f.read()
+            except Exception as e:
+                issues.append({
+                    'file': file_path,
+                    'line': 0,
+                    'type': 'error',
+                    'message': f'Erro ao ler arquivo: {e}'
+                })
+                return issues, targets, None, anchors, []
         
-        links = self.extract_links(content)
+        with profiler.phase('extração (regex)', 'verificação'):
+            document = parse_markdown(content, file_path)
+            link_count = len(document.links)
+        with profiler.phase('resolução', 'verificação'):
+            result = self._check_document(file_path, document)
+        profiler.record_file(os.path.relpath(file_path, self.docs_root), time.perf_counter() - started,
+                             link_count)
+        return result
+    
+    def _check_document(self, file_path: str, document: MarkdownDocument) -> Tuple:
+        """Mesma saída de _check_file para um documento já analisado."""
+        issues = []
+        targets = set()
+        anchors = []
+        links = set()
+        rel_file = os.path.relpath(file_path, self.docs_root)
         
-        for link_text, link_url, line_number in links:
-            if not self.is_valid_link(link_url, file_path):
+        for link in document.links:
+            if link.kind == 'html':
+                continue
+            link_text, link_url, line_number = link.text, link.url, link.line
+            column = document.column_of(link.offset)
+            
+            if link_url.startswith('#'):
+                anchors.append([rel_file, link_url[1:], line_number, column, link_text, link_url])
+                continue
+            
+            candidates = self.link_candidates(link_url, file_path)
+            if candidates is None:
+                continue
+            targets.update(candidates)
+            found = next((path for path in candidates if path in self.valid_files), None)
+            if found is None:
                 issues.append({
                     'file': file_path,
                     'line': line_number,
+                    'column': column,
                     'type': 'broken_link',
                     'link_text': link_text,
                     'link_url': link_url,
                     'message': f'Link quebrado: [{link_text}]({link_url})'
                 })
+            else:
+                links.add(self._link_target(found))
+                if '#' in link_url:
+                    anchors.append([self._link_target(found), link_url.split('#', 1)[1],
+                                    line_number, column, link_text, link_url])
         
+        return issues, targets, sorted(document_slugs(document)), anchors, sorted(links)
+    
+    def _link_target(self, found: str) -> str:
+        """Arquivo real de um candidato encontrado no índice.
+        
+        O índice também guarda o caminho sem extensão de cada markdown.
+        """
+        if not found.endswith('.md') and found + '.md' in self.valid_files:
+            return found + '.md'
+        return found
+    
+    def resolve_link(self, link_url: str, current_file: str) -> Optional[str]:
+        """Arquivo (relativo ao docs_root) para onde o link aponta, ou None se quebrado/externo."""
+        if link_url.startswith('#'):
+            return os.path.relpath(current_file, self.docs_root)
+        candidates = self.link_candidates(link_url, current_file)
+        if not candidates:
+            return None
+        found = next((path for path in candidates if path in self.valid_files), None)
+        return None if found is None else self._link_target(found)
+    
+    @property
+    def suggester(self) -> PathSuggester:
+        """Índice aproximado dos arquivos reais, montado na primeira consulta."""
+        if self._suggester is None:
+            # O índice também guarda o caminho sem extensão de cada markdown
+            self._suggester = PathSuggester(p for p in self.valid_files if p + '.md' not in self.valid_files)
+        return self._suggester
+    
+    def suggest_href(self, link_url: str, current_file: str, margin: float = 0.0) -> Optional[Tuple[str, float]]:
+        """Href provável para um link quebrado, escrito a partir do arquivo de origem."""
+        clean_url, _, fragment = link_url.partition('#')
+        if not clean_url:
+            return None
+        rel_file = os.path.relpath(current_file, self.docs_root)
+        source_dir = os.path.dirname(rel_file)
+        if clean_url.startswith('/'):
+            wanted = os.path.normpath(clean_url.lstrip('/'))
+        else:
+            wanted = os.path.normpath(os.path.join(source_dir, clean_url))
+        # Links que saem da raiz: considera apenas o trecho abaixo dela
+        while wanted == os.pardir or wanted.startswith(os.pardir + os.sep):
+            wanted = wanted[len(os.pardir) + 1:]
+        if clean_url.endswith('/') or wanted in ('', '.'):
+            wanted = os.path.join(wanted if wanted != '.' else '', 'README.md')
+        elif not os.path.splitext(wanted)[1]:
+            wanted += '.md'
+        
+        best = self.suggester.best(wanted, margin, exclude={rel_file})
+        if best is None:
+            return None
+        target, score = best
+        if clean_url.endswith('/') and os.path.basename(target).lower() in ('readme.md', 'index.md'):
+            href = os.path.relpath(os.path.dirname(target) or '.', source_dir or '.') + '/'
+        else:
+            href = os.path.relpath(target, source_dir or '.')
+        href = href.replace(os.sep, '/')
+        if clean_url.startswith('/'):
+            href = '/' + target.replace(os.sep, '/')
+        elif clean_url.startswith('./') and not href.startswith('.'):
+            href = './' + href
+        if fragment:
+            href += '#' + fragment
+        return href, score
+    
+    def suggest_fixes(self, file_path: str, issues: List[Dict]):
+        """Anota cada link quebrado do arquivo com o alvo mais provável, quando houver."""
+        for issue in issues:
+            if issue['type'] != 'broken_link':
+                continue
+            suggestion = self.suggest_href(issue['link_url'], file_path)
+            if suggestion is not None:
+                issue['suggestion'], issue['suggestion_score'] = suggestion
+    
+    def apply_fixes(self, file_path: str, issues: List[Dict]) -> Tuple[List[Dict], int]:
+        """Reescreve no arquivo os links com sugestão confiável.
+        
+        Devolve as issues que continuam valendo e quantos links foram
+        reescritos.
+        """
+        fixes = []
+        for issue in issues:
+            if issue['type'] != 'broken_link' or 'column' not in issue:
+                continue
+            suggestion = self.suggest_href(issue['link_url'], file_path, margin=FIX_MARGIN)
+            if suggestion is not None and suggestion[1] >= FIX_MIN_SCORE:
+                fixes.append((issue, suggestion[0]))
+        if not fixes:
+            return issues, 0
+        
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError):
+            return issues, 0
+        document = parse_markdown(text, file_path)
+        edits = []
+        for issue, href in fixes:
+            start = document.line_starts[issue['line'] - 1] + issue['column'] - 1
+            token = f"]({issue['link_url']})"
+            position = text.find(token, start)
+            if position < 0 or document.line_of(position) != issue['line']:
+                continue
+            edits.append((position, token, f']({href})', issue))
+        if not edits:
+            return issues, 0
+        
+        # Do fim para o início: as posições anteriores continuam válidas
+        for position, token, replacement, _ in sorted(edits, key=lambda edit: edit[0], reverse=True):
+            text = text[:position] + replacement + text[position + len(token):]
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        
+        fixed_ids = {id(edit[3]) for edit in edits}
+        return [issue for issue in issues if id(issue) not in fixed_ids], len(edits)
+    
+    def merge_anchor_issues(self, file_path: str, issues: List[Dict], anchors: List[List]) -> List[Dict]:
+        """Acrescenta às issues do arquivo os fragmentos que não existem no alvo."""
+        anchor_issues = []
+        for target, fragment, line_number, column, link_text, link_url in anchors:
+            if not fragment or self.slug_index.has_anchor(target, fragment):
+                continue
+            anchor_issues.append({
+                'file': file_path,
+                'line': line_number,
+                'column': column,
+                'type': 'broken_anchor',
+                'link_text': link_text,
+                'link_url': link_url,
+                'message': f'Âncora inexistente: [{link_text}]({link_url})'
+            })
+        
+        if not anchor_issues:
+            return issues
+        return sorted(issues + anchor_issues, key=lambda issue: (issue['line'], issue.get('column', 0)))
+    
+    def check_all_files(self, workers: int = 1, cache: Optional[LinkCache] = None,
+                        file_paths: Optional[List[str]] = None) -> Dict[str, List[Dict]]:
+        """Verifica todos os arquivos markdown (ou apenas ``file_paths``).
+        
+        Devolve as issues por arquivo; veja ``iter_issues``.
+        """
+        return dict(self.iter_issues(workers, cache, file_paths))
+    
+    def iter_issues(self, workers: int = 1, cache: Optional[LinkCache] = None,
+                    file_paths: Optional[List[str]] = None,
+                    extra: Optional[Dict[str, List[Dict]]] = None) -> Iterator[Tuple[str, List[Dict]]]:
+        """Gera ``(arquivo, issues)`` para os arquivos com problemas, à medida que são verificados."""
+        checked = self.iter_checked(workers, cache, file_paths)
+        return self.merge_results(checked, file_paths if file_paths is not None else self.markdown_files,
+                                  scoped=file_paths is not None, extra=extra)
+    
+    def iter_checked(self, workers: int = 1, cache: Optional[LinkCache] = None,
+                     file_paths: Optional[List[str]] = None) -> Iterator[Tuple[str, Tuple]]:
+        """Resultado de cada arquivo antes da validação das âncoras.
+
+        Gera ``(arquivo, (issues, âncoras do arquivo, fragmentos a validar,
+        arquivos apontados))`` na ordem de ``file_paths``, um arquivo por vez,
+        sem guardar os anteriores. É também o que cada shard grava no seu
+        resultado parcial.
+
+        Com ``workers > 1`` os arquivos são divididos em lotes e verificados
+        em um pool de processos. Os lotes são consumidos na mesma ordem da
+        execução serial, então o relatório gerado é idêntico.
+
+        Com ``cache``, apenas arquivos alterados e arquivos que apontam para
+        alvos adicionados ou removidos desde a última execução são relidos.
+        O cache é gravado quando o gerador termina.
+        """
+        scoped = file_paths is not None
+        if not scoped:
+            file_paths = self.markdown_files
+        
+        reused = {}
+        pending = file_paths
+        contents, stats, digests = {}, {}, {}
+        if cache is not None:
+            with self.profiler.phase('cache (stat + hash)', 'verificação'):
+                pending, contents, stats, digests = self._reuse_cached(file_paths, cache, reused)
+        
+        if workers <= 1 or len(pending) < 2:
+            checked = ((file_path, *self._check_file(file_path, contents.pop(file_path, None)))
+                       for file_path in pending)
+        else:
+            checked = self._check_parallel(pending, workers)
+        
+        for file_path in file_paths:
+            entry = reused.pop(file_path, None)
+            if entry is not None:
+                issues = [dict(issue, file=file_path) for issue in entry['issues']]
+                yield file_path, (issues, entry['slugs'], entry['anchors'], entry['links'])
+                continue
+            # Os verificados chegam na ordem de pending, que segue a de file_paths
+            _, issues, targets, slugs, anchors, links = next(checked)
+            if file_path in stats:
+                rel_path = os.path.relpath(file_path, self.docs_root)
+                cached = {
+                    'issues': [{k: v for k, v in issue.items() if k != 'file'} for issue in issues],
+                    'slugs': slugs,
+                    'anchors': anchors,
+                    'links': links,
+                }
+                cache.store(rel_path, stats.pop(file_path), digests.pop(file_path), targets, cached)
+            yield file_path, (issues, slugs, anchors, links)
+        
+        if cache is not None:
+            with self.profiler.phase('gravação do cache', 'verificação'):
+                if not scoped:
+                    cache.prune({os.path.relpath(file_path, self.docs_root) for file_path in file_paths})
+                cache.save()
+    
+    def merge_results(self, results: Iterable[Tuple[str, Tuple]], file_paths: Iterable[str],
+                      scoped: bool = False, extra: Optional[Dict[str, List[Dict]]] = None,
+                      graph: Optional[LinkGraph] = None) -> Iterator[Tuple[str, List[Dict]]]:
+        """Valida as âncoras e gera as issues de cada arquivo à medida que ``results`` chega.
+        
+        ``results`` são os pares de ``iter_checked`` (ou dos parciais) para
+        ``file_paths``. Um arquivo sai assim que os alvos das suas âncoras
+        foram indexados; só os que apontam para âncoras de arquivos ainda não
+        lidos esperam por eles. Com ``scoped``, as âncoras dos alvos fora de
+        ``file_paths`` são lidas sob demanda. ``extra`` acrescenta issues
+        calculadas à parte (ex: links externos) às de cada arquivo e
+        ``graph`` recebe os links válidos de cada arquivo.
+        """
+        self.slug_index = SlugIndex()
+        gate = AnchorGate(self.slug_index, (os.path.relpath(file_path, self.docs_root) for file_path in file_paths))
+        for file_path, (issues, slugs, anchors, links) in results:
+            rel_path = os.path.relpath(file_path, self.docs_root)
+            if graph is not None:
+                graph.set_links(rel_path, links)
+            if scoped:
+                self._index_anchor_targets(anchors, skip=gate.remaining)
+            for released in gate.add(rel_path, slugs, anchors, (file_path, issues, anchors)):
+                yield from self._final_issues(*released, extra)
+        for released in gate.flush():
+            yield from self._final_issues(*released, extra)
+    
+    def _final_issues(self, file_path: str, issues: List[Dict], anchors: List[List],
+                      extra: Optional[Dict[str, List[Dict]]]) -> Iterator[Tuple[str, List[Dict]]]:
+        issues = self.merge_anchor_issues(file_path, issues, anchors)
+        if extra and file_path in extra:
+            issues = sorted(issues + extra[file_path], key=lambda issue: (issue['line'], issue.get('column', 0)))
+        if issues:
+            yield file_path, issues
+    
+    def external_issues(self, file_paths: List[str], cache: Optional[ExternalCache] = None,
+                        per_host: int = 4, timeout: float = 10.0) -> Dict[str, List[Dict]]:
+        """Verifica os links http(s) dos arquivos; devolve as issues por arquivo.
+        
+        Cada URL é consultada uma única vez, mesmo que apareça em vários
+        arquivos. Resultados transitórios (timeout, 429, 503...) não viram
+        issue.
+        """
+        links = []
+        for file_path in file_paths:
+            try:
+                document = read_document(file_path)
+            except (OSError, UnicodeDecodeError):
+                continue
+            for link in document.links:
+                if link.kind != 'html' and is_external(link.url.strip()):
+                    links.append((file_path, normalize_url(link.url), document.column_of(link.offset), link))
+        
+        urls = {url for _, url, _, _ in links}
+        cached = sum(1 for url in urls if cache is not None and cache.get(url) is not None)
+        print(f"🌐 Verificando {len(urls)} URLs externas ({cached} em cache)...")
+        results = check_urls(urls, cache, per_host=per_host, timeout=timeout)
+        
+        issues = {}
+        for file_path, url, column, link in links:
+            result = results[url]
+            if result['ok'] is not False:
+                continue
+            reason = f"HTTP {result['status']}" if result['status'] else result['error']
+            issues.setdefault(file_path, []).append({
+                'file': file_path,
+                'line': link.line,
+                'column': column,
+                'type': 'broken_external',
+                'link_text': link.text,
+                'link_url': link.url,
+                'message': f'Link externo quebrado: [{link.text}]({link.url}) ({reason})'
+            })
         return issues
     
-    def check_all_files(self) -> Dict[str, List[Dict]]:
-        """Verifica todos os arquivos markdown."""
-        all_issues = {}
+    def link_graph(self, results: Iterable[Tuple[str, Tuple]]) -> LinkGraph:
+        """Grafo dos links válidos a partir dos pares de ``iter_checked``."""
+        graph = LinkGraph()
+        for file_path, (_, _, _, links) in results:
+            graph.set_links(os.path.relpath(file_path, self.docs_root), links)
+        return graph
+    
+    def _index_anchor_targets(self, anchors: List[List], skip: Set[str]):
+        """Indexa sob demanda as âncoras dos alvos fora do conjunto verificado (``skip`` ainda vai chegar)."""
+        for target, fragment, *_ in anchors:
+            if (not fragment or target in self.slug_index or target in skip
+                    or target not in self.valid_files):
+                continue
+            try:
+                document = read_document(os.path.join(self.docs_root, target))
+            except (OSError, UnicodeDecodeError):
+                continue
+            self.slug_index.add(target, document_slugs(document))
+    
+    def _reuse_cached(self, file_paths: List[str], cache: LinkCache, reused: Dict[str, Dict]):
+        """Preenche ``reused`` com as entradas que o cache ainda vale e devolve o que falta verificar."""
+        changed_targets = cache.changed_targets(self.valid_files)
+        dirty = cache.dependents(changed_targets)
+        # Dependentes fora do escopo não serão revalidados agora: descarta-os
+        # para que o universo registrado continue valendo para todo o cache
+        cache.discard(dirty - {os.path.relpath(p, self.docs_root) for p in file_paths})
         
-        for md_file in self.docs_root.rglob("*.md"):
-            file_path = str(md_file)
-            issues = self.check_file(file_path)
+        pending = []
+        contents = {}
+        stats = {}
+        digests = {}
+        for file_path in file_paths:
+            rel_path = os.path.relpath(file_path, self.docs_root)
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                pending.append(file_path)
+                continue
             
-            if issues:
-                all_issues[file_path] = issues
+            entry = None if rel_path in dirty else cache.get(rel_path, st)
+            if entry is None:
+                try:
+                    with open(file_path, 'rb') as f:
+                        data = f.read()
+                    content = data.decode('utf-8')
+                except (OSError, UnicodeDecodeError):
+                    # Erros de leitura não são cacheados; check_file os reporta
+                    pending.append(file_path)
+                    continue
+                digest = content_digest(data)
+                if rel_path not in dirty:
+                    entry = cache.get_by_digest(rel_path, st, digest)
+                if entry is None:
+                    pending.append(file_path)
+                    contents[file_path] = content
+                    stats[file_path] = st
+                    digests[file_path] = digest
+                    continue
+            
+            reused[file_path] = entry['result']
+        
+        return pending, contents, stats, digests
+    
+    def _check_parallel(self, file_paths: List[str], workers: int) -> Iterator[Tuple]:
+        """Verifica os arquivos em paralelo, gerando os resultados na ordem de entrada."""
+        # Lotes contíguos: poucos lotes por worker equilibram carga sem
+        # multiplicar o custo de serialização entre processos
+        shard_count = min(len(file_paths), workers * 4)
+        shard_size = -(-len(file_paths) // shard_count)
+        shards = [file_paths[i:i + shard_size] for i in range(0, len(file_paths), shard_size)]
         
-        return all_issues
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(str(self.docs_root), self.valid_files),
+        ) as executor:
+            # executor.map devolve os lotes na ordem em que foram submetidos
+            for shard_results in executor.map(_check_shard, shards):
+                yield from shard_results
     
     def generate_report(self, issues: Dict[str, List[Dict]]) -> str:
         """Gera relatório de links quebrados."""
-        report = []
-        report.append("# Relatório de Links Quebrados - Projeto Docs")
-        report.append(f"**Data**: {os.popen('date').read().strip()}")
-        report.append("")
-        
-        total_files = len(issues)
-        total_issues = sum(len(file_issues) for file_issues in issues.values())
-        
-        report.append(f"## Resumo")
-        report.append(f"- **Arquivos com problemas**: {total_files}")
-        report.append(f"- **Total de links quebrados**: {total_issues}")
-        report.append("")
-        
-        if total_issues == 0:
-            report.append("✅ **Nenhum link quebrado encontrado!**")
-            return "\n".join(report)
-        
-        report.append("## Links Quebrados por Arquivo")
-        report.append("")
-        
-        for file_path, file_issues in issues.items():
-            # Converte para caminho relativo
-            rel_path = Path(file_path).relative_to(self.docs_root)
-            report.append(f"### {rel_path}")
-            report.append("")
-            
-            for issue in file_issues:
-                if issue['type'] == 'broken_link':
-                    report.append(f"- **Linha {issue['line']}**: {issue['message']}")
-                else:
-                    report.append(f"- **Erro**: {issue['message']}")
-            
-            report.append("")
-        
-        return "\n".join(report)
+        output = io.StringIO()
+        with MarkdownReporter(output) as reporter:
+            for file_path, file_issues in issues.items():
+                reporter.add(os.path.relpath(file_path, self.docs_root), file_issues)
+        return output.getvalue()
 
-def main():
-    docs_root = "/home/kleberson/Projetos/Skynet/docs"
-    checker = LinkChecker(docs_root)
+class LinkIndex(LinkChecker):
+    """Modo residente do LinkChecker.
     
-    print("🔍 Verificando links na documentação...")
-    issues = checker.check_all_files()
+    Mantém em memória o índice de arquivos, as âncoras, os documentos
+    analisados e o grafo de links, atualizando apenas o que muda a cada
+    evento do observador da árvore. Consultas como "este href é válido a
+    partir deste arquivo?" e "quem aponta para este arquivo?" viram
+    consultas em dicionários.
+    """
     
-    report = checker.generate_report(issues)
+    def __init__(self, docs_root: str, excludes: Iterable[str] = DEFAULT_EXCLUDES,
+                 on_shutdown: Optional[Callable[[], None]] = None):
+        # A varredura fica para rebuild(), que também serve para recomeçar do zero
+        super().__init__(docs_root, valid_files=(), excludes=excludes)
+        self.on_shutdown = on_shutdown
+        self.rebuild()
     
-    # Salva o relatório
-    report_file = Path(docs_root) / "RELATORIO_LINKS_QUEBRADOS.md"
-    with open(report_file, 'w', encoding='utf-8') as f:
-        f.write(report)
+    def rebuild(self):
+        """Descarta o estado em memória e recarrega a árvore inteira."""
+        self.slug_index = SlugIndex()
+        self.resolver = PathIndex(str(self.docs_root))
+        self._suggester = None
+        self.valid_files = set()
+        self.scan_files()
+        self.graph = LinkGraph()
+        self.documents: Dict[str, MarkdownDocument] = {}
+        # candidato -> arquivos cujos links o consultaram (revalidação quando o índice muda)
+        self.candidate_sources: Dict[str, Set[str]] = {}
+        self.source_candidates: Dict[str, Set[str]] = {}
+        for file_path in self.markdown_files:
+            self._load_source(os.path.relpath(file_path, self.docs_root))
+    
+    def _load_source(self, rel_path: str):
+        try:
+            document = read_document(os.path.join(self.docs_root, rel_path))
+        except (OSError, UnicodeDecodeError):
+            self._drop_source(rel_path)
+            return
+        self.documents[rel_path] = document
+        self.slug_index.add(rel_path, document_slugs(document))
+        self._resolve_source(rel_path)
     
-    print(f"📊 Relatório salvo em: {report_file}")
-    print(f"📈 Total de arquivos com problemas: {len(issues)}")
+    def _drop_source(self, rel_path: str):
+        self.documents.pop(rel_path, None)
+        self.slug_index.discard(rel_path)
+        self.graph.remove_source(rel_path)
+        self._set_candidates(rel_path, set())
     
-    total_issues = sum(len(file_issues) for file_issues in issues.values())
-    print(f"🔗 Total de links quebrados: {total_issues}")
+    def _set_candidates(self, rel_path: str, candidates: Set[str]):
+        for candidate in self.source_candidates.pop(rel_path, ()):
+            sources = self.candidate_sources.get(candidate)
+            if sources is not None:
+                sources.discard(rel_path)
+                if not sources:
+                    del self.candidate_sources[candidate]
+        if candidates:
+            self.source_candidates[rel_path] = candidates
+            for candidate in candidates:
+                self.candidate_sources.setdefault(candidate, set()).add(rel_path)
     
-    if total_issues > 0:
-        print("\n❌ Links quebrados encontrados:")
-        for file_path, file_issues in issues.items():
-            rel_path = Path(file_path).relative_to(Path(docs_root))
-            print(f"  📄 {rel_path}: {len(file_issues)} problemas")
+    def _resolve_source(self, rel_path: str):
+        """Recalcula as arestas de um arquivo a partir do documento em memória."""
+        file_path = os.path.join(self.docs_root, rel_path)
+        resolved = set()
+        candidates = set()
+        for link in self.documents[rel_path].links:
+            if link.kind == 'html' or link.url.startswith('#'):
+                continue
+            link_candidates = self.link_candidates(link.url, file_path)
+            if not link_candidates:
+                continue
+            candidates.update(link_candidates)
+            target = self.resolve_link(link.url, file_path)
+            if target is not None:
+                resolved.add(target)
+        self.graph.set_links(rel_path, resolved)
+        self._set_candidates(rel_path, candidates)
+    
+    def apply_changes(self, changed: Optional[Set[str]]) -> Set[str]:
+        """Aplica alterações do observador; devolve os arquivos markdown afetados.
+        
+        ``None`` significa que os eventos se perderam e tudo é recarregado.
+        """
+        if changed is None:
+            self.rebuild()
+            return set(self.documents)
+        
+        touched_keys = set()
+        affected = set()
+        for rel_path in sorted(changed):
+            abs_path = os.path.join(self.docs_root, rel_path)
+            if os.path.isfile(abs_path):
+                if rel_path not in self.valid_files:
+                    new_keys = self.index_files([rel_path])
+                    self._suggester = None
+                    self.valid_files.update(new_keys)
+                    touched_keys.update(new_keys)
+                if rel_path.endswith('.md'):
+                    self._load_source(rel_path)
+                    affected.add(rel_path)
+            elif not os.path.isdir(abs_path):
+                # Removido: o próprio arquivo ou um diretório inteiro movido/apagado
+                prefix = rel_path + os.sep
+                gone = [p for p in self.valid_files if p == rel_path or p.startswith(prefix)]
+                gone_md = [p for p in gone if p.endswith('.md')]
+                gone.extend(p[:-3] for p in gone_md)
+                self.valid_files.difference_update(gone)
+                touched_keys.update(gone)
+                if gone:
+                    self._suggester = None
+                for md_path in gone_md:
+                    if md_path in self.documents:
+                        self._drop_source(md_path)
+                        affected.add(md_path)
+        
+        # Arquivos cujos links consultaram caminhos criados ou removidos
+        dependents = set()
+        for key in touched_keys:
+            dependents.update(self.candidate_sources.get(key, ()))
+        for rel_path in dependents:
+            if rel_path in self.documents:
+                self._resolve_source(rel_path)
+        affected.update(dependents)
+        return {rel_path for rel_path in affected if rel_path in self.documents}
+    
+    def file_issues(self, rel_path: str) -> List[Dict]:
+        """Problemas de um arquivo, calculados a partir do estado em memória."""
+        document = self.documents.get(rel_path)
+        if document is None:
+            return []
+        file_path = os.path.join(self.docs_root, rel_path)
+        issues, _, _, anchors, _ = self._check_document(file_path, document)
+        return self.merge_anchor_issues(file_path, issues, anchors)
+    
+    def _rel(self, path: str) -> str:
+        if os.path.isabs(path):
+            return os.path.relpath(path, self.docs_root)
+        return os.path.normpath(path)
+    
+    # Métodos expostos via JSON-RPC (prefixo rpc_)
+    
+    def rpc_check_href(self, source: str, href: str) -> Dict:
+        """Se ``href`` é válido a partir de ``source`` e para qual arquivo aponta."""
+        source = self._rel(source)
+        source_path = os.path.join(self.docs_root, source)
+        if self.link_candidates(href, source_path) is None and not href.startswith('#'):
+            return {'valid': True, 'external': True, 'target': None}
+        target = self.resolve_link(href, source_path)
+        result = {'valid': target is not None, 'external': False, 'target': target}
+        if target is None:
+            suggestion = self.suggest_href(href, source_path)
+            result['suggestion'] = suggestion[0] if suggestion else None
+        if target is not None and '#' in href:
+            fragment = href.split('#', 1)[1]
+            slugs = self.slug_index.get(target)
+            anchor_valid = slugs is None or not fragment or normalize_fragment(fragment) in slugs
+            result['anchor_valid'] = anchor_valid
+            result['valid'] = anchor_valid
+        return result
+    
+    def rpc_backlinks(self, path: str) -> List[str]:
+        """Arquivos que apontam para ``path``."""
+        return sorted(self.graph.links_to(self._rel(path)))
+    
+    def rpc_links(self, path: str) -> List[str]:
+        """Arquivos para os quais ``path`` aponta (links válidos)."""
+        return sorted(self.graph.links_from(self._rel(path)))
+    
+    def rpc_issues(self, path: str) -> List[Dict]:
+        """Links quebrados e âncoras inexistentes de ``path``."""
+        return [{k: v for k, v in issue.items() if k != 'file'} for issue in self.file_issues(self._rel(path))]
+    
+    def rpc_anchors(self, path: str) -> List[str]:
+        """Âncoras disponíveis em ``path``."""
+        return sorted(self.slug_index.get(self._rel(path)) or ())
+    
+    def rpc_shutdown(self) -> bool:
+        """Encerra o servidor; falso se o índice não foi criado com ``on_shutdown``."""
+        if self.on_shutdown is None:
+            return False
+        self.on_shutdown()
+        return True
+    
+    def rpc_stats(self) -> Dict:
+        return {
+            'files': len(self.valid_files),
+            'documents': len(self.documents),
+            'links': len(self.graph),
+        }
+
+def serve(args) -> int:
+    """Modo --serve: índice residente respondendo JSON-RPC em um socket Unix."""
+    docs_root = args.root
+    socket_path = args.socket or str(Path(docs_root) / ".cache" / "verificar-links.sock")
+    excludes = DEFAULT_EXCLUDES + tuple(args.exclude)
+    
+    print("🔍 Carregando índice de links...")
+    # O servidor é criado depois do índice; a parada o consulta só quando chamada
+    index = LinkIndex(docs_root, excludes=excludes, on_shutdown=lambda: server.stop())
+    watcher = create_watcher(docs_root, excludes)
+    stats = index.rpc_stats()
+    print(f"📈 {stats['documents']} documentos, {stats['links']} links, {stats['files']} entradas no índice")
+    
+    def refresh():
+        changed = watcher.changes()
+        if changed is None or changed:
+            affected = index.apply_changes(changed)
+            if affected:
+                print(f"🔄 Índice atualizado: {len(affected)} arquivo(s) afetado(s)")
+    
+    Path(socket_path).parent.mkdir(parents=True, exist_ok=True)
+    server = JsonRpcServer(socket_path, index)
+    if watcher.fileno() is not None:
+        server.add_reader(watcher.fileno(), refresh)
     else:
+        server.set_tick(watcher.interval, refresh)
+    
+    print(f"🔌 Servindo JSON-RPC em {socket_path} (Ctrl+C para sair)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return 0
+
+def issue_key(issue: Dict) -> Tuple[str, str]:
+    """Identidade de um problema entre revalidações (sem a linha, que muda com edições acima dele)."""
+    return issue['type'], issue['message']
+
+def print_issue_diff(rel_path: str, before: List[Dict], after: List[Dict]) -> bool:
+    """Imprime os problemas novos e resolvidos de um arquivo; devolve se houve diferença."""
+    old = Counter(issue_key(issue) for issue in before)
+    new = Counter(issue_key(issue) for issue in after)
+    added = new - old
+    resolved = old - new
+    for issue in after:
+        if added[issue_key(issue)] > 0:
+            added[issue_key(issue)] -= 1
+            print(f"  ❌ {rel_path}:{issue['line']}: {issue['message']}")
+    for (_, message), count in sorted(resolved.items()):
+        for _ in range(count):
+            print(f"  ✅ {rel_path}: resolvido: {message}")
+    return bool(new - old or resolved)
+
+def watch_links(args) -> int:
+    """Modo --watch: mantém o índice em memória e revalida só o que cada alteração afeta."""
+    docs_root = args.root
+    excludes = DEFAULT_EXCLUDES + tuple(args.exclude)
+    print("🔍 Carregando índice de links...")
+    index = LinkIndex(docs_root, excludes=excludes)
+    watcher = create_watcher(docs_root, excludes)
+    issues = {}
+    for rel_path in index.documents:
+        file_issues = index.file_issues(rel_path)
+        if file_issues:
+            issues[rel_path] = file_issues
+    total = sum(len(file_issues) for file_issues in issues.values())
+    print(f"📈 {len(index.documents)} documentos; {total} problema(s) em {len(issues)} arquivo(s)")
+    print(f"👀 Observando {docs_root} (Ctrl+C para sair)")
+    
+    def on_change(changed):
+        started = time.perf_counter()
+        affected = index.apply_changes(changed)
+        # Quem aponta para um arquivo alterado pode ter ganho ou perdido âncoras
+        for rel_path in list(affected):
+            affected.update(index.graph.links_to(rel_path))
+        gone = [rel_path for rel_path in issues if rel_path not in index.documents]
+        
+        changes = False
+        for rel_path in sorted(affected) + gone:
+            after = index.file_issues(rel_path)
+            changes |= print_issue_diff(rel_path, issues.get(rel_path, []), after)
+            if after:
+                issues[rel_path] = after
+            else:
+                issues.pop(rel_path, None)
+        elapsed = (time.perf_counter() - started) * 1000
+        total = sum(len(file_issues) for file_issues in issues.values())
+        status = "" if changes else "sem mudanças nos problemas; "
+        print(f"🔄 {len(affected)} arquivo(s) revalidado(s) em {elapsed:.0f} ms; {status}"
+              f"{total} problema(s) em {len(issues)} arquivo(s)")
+    
+    try:
+        watch(watcher, on_change)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return 0
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Verifica links quebrados na documentação.")
+    parser.add_argument("--root", default=str(DOCS_ROOT),
+                        help="Raiz da documentação (padrão: diretório pai de scripts/)")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="Número de processos para a verificação (0 = todos os núcleos)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Verifica todos os arquivos ignorando o cache incremental")
+    parser.add_argument("--exclude", action="append", default=[], metavar="GLOB",
+                        help="Glob de arquivos/diretórios a ignorar (além de: %s)" % ", ".join(DEFAULT_EXCLUDES))
+    parser.add_argument("--since", metavar="REV",
+                        help="Valida apenas os arquivos alterados desde REV (git diff) e os que apontam "
+                             "para arquivos removidos/renomeados; não grava relatório")
+    parser.add_argument("--until", metavar="REV",
+                        help="Revisão final para --since; os documentos são lidos dessa revisão "
+                             "(padrão: árvore de trabalho)")
+    parser.add_argument("--ndjson", metavar="PATH",
+                        help="Grava também os problemas em NDJSON (um objeto por linha), à medida que são encontrados")
+    parser.add_argument("--sarif", metavar="PATH",
+                        help="Grava também os problemas em SARIF 2.1.0, para code scanning em CI")
+    parser.add_argument("--fix", action="store_true",
+                        help="Reescreve os links quebrados cuja sugestão de correção é inequívoca")
+    parser.add_argument("--external", action="store_true",
+                        help="Verifica também os links http(s) (HEAD/GET concorrente, com cache em .cache/)")
+    parser.add_argument("--external-ttl", type=float, default=24.0, metavar="HORAS",
+                        help="Validade do cache de links externos (padrão: 24 horas)")
+    parser.add_argument("--external-per-host", type=int, default=4, metavar="N",
+                        help="Requisições simultâneas por host em --external (padrão: 4)")
+    parser.add_argument("--external-timeout", type=float, default=10.0, metavar="SEG",
+                        help="Tempo limite de cada requisição em --external (padrão: 10s)")
+    parser.add_argument("--serve", action="store_true",
+                        help="Mantém o índice em memória e responde consultas JSON-RPC em um socket Unix")
+    parser.add_argument("--watch", action="store_true",
+                        help="Observa a árvore e revalida apenas os arquivos afetados a cada alteração")
+    parser.add_argument("--socket", metavar="PATH",
+                        help="Socket do modo --serve (padrão: .cache/verificar-links.sock)")
+    commands = parser.add_subparsers(dest="command", metavar="{merge,manifest,graph}")
+    graph = commands.add_parser("graph", help="Consultas sobre o grafo de links salvo na última verificação completa")
+    graph.add_argument("query", choices=("orphans", "top", "rename", "coverage"),
+                       help="orphans: páginas inalcançáveis a partir das entradas; top: mais citadas; "
+                            "rename PATH: impacto de mover PATH; coverage DOC: páginas alcançáveis que DOC não lista")
+    graph.add_argument("path", nargs="?", metavar="PATH",
+                       help="Arquivo ou diretório (rename) ou página de navegação (coverage)")
+    graph.add_argument("--entry", action="append", metavar="PAGE",
+                       help="Página de entrada da navegação (padrão: %s)" % ", ".join(ENTRY_PAGES))
+    graph.add_argument("-n", "--limit", type=int, default=20, help="Quantidade de itens em top (padrão: 20)")
+    graph.add_argument("--refresh", action="store_true",
+                       help="Reconstrói o grafo antes da consulta (usa o cache incremental)")
+    add_profile_arguments(parser)
+    merge = add_shard_arguments(parser, commands)
+    merge.add_argument("--ndjson", default=argparse.SUPPRESS, metavar="PATH",
+                       help="Grava também os problemas em NDJSON")
+    merge.add_argument("--sarif", default=argparse.SUPPRESS, metavar="PATH",
+                       help="Grava também os problemas em SARIF 2.1.0")
+    return parser.parse_args()
+
+def machine_reporters(args) -> List:
+    """Destinos NDJSON/SARIF pedidos na linha de comando."""
+    reporters = []
+    if args.ndjson:
+        reporters.append(NdjsonReporter(args.ndjson))
+    if args.sarif:
+        reporters.append(SarifReporter(args.sarif, "verificar-links", CHECKER_VERSION))
+    return reporters
+
+def stream_issues(checker: LinkChecker, issues: Iterator[Tuple[str, List[Dict]]], reporters: List,
+                  fix: bool = False) -> Iterator[Tuple[str, List[Dict]]]:
+    """Corrige (com ``fix``), anota sugestões e entrega cada arquivo aos destinos."""
+    fixed = 0
+    for file_path, file_issues in issues:
+        if fix:
+            file_issues, count = checker.apply_fixes(file_path, file_issues)
+            fixed += count
+            if not file_issues:
+                continue
+        checker.suggest_fixes(file_path, file_issues)
+        rel_path = os.path.relpath(file_path, checker.docs_root)
+        for reporter in reporters:
+            reporter.add(rel_path, file_issues)
+        yield rel_path, file_issues
+    if fix:
+        print(f"🔧 {fixed} link(s) corrigido(s) automaticamente")
+
+def write_reports(checker: LinkChecker, issues: Iterator[Tuple[str, List[Dict]]], args, fix: bool = False):
+    """Envia as issues ao relatório markdown e aos destinos pedidos, imprimindo o resumo."""
+    report_file = Path(checker.docs_root) / "RELATORIO_LINKS_QUEBRADOS.md"
+    # O relatório markdown é só mais um destino do fluxo de issues
+    report = MarkdownReporter(report_file)
+    reporters = [report] + machine_reporters(args)
+    for rel_path, file_issues in stream_issues(checker, issues, reporters, fix):
+        if report.files == 1:
+            print("❌ Links quebrados encontrados:")
+        print(f"  📄 {rel_path}: {len(file_issues)} problemas")
+    for reporter in reporters:
+        reporter.close()
+    
+    print(f"\n📊 Relatório salvo em: {report_file}")
+    print(f"📈 Total de arquivos com problemas: {report.files}")
+    print(f"🔗 Total de links quebrados: {report.issues}")
+    
+    if report.issues == 0:
         print("\n✅ Nenhum link quebrado encontrado!")
 
+def external_issues(checker: LinkChecker, file_paths: List[str], args) -> Optional[Dict[str, List[Dict]]]:
+    """Issues de links externos com --external (None sem a opção)."""
+    if not args.external:
+        return None
+    cache = None
+    if not args.no_cache:
+        cache = ExternalCache(Path(checker.docs_root) / ".cache" / "external-links.json", args.external_ttl * 3600)
+    return checker.external_issues(file_paths, cache, per_host=args.external_per_host,
+                                   timeout=args.external_timeout)
+
+def graph_path(docs_root: str) -> Path:
+    return Path(docs_root) / ".cache" / "link-graph.sqlite"
+
+def save_graph(checker: LinkChecker, graph: LinkGraph):
+    """Persiste o grafo de links de uma verificação completa para o subcomando graph."""
+    path = graph_path(checker.docs_root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    graph.save(str(path))
+
+def saved_graph(docs_root: str) -> Tuple[Optional[LinkGraph], float]:
+    """Grafo da última verificação completa e o instante em que foi salvo; (None, 0) se ausente ou inválido."""
+    path = graph_path(docs_root)
+    try:
+        return LinkGraph.load(str(path)), path.stat().st_mtime
+    except (OSError, ValueError):
+        return None, 0.0
+
+def load_graph(args) -> LinkGraph:
+    """Grafo salvo, reconstruído (sem gerar relatório) se ausente, inválido ou com --refresh."""
+    path = graph_path(args.root)
+    if not args.refresh:
+        try:
+            return LinkGraph.load(str(path))
+        except ValueError:
+            pass
+    print("🔄 Construindo o grafo de links...")
+    checker = LinkChecker(args.root, excludes=DEFAULT_EXCLUDES + tuple(args.exclude))
+    cache = None
+    if not args.no_cache:
+        cache = LinkCache(Path(args.root) / ".cache" / "verificar-links.json", CHECKER_VERSION)
+    save_graph(checker, checker.link_graph(checker.iter_checked(workers=1, cache=cache)))
+    return LinkGraph.load(str(path))
+
+def query_graph(args) -> int:
+    """Subcomando graph: consultas de alcançabilidade sobre o grafo persistido."""
+    if args.query in ("rename", "coverage") and not args.path:
+        print(f"❌ graph {args.query} exige um caminho")
+        return 2
+    started = time.perf_counter()
+    graph = load_graph(args)
+    entries = [os.path.normpath(page) for page in (args.entry or ENTRY_PAGES)]
+    missing = [page for page in entries if page not in graph.nodes]
+    if missing:
+        print(f"⚠️  Páginas de entrada fora do grafo: {', '.join(missing)}")
+    
+    if args.query == "orphans":
+        orphans = graph.orphans(entries)
+        print(f"🏝️  {len(orphans)} de {len(graph.nodes)} páginas inalcançáveis a partir de {', '.join(entries)}:")
+        for rel_path in orphans:
+            print(f"  📄 {rel_path}")
+    elif args.query == "top":
+        print(f"🔝 Arquivos mais citados ({len(graph.nodes)} páginas):")
+        for target, count in graph.top_in_degree(args.limit):
+            print(f"  {count:5d}  {target}")
+    elif args.query == "rename":
+        path = os.path.normpath(args.path)
+        moved = graph.targets_under(path)
+        referrers = {source for target in moved for source in graph.links_to(target)}
+        # Sem atualizar os links, o que só era alcançado através de PATH se perde
+        before = graph.reachable(entries)
+        stranded = sorted(before - graph.reachable(entries, blocked=moved) - moved)
+        print(f"🚚 Mover {path} afeta {len(moved)} alvo(s) citado(s):")
+        print(f"  ✏️  {len(referrers)} arquivo(s) precisam atualizar links:")
+        for rel_path in sorted(referrers):
+            print(f"    📄 {rel_path}")
+        print(f"  🏝️  {len(stranded)} página(s) ficariam inalcançáveis se os links não forem atualizados:")
+        for rel_path in stranded:
+            print(f"    📄 {rel_path}")
+    else:
+        page = os.path.normpath(args.path)
+        if page not in graph.nodes:
+            print(f"❌ {page} não está no grafo")
+            return 2
+        # Um mapa de navegação deve listar diretamente cada página navegável
+        expected = (graph.reachable(entries) & graph.nodes) - {page}
+        listed = graph.links_from(page)
+        uncovered = sorted(expected - listed)
+        print(f"🧭 {page} lista {len(expected & listed)} de {len(expected)} páginas navegáveis; faltam {len(uncovered)}:")
+        for rel_path in uncovered:
+            print(f"  📄 {rel_path}")
+        if page not in graph.reachable(entries):
+            print(f"⚠️  {page} não é alcançável a partir de {', '.join(entries)}")
+    print(f"⏱️  {(time.perf_counter() - started) * 1000:.1f} ms")
+    return 0
+
+def tree_scan(args):
+    """Varredura da árvore, ou o manifesto compartilhado quando informado."""
+    if args.manifest:
+        return read_manifest(args.manifest, args.root)
+    return scan_tree(args.root, DEFAULT_EXCLUDES + tuple(args.exclude))
+
+def check_shard(args, workers: int) -> int:
+    """Modo --shard: verifica só a fatia deste nó e grava o resultado parcial."""
+    try:
+        scan = tree_scan(args)
+    except ShardError as e:
+        print(f"❌ {e}")
+        return 2
+    checker = LinkChecker(args.root, valid_files=LinkChecker.index_files(scan.files))
+    cache = None
+    if not args.no_cache:
+        cache = LinkCache(Path(args.root) / ".cache" / "verificar-links.json", CHECKER_VERSION)
+    
+    file_paths = [file_path for file_path in scan.markdown_files
+                  if in_shard(os.path.relpath(file_path, args.root), args.shard)]
+    index, count = args.shard
+    print(f"🔍 Verificando links do shard {index}/{count} ({len(file_paths)} de {len(scan.markdown_files)} arquivos)...")
+    partial = {}
+    for file_path, (issues, slugs, anchors, links) in checker.iter_checked(workers=workers, cache=cache,
+                                                                           file_paths=file_paths):
+        partial[os.path.relpath(file_path, args.root)] = {
+            'issues': [{k: v for k, v in issue.items() if k != 'file'} for issue in issues],
+            'slugs': slugs,
+            'anchors': anchors,
+            'links': links,
+        }
+    output = args.partial or partial_path("verificar-links", args.shard)
+    write_partial(output, CHECKER_VERSION, args.shard, partial)
+    print(f"💾 Resultado parcial salvo em: {output}")
+    return 0
+
+def merge_shards(args) -> int:
+    """Subcomando merge: junta os parciais e gera o relatório de uma execução única."""
+    try:
+        entries = read_partials(args.partials, CHECKER_VERSION)
+        scan = tree_scan(args)
+    except ShardError as e:
+        print(f"❌ {e}")
+        return 2
+    checker = LinkChecker(args.root, valid_files=LinkChecker.index_files(scan.files))
+    file_paths = [os.path.join(args.root, rel_path) for rel_path, _ in entries]
+    results = ((file_path, ([dict(issue, file=file_path) for issue in entry['issues']],
+                            entry['slugs'], entry['anchors'], entry['links']))
+               for file_path, (_, entry) in zip(file_paths, entries))
+    
+    print(f"🔗 Juntando {len(args.partials)} parciais ({len(file_paths)} arquivos)...")
+    graph = LinkGraph()
+    write_reports(checker, checker.merge_results(results, file_paths, graph=graph), args)
+    save_graph(checker, graph)
+    return 0
+
+def write_tree_manifest(args) -> int:
+    """Subcomando manifest: percorre a árvore uma vez para todos os shards."""
+    scan = scan_tree(args.root, DEFAULT_EXCLUDES + tuple(args.exclude))
+    write_manifest(args.output, scan)
+    print(f"🗂️  Manifesto salvo em: {args.output} ({len(scan.files)} arquivos, {len(scan.dirs)} diretórios)")
+    return 0
+
+def check_since(args, workers: int) -> int:
+    """Modo --since: valida só o escopo do diff, para hooks de pre-commit e PRs.
+    
+    Com --until, os documentos são lidos da revisão final, extraída em um
+    diretório temporário, e não da árvore de trabalho; o cache (que
+    descreve a árvore de trabalho) não é usado.
+    """
+    if args.until and args.fix:
+        print("❌ --fix não pode ser usado com --until: a revisão não é reescrita")
+        return 2
+    try:
+        changes = changed_files(args.root, args.since, args.until)
+        if not args.until:
+            # O mesmo universo das execuções completas, não arquivos ainda não
+            # rastreados: senão o cache os veria sumir e voltar a cada alternância
+            scan = scan_tree(args.root, DEFAULT_EXCLUDES + tuple(args.exclude))
+            return check_changes(args, workers, args.root, changes, LinkChecker.index_files(scan.files))
+        # A revisão final não está em disco: o universo é o índice do git dela
+        valid_files = LinkChecker.index_files(tracked_files(args.root, args.until))
+        with tempfile.TemporaryDirectory(prefix="verificar-links-") as snapshot:
+            export_tree(args.root, args.until, snapshot)
+            return check_changes(args, workers, snapshot, changes, valid_files)
+    except GitError as e:
+        print(f"❌ Erro ao consultar o git: {e}")
+        return 2
+
+def check_changes(args, workers: int, docs_root: str, changes: GitChanges, valid_files: Set[str]) -> int:
+    """Valida o escopo de ``changes`` com os documentos lidos de ``docs_root``."""
+    checker = LinkChecker(docs_root, valid_files=valid_files)
+    cache = None
+    if not args.no_cache and not args.until:
+        cache = LinkCache(Path(docs_root) / ".cache" / "verificar-links.json", CHECKER_VERSION)
+    
+    graph, graph_saved = None, 0.0
+    if changes.deleted and not args.until and (cache is None or not cache.entries):
+        # O grafo salvo, como o cache, descreve a árvore de trabalho
+        graph, graph_saved = saved_graph(docs_root)
+    file_paths = checker.scope_files(changes, cache, graph, graph_saved)
+    print(f"🔍 Verificando links de {len(file_paths)} arquivo(s) alterado(s) desde {args.since}...")
+    reporters = machine_reporters(args)
+    extra = external_issues(checker, file_paths, args)
+    issues = checker.iter_issues(workers=workers, cache=cache, file_paths=file_paths, extra=extra)
+    total_files = total_issues = 0
+    for rel_path, file_issues in stream_issues(checker, issues, reporters, args.fix):
+        total_files += 1
+        total_issues += len(file_issues)
+        for issue in file_issues:
+            hint = f" → sugestão: {issue['suggestion']}" if issue.get('suggestion') else ""
+            print(f"  📄 {rel_path}:{issue['line']}: {issue['message']}{hint}")
+    for reporter in reporters:
+        reporter.close()
+    
+    if total_issues > 0:
+        print(f"\n❌ {total_issues} link(s) quebrado(s) em {total_files} arquivo(s)")
+        return 1
+    print("\n✅ Nenhum link quebrado encontrado!")
+    return 0
+
+def main():
+    args = parse_args()
+    docs_root = args.root
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    if args.command == "merge":
+        return merge_shards(args)
+    if args.command == "manifest":
+        return write_tree_manifest(args)
+    if args.command == "graph":
+        return query_graph(args)
+    if args.serve:
+        return serve(args)
+    if args.watch:
+        return watch_links(args)
+    if args.since:
+        return check_since(args, workers)
+    if args.shard:
+        return check_shard(args, workers)
+    
+    profiler = profiler_from_args(args)
+    with profiler.phase('varredura'):
+        if args.manifest:
+            scan = read_manifest(args.manifest, docs_root)
+            checker = LinkChecker(docs_root, valid_files=LinkChecker.index_files(scan.files))
+            checker.markdown_files = scan.markdown_files
+        else:
+            checker = LinkChecker(docs_root, excludes=DEFAULT_EXCLUDES + tuple(args.exclude))
+    checker.profiler = profiler
+    profiler.files = len(checker.markdown_files)
+    cache = None
+    if not args.no_cache:
+        with profiler.phase('carga do cache'):
+            cache = LinkCache(Path(docs_root) / ".cache" / "verificar-links.json", CHECKER_VERSION)
+    
+    with profiler.phase('links externos'):
+        extra = external_issues(checker, checker.markdown_files, args)
+    print("🔍 Verificando links na documentação...")
+    # Cada arquivo vai para os relatórios assim que verificado (e suas âncoras, julgadas)
+    graph = LinkGraph()
+    with profiler.phase('verificação'):
+        checked = checker.iter_checked(workers=workers, cache=cache)
+        write_reports(checker, checker.merge_results(checked, checker.markdown_files, extra=extra, graph=graph),
+                      args, args.fix)
+    with profiler.phase('grafo'):
+        save_graph(checker, graph)
+    if profiler.enabled and workers > 1:
+        print("\nℹ️  Com -j > 1 a análise por arquivo roda nos workers; use -j 1 para o detalhamento por arquivo")
+    profiler.report()
+
 if __name__ == "__main__":
-    main()
+    exit(main() or 0)